@@ -9,10 +9,17 @@ from quart import Quart
 from app.database.db import init_db
 from app.main_routes import routes
 from app.jobs.token_validity import token_refresh_job
+from app.jobs.merchant_alias_listener import listen_for_alias_changes
+from app.jobs.recategorize_transactions import recategorization_job
+from app.database.methods.load_merchant_aliases import load_merchant_aliases
+from app.config import RECATEGORIZE_ON_STARTUP
 import asyncio
 
 __version__ = "1.0.0"
 
+# Long-running tasks started by setup_app, referenced so they are not garbage collected
+background_tasks = set()
+
 def create_app():
     """
     Application factory function that creates and configures the Quart app.
@@ -32,4 +39,10 @@ async def setup_app():
     Setup function that initializes database and background tasks.
     """
     await init_db()
-    asyncio.create_task(token_refresh_job())
+    await load_merchant_aliases()
+    for job in (listen_for_alias_changes(), token_refresh_job()):
+        task = asyncio.create_task(job)
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+    if RECATEGORIZE_ON_STARTUP:
+        recategorization_job.start()
@@ -21,6 +21,51 @@ NORDIGEN_SECRET_KEY = os.getenv("NORDIGEN_SECRET_KEY")
 # Default sandbox institution for testing
 SANDBOX_INSTITUTION_ID = "SANDBOXFINANCE_SFIN0000"
 
+# Overall time budget for fetching transactions across all linked banks
+TRANSACTIONS_TIME_BUDGET_SECONDS = float(os.getenv("TRANSACTIONS_TIME_BUDGET_SECONDS", "20"))
+
+# Batches at least this large are categorized off the event loop
+CATEGORIZATION_THREAD_THRESHOLD = int(os.getenv("CATEGORIZATION_THREAD_THRESHOLD", "2000"))
+
+# Batches at least this large are sharded across worker processes (0 disables). 20000 is a placeholder:
+# set it from the crossover test_process_pool_crossover_sweep prints on the deployment hardware.
+CATEGORIZATION_PROCESS_THRESHOLD = int(os.getenv("CATEGORIZATION_PROCESS_THRESHOLD", "20000"))
+CATEGORIZATION_PROCESS_WORKERS = int(os.getenv("CATEGORIZATION_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+# Worker pools kept alive at once, one per merchant dictionary version (one per country in use)
+CATEGORIZATION_POOL_VERSIONS = int(os.getenv("CATEGORIZATION_POOL_VERSIONS", "4"))
+
+# Categorization cache: max in-memory entries, and an optional directory for per-user snapshots
+CATEGORY_CACHE_SIZE = int(os.getenv("CATEGORY_CACHE_SIZE", "50000"))
+CATEGORY_CACHE_DIR = os.getenv("CATEGORY_CACHE_DIR")
+# Merchant dictionary used when a bank's country has none, and an optional directory for compiled matchers
+DEFAULT_CATEGORIZATION_COUNTRY = os.getenv("DEFAULT_CATEGORIZATION_COUNTRY", "RO").upper()
+MERCHANT_INDEX_DIR = os.getenv("MERCHANT_INDEX_DIR")
+# Minimum n-gram similarity (0-1) for a fuzzy merchant match once exact matching fails; 0 (the default)
+# disables it, 0.7 suits misspelled merchants. Saved category cache snapshots do not record it, so clear
+# CATEGORY_CACHE_DIR after changing it.
+FUZZY_MATCH_THRESHOLD = float(os.getenv("FUZZY_MATCH_THRESHOLD", "0"))
+# Optional n-gram classifier (.npz) used before the amount bands when no merchant matches,
+# and the probability its best guess needs to be used
+CATEGORY_CLASSIFIER_PATH = os.getenv("CATEGORY_CLASSIFIER_PATH")
+CATEGORY_CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("CATEGORY_CLASSIFIER_MIN_CONFIDENCE", "0.6"))
+# Compiled per-user categorization rule matchers kept in memory
+USER_RULES_CACHE_SIZE = int(os.getenv("USER_RULES_CACHE_SIZE", "1024"))
+# Memory budget for per-user transaction search indexes; least recently searched users are evicted first
+SEARCH_INDEX_MEMORY_MB = int(os.getenv("SEARCH_INDEX_MEMORY_MB", "256"))
+# Re-categorization backfill: rows per batch, pause between batches, and whether to start it when the app starts
+RECATEGORIZE_BATCH_SIZE = int(os.getenv("RECATEGORIZE_BATCH_SIZE", "500"))
+RECATEGORIZE_PAUSE_SECONDS = float(os.getenv("RECATEGORIZE_PAUSE_SECONDS", "0.5"))
+RECATEGORIZE_ON_STARTUP = os.getenv("RECATEGORIZE_ON_STARTUP", "false").lower() == "true"
+# Keep each account's raw Nordigen response (compressed and encrypted) so it can be replayed offline;
+# the codec is "gzip" or "zstd" (needs the zstandard package), and archives older than the retention are pruned (0 keeps them)
+RAW_PAYLOAD_ARCHIVE = os.getenv("RAW_PAYLOAD_ARCHIVE", "false").lower() == "true"
+RAW_PAYLOAD_CODEC = os.getenv("RAW_PAYLOAD_CODEC", "gzip").lower()
+RAW_PAYLOAD_RETENTION_DAYS = int(os.getenv("RAW_PAYLOAD_RETENTION_DAYS", "90"))
+# Automatic merchant aliases kept in memory per process (admin corrections are always all kept)
+MERCHANT_ALIAS_CACHE_SIZE = int(os.getenv("MERCHANT_ALIAS_CACHE_SIZE", "100000"))
+# Comma-separated emails allowed to use the admin endpoints (e.g. editing merchant aliases)
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
 print(f"🔧 Running in {ENVIRONMENT.upper()} mode")
 print(f"🔧 API URL: {NORDIGEN_API_URL}")
 print(f"🔧 Sandbox mode: {IS_SANDBOX}")
\ No newline at end of file
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from sqlalchemy import select
+from app.database.models.budget_model import BUDGET_ALERT_THRESHOLDS, Budget, BudgetAlert
+from app.database.models.category_rollup_model import CategoryRollup
+
+
+async def evaluate_budget_alerts(db, user_id, rollup_deltas: dict) -> list:
+    """Raise alerts for budgets whose thresholds the latest rollup changes crossed
+
+    Runs inside the caller's session after the rollups were updated, and
+    only looks at the current month's buckets that gained spending, so the
+    cost follows the size of the sync rather than the history.
+    """
+    current_month = datetime.now(timezone.utc).date().replace(day=1)
+    spent_deltas = {
+        (category, currency): delta[1]
+        for (month, category, currency), delta in rollup_deltas.items()
+        if month == current_month and delta[1] > 0
+    }
+    if not spent_deltas:
+        return []
+
+    result = await db.execute(
+        select(Budget).where(Budget.user_id == user_id, Budget.category.in_({key[0] for key in spent_deltas}))
+    )
+    budgets = [budget for budget in result.scalars() if (budget.category, budget.currency) in spent_deltas]
+    if not budgets:
+        return []
+
+    result = await db.execute(
+        select(CategoryRollup).where(
+            CategoryRollup.user_id == user_id,
+            CategoryRollup.month == current_month,
+            CategoryRollup.category.in_({budget.category for budget in budgets})
+        )
+    )
+    spent_now = {(rollup.category, rollup.currency): rollup.spent_minor for rollup in result.scalars()}
+
+    result = await db.execute(
+        select(BudgetAlert.budget_id, BudgetAlert.threshold).where(
+            BudgetAlert.budget_id.in_([budget.id for budget in budgets]),
+            BudgetAlert.month == current_month
+        )
+    )
+    already_raised = set(result.all())
+
+    alerts = []
+    for budget in budgets:
+        key = (budget.category, budget.currency)
+        spent = spent_now.get(key, 0)
+        spent_before = spent - spent_deltas[key]
+        for threshold in BUDGET_ALERT_THRESHOLDS:
+            limit = budget.limit_minor * threshold
+            if spent_before < limit <= spent and (budget.id, threshold) not in already_raised:
+                alert = BudgetAlert(
+                    user_id=user_id, budget_id=budget.id, month=current_month,
+                    threshold=threshold, spent_minor=spent
+                )
+                db.add(alert)
+                alerts.append(alert)
+                print(f"🚨 Budget {budget.category} reached {threshold:.0%} for user {user_id}")
+    return alerts
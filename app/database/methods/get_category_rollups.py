@@ -0,0 +1,19 @@
+from sqlalchemy import select
+from app.database.db import AsyncSessionLocal
+from app.database.models.category_rollup_model import CategoryRollup
+
+
+async def get_category_rollups(user_id, month_from=None, month_to=None, categories=None):
+    """A user's rollup rows, oldest month first (months are first-of-month dates)"""
+    async with AsyncSessionLocal() as session:
+        statement = select(CategoryRollup).where(CategoryRollup.user_id == user_id)
+        if month_from is not None:
+            statement = statement.where(CategoryRollup.month >= month_from)
+        if month_to is not None:
+            statement = statement.where(CategoryRollup.month <= month_to)
+        if categories:
+            statement = statement.where(CategoryRollup.category.in_(categories))
+        result = await session.execute(
+            statement.order_by(CategoryRollup.month, CategoryRollup.currency, CategoryRollup.category)
+        )
+        return result.scalars().all()
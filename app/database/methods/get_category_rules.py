@@ -0,0 +1,14 @@
+from sqlalchemy import select
+from app.database.db import AsyncSessionLocal
+from app.database.models.category_rule_model import CategoryRule
+
+
+async def get_category_rules(user_id):
+    """A user's categorization rules, highest priority first"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(CategoryRule)
+            .where(CategoryRule.user_id == user_id)
+            .order_by(CategoryRule.priority.desc(), CategoryRule.created_at)
+        )
+        return result.scalars().all()
@@ -0,0 +1,15 @@
+import asyncio
+from app.database.methods.stream_transactions import stream_transactions
+
+
+async def get_stored_transactions(user_id, date_from=None, date_to=None, where=None) -> list:
+    """A user's stored transactions as TransactionRecords (booked rows only, as they were stored)
+
+    Serves follow-up pages of a sync without going back to the banks.
+    `where` narrows the rows in SQL before any is decrypted. Decrypting
+    counterparties is CPU-bound, so each batch is converted off the event loop.
+    """
+    records = []
+    async for batch in stream_transactions(user_id, date_from, date_to, where=where):
+        records.extend(await asyncio.to_thread(lambda rows=batch: [row.to_record() for row in rows]))
+    return records
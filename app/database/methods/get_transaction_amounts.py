@@ -0,0 +1,19 @@
+from sqlalchemy import select
+from app.database.db import AsyncSessionLocal
+from app.database.models.bank_transaction_model import BankTransaction
+
+
+async def get_transaction_amounts(user_id, date_from=None, date_to=None, categories=None):
+    """(booking_date, amount_minor, currency) rows for analytics - no encrypted columns are read"""
+    async with AsyncSessionLocal() as session:
+        statement = select(
+            BankTransaction.booking_date, BankTransaction.amount_minor, BankTransaction.currency
+        ).where(BankTransaction.user_id == user_id)
+        if date_from is not None:
+            statement = statement.where(BankTransaction.booking_date >= date_from)
+        if date_to is not None:
+            statement = statement.where(BankTransaction.booking_date <= date_to)
+        if categories:
+            statement = statement.where(BankTransaction.category.in_(categories))
+        result = await session.execute(statement)
+        return result.all()
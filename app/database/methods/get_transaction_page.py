@@ -0,0 +1,123 @@
+import asyncio
+from datetime import date, timedelta
+from sqlalchemy import and_, case, func, not_, or_, select
+from app.database.db import AsyncSessionLocal
+from app.database.models.bank_transaction_model import BankTransaction
+from app.utils.transactions.money import CURRENCY_EXPONENTS, DEFAULT_EXPONENT, parse_minor_units
+
+# Rows read per query when a merchant filter has to be checked on the decrypted counterparty
+MERCHANT_SCAN_BATCH_SIZE = 1000
+EPOCH = date(1970, 1, 1)
+
+
+def _amount_bound(amount):
+    """abs(amount_minor) bound for a major-unit amount, in each row's own currency exponent"""
+    by_exponent = {}
+    for currency, exponent in CURRENCY_EXPONENTS.items():
+        by_exponent.setdefault(exponent, []).append(currency)
+    return case(
+        *[(BankTransaction.currency.in_(currencies), abs(parse_minor_units(amount, exponent=exponent)))
+          for exponent, currencies in by_exponent.items()],
+        else_=abs(parse_minor_units(amount, exponent=DEFAULT_EXPONENT))
+    )
+
+
+def transaction_filters(query) -> list:
+    """SQL conditions for every TransactionQuery filter except merchant (the counterparty is encrypted)"""
+    conditions = []
+    if query.date_from is not None:
+        conditions.append(BankTransaction.booking_date >= query.date_from.item())
+    if query.date_to is not None:
+        conditions.append(BankTransaction.booking_date <= query.date_to.item())
+    if query.categories is not None:
+        named = BankTransaction.category.in_(list(query.categories))
+        # Uncategorized rows are listed as "Unknown"
+        conditions.append(or_(named, BankTransaction.category.is_(None)) if "Unknown" in query.categories else named)
+    magnitude = func.abs(func.coalesce(BankTransaction.amount_minor, 0))
+    if query.min_amount is not None:
+        conditions.append(magnitude >= _amount_bound(query.min_amount))
+    if query.max_amount is not None:
+        conditions.append(magnitude <= _amount_bound(query.max_amount))
+    return conditions
+
+
+def _sort_column(query):
+    field = query.sort.lstrip("-")
+    if field == "date":
+        return BankTransaction.booking_date
+    amount = func.coalesce(BankTransaction.amount_minor, 0)
+    return amount if field == "amount" else func.abs(amount)
+
+
+def _sort_value(query, row):
+    field = query.sort.lstrip("-")
+    if field == "date":
+        return row.booking_date
+    amount = row.amount_minor or 0
+    return amount if field == "amount" else abs(amount)
+
+
+def _cursor_value(query, key):
+    """The sort column value of a cursor key (query.record_key undone), clamped to valid dates"""
+    value = -key if query.sort.startswith("-") else key
+    if query.sort.lstrip("-") != "date":
+        return value
+    value = min(max(value, date.min.toordinal() - EPOCH.toordinal()), date.max.toordinal() - EPOCH.toordinal())
+    return EPOCH + timedelta(days=value)
+
+
+def _matching_records(rows, merchant):
+    records = [row.to_record() for row in rows]
+    if merchant:
+        records = [record for record in records if merchant in record.company.lower()]
+    return records
+
+
+async def get_transaction_page(user_id, query) -> tuple:
+    """Return (page TransactionRecords, next cursor) for a TransactionQuery, read from storage
+
+    Filters, the cursor position and the order run in SQL, reading rows in
+    (sort column, id) keyset batches of limit + 1, so only the page, its
+    look-ahead row and any rows sharing the cursor's key are decrypted. A
+    merchant filter needs the counterparty, so it is checked on the
+    decrypted rows of larger batches. Ties are ordered by query.page_records,
+    the same way as on the first page.
+    """
+    column = _sort_column(query)
+    descending = query.sort.startswith("-")
+    statement = select(BankTransaction).where(BankTransaction.user_id == user_id, *transaction_filters(query))
+    if query.cursor is not None:
+        # Other rows sharing the cursor's key come back too; after_cursor drops those already listed
+        start = _cursor_value(query, query.cursor[0])
+        statement = statement.where(
+            column <= start if descending else column >= start,
+            not_(and_(column == start, BankTransaction.transaction_id == query.cursor[1]))
+        )
+    order = (column.desc() if descending else column, BankTransaction.id)
+    batch_size = MERCHANT_SCAN_BATCH_SIZE if query.merchant else query.limit + 1
+
+    candidates = []
+    last = None
+    while True:
+        batch_statement = statement
+        if last is not None:
+            value, last_id = last
+            beyond = column < value if descending else column > value
+            batch_statement = batch_statement.where(or_(beyond, and_(column == value, BankTransaction.id > last_id)))
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(batch_statement.order_by(*order).limit(batch_size))
+            batch = result.scalars().all()
+        if not batch:
+            break
+
+        records = await asyncio.to_thread(_matching_records, batch, query.merchant)
+        candidates.extend(record for record in records if query.after_cursor(record))
+        if len(batch) < batch_size:
+            break
+        # Done once the page and one more row are found and every row sharing the page's last key was read
+        if len(candidates) > query.limit and \
+                query.record_key(candidates[-1]) > query.record_key(candidates[query.limit - 1]):
+            break
+        last = (_sort_value(query, batch[-1]), batch[-1].id)
+
+    return query.page_records(candidates)
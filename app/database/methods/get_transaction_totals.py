@@ -0,0 +1,29 @@
+from sqlalchemy import case, func, select
+from app.database.db import AsyncSessionLocal
+from app.database.methods.get_transaction_page import transaction_filters
+from app.database.models.bank_transaction_model import BankTransaction
+
+
+async def get_transaction_totals(user_id, query) -> list:
+    """(category, currency, income_minor, spent_minor, count) per category and currency, summed in SQL
+
+    Covers a user's stored rows matching every TransactionQuery filter but
+    merchant; nothing is loaded or decrypted. Categories come in the order
+    they first appear by booking date.
+    """
+    amount = func.coalesce(BankTransaction.amount_minor, 0)
+    statement = (
+        select(
+            BankTransaction.category,
+            BankTransaction.currency,
+            func.sum(case((amount > 0, amount), else_=0)),
+            func.sum(case((amount < 0, -amount), else_=0)),
+            func.count()
+        )
+        .where(BankTransaction.user_id == user_id, *transaction_filters(query))
+        .group_by(BankTransaction.category, BankTransaction.currency)
+        .order_by(func.min(BankTransaction.booking_date), BankTransaction.category, BankTransaction.currency)
+    )
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(statement)
+        return [tuple(row) for row in result.all()]
@@ -0,0 +1,48 @@
+from sqlalchemy import or_, select
+from app.database.db import AsyncSessionLocal
+from app.database.models.merchant_alias_model import MerchantAlias
+from app.utils.transactions.merchant_aliases import merchant_aliases
+
+
+async def load_merchant_aliases() -> int:
+    """Load the merchant_aliases table into memory; returns how many aliases were loaded
+
+    Every admin correction is loaded, and the most recently updated automatic
+    aliases up to the in-memory limit.
+    """
+    columns = (MerchantAlias.alias_key, MerchantAlias.merchant, MerchantAlias.category,
+               MerchantAlias.dictionary_version)
+    try:
+        async with AsyncSessionLocal() as session:
+            admin = await session.execute(
+                select(*columns).where(or_(MerchantAlias.source == "admin", MerchantAlias.dictionary_version.is_(None)))
+            )
+            aliases = {key: (merchant, category, None) for key, merchant, category, _ in admin}
+            auto = await session.execute(
+                select(*columns).where(MerchantAlias.source == "auto", MerchantAlias.dictionary_version.is_not(None))
+                .order_by(MerchantAlias.updated_at.desc(), MerchantAlias.id).limit(merchant_aliases.max_size)
+            )
+            # Oldest first, so the table drops the oldest when it fills up
+            for key, merchant, category, version in reversed(auto.all()):
+                aliases[key] = (merchant, category, version)
+    except Exception as e:
+        print(f"❌ Failed to load merchant aliases: {e}")
+        return 0
+    merchant_aliases.replace(aliases)
+    print(f"📚 Loaded {len(aliases)} merchant aliases")
+    return len(aliases)
+
+
+async def reload_merchant_alias(key: str):
+    """Refresh one alias from the database after another process changed or deleted it"""
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(MerchantAlias).where(MerchantAlias.alias_key == key))
+            alias = result.scalar_one_or_none()
+    except Exception as e:
+        print(f"❌ Failed to reload merchant alias {key}: {e}")
+        return
+    if alias is None:
+        merchant_aliases.discard(key)
+    else:
+        merchant_aliases.set(key, alias.merchant, alias.category, alias.dictionary_version)
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete
+from app.config import RAW_PAYLOAD_RETENTION_DAYS
+from app.database.db import AsyncSessionLocal
+from app.database.models.raw_payload_model import RawPayload
+
+
+async def prune_raw_payloads(user_id=None, retention_days=RAW_PAYLOAD_RETENTION_DAYS) -> int:
+    """Delete archived payloads fetched longer ago than the retention; returns how many were deleted
+
+    A retention of 0 keeps every payload. Failures are logged and ignored.
+    """
+    if retention_days <= 0:
+        return 0
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    statement = delete(RawPayload).where(RawPayload.fetched_at < cutoff)
+    if user_id is not None:
+        statement = statement.where(RawPayload.user_id == user_id)
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(statement)
+            await db.commit()
+    except Exception as e:
+        print(f"❌ Failed to prune raw payloads: {e}")
+        return 0
+    if result.rowcount:
+        print(f"🗑️ Pruned {result.rowcount} raw payloads older than {retention_days} days")
+    return result.rowcount
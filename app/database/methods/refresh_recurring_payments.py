@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timezone
+from sqlalchemy import delete, select
+from app.database.db import AsyncSessionLocal
+from app.database.models.bank_transaction_model import BankTransaction
+from app.database.models.recurring_payment_model import RecurringPayment
+from app.utils.transactions.recurring_payments import detect_recurring_payments
+
+# Merchant keys per IN (...) query
+MERCHANT_BATCH_SIZE = 500
+
+
+async def refresh_recurring_payments(user_id, new_rows=None) -> int:
+    """Re-run detection for the merchants in `new_rows` (every merchant when None); returns how many were found
+
+    Only outgoing payments of the touched merchants are read, and only the
+    latest counterparty name of each detected merchant is decrypted.
+    """
+    if not user_id:
+        return 0
+    if new_rows is not None:
+        merchant_keys = sorted({row.merchant_key for row in new_rows if row.merchant_key and (row.amount_minor or 0) < 0})
+        if not merchant_keys:
+            return 0
+    else:
+        merchant_keys = None
+
+    try:
+        async with AsyncSessionLocal() as db:
+            statement = select(BankTransaction).where(
+                BankTransaction.user_id == user_id,
+                BankTransaction.amount_minor < 0,
+                BankTransaction.merchant_key.is_not(None)
+            )
+            rows = []
+            if merchant_keys is None:
+                rows = (await db.execute(statement)).scalars().all()
+            else:
+                for start in range(0, len(merchant_keys), MERCHANT_BATCH_SIZE):
+                    batch = merchant_keys[start:start + MERCHANT_BATCH_SIZE]
+                    rows.extend((await db.execute(statement.where(BankTransaction.merchant_key.in_(batch)))).scalars())
+
+            detected = await asyncio.to_thread(
+                detect_recurring_payments,
+                [row.merchant_key for row in rows],
+                [row.booking_date for row in rows],
+                [row.amount_minor for row in rows],
+                [row.currency for row in rows],
+                [row.category for row in rows]
+            )
+
+            latest = {}
+            for row in rows:
+                key = (row.merchant_key, row.currency)
+                if key not in latest or row.booking_date > latest[key].booking_date:
+                    latest[key] = row
+
+            stale = delete(RecurringPayment).where(RecurringPayment.user_id == user_id)
+            if merchant_keys is not None:
+                stale = stale.where(RecurringPayment.merchant_key.in_(merchant_keys))
+            await db.execute(stale)
+
+            now = datetime.now(timezone.utc)
+            for payment in detected:
+                db.add(RecurringPayment(
+                    user_id=user_id,
+                    merchant=latest[(payment["merchant_key"], payment["currency"])].company,
+                    updated_at=now,
+                    **payment
+                ))
+            await db.commit()
+
+        print(f"🔁 Found {len(detected)} recurring payments for user {user_id}")
+        return len(detected)
+    except Exception as e:
+        print(f"❌ Failed to refresh recurring payments for user {user_id}: {e}")
+        return 0
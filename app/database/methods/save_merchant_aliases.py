@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime, timezone
+from sqlalchemy import select
+from app.database.db import AsyncSessionLocal
+from app.database.models.merchant_alias_model import MerchantAlias
+from app.utils.transactions.merchant_aliases import merchant_aliases
+
+# Keys per IN (...) lookup when checking which aliases already exist
+KEY_LOOKUP_BATCH_SIZE = 500
+
+
+async def save_merchant_aliases(entries: dict, version) -> int:
+    """Store aliases found by the categorizer; returns how many rows were added or refreshed
+
+    `entries` is Categorizer.new_aliases() output. Admin corrections are never
+    overwritten; automatic aliases from an older dictionary are refreshed.
+    Failures are logged and ignored, the sync does not depend on them.
+    """
+    if not entries:
+        return 0
+    try:
+        written = []
+        async with AsyncSessionLocal() as db:
+            existing = {}
+            keys = list(entries)
+            for start in range(0, len(keys), KEY_LOOKUP_BATCH_SIZE):
+                result = await db.execute(
+                    select(MerchantAlias).where(MerchantAlias.alias_key.in_(keys[start:start + KEY_LOOKUP_BATCH_SIZE]))
+                )
+                existing.update((alias.alias_key, alias) for alias in result.scalars())
+
+            new_aliases = []
+            for key, (counterparty, merchant, category) in entries.items():
+                alias = existing.get(key)
+                if alias is None:
+                    new_aliases.append((key, counterparty, merchant, category))
+                elif alias.source == "auto":
+                    alias.merchant = merchant
+                    alias.category = category
+                    alias.dictionary_version = version
+                    alias.updated_at = datetime.now(timezone.utc)
+                    written.append(alias)
+                else:
+                    # Corrected by an admin in another process since this one loaded its table
+                    merchant_aliases.set(key, alias.merchant, alias.category, alias.dictionary_version)
+
+            if new_aliases:
+                # Encrypting counterparties is CPU-bound, so build the rows off the event loop
+                rows = await asyncio.to_thread(lambda: [
+                    MerchantAlias(alias_key=key, counterparty=counterparty, merchant=merchant,
+                                  category=category, source="auto", dictionary_version=version)
+                    for key, counterparty, merchant, category in new_aliases
+                ])
+                db.add_all(rows)
+                written.extend(rows)
+            await db.commit()
+    except Exception as e:
+        print(f"❌ Failed to save merchant aliases: {e}")
+        return 0
+
+    for alias in written:
+        merchant_aliases.set(alias.alias_key, alias.merchant, alias.category, alias.dictionary_version)
+    if written:
+        print(f"📚 Saved {len(written)} merchant aliases")
+    return len(written)
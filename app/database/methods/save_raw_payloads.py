@@ -0,0 +1,92 @@
+import asyncio
+from sqlalchemy import func, select
+from app.config import RAW_PAYLOAD_CODEC
+from app.database.db import AsyncSessionLocal
+from app.database.methods.prune_raw_payloads import prune_raw_payloads
+from app.database.models.raw_payload_model import RawPayload
+from app.utils.transactions.payload_archive import account_digest, payload_digest, payload_since, resolve_codec
+
+# Archives running in the background, referenced so they are not garbage collected before they finish
+_archive_tasks = set()
+
+
+def archive_raw_payloads(user_id, payloads) -> asyncio.Task:
+    """Archive a sync's payloads and prune the user's expired ones in the background
+
+    Compressing and encrypting whole histories would otherwise hold up the
+    sync's response.
+    """
+    async def archive():
+        await save_raw_payloads(user_id, payloads)
+        await prune_raw_payloads(user_id)
+
+    task = asyncio.create_task(archive())
+    _archive_tasks.add(task)
+    task.add_done_callback(_archive_tasks.discard)
+    return task
+
+
+def _new_windows(payloads, last_windows) -> list:
+    """Cut each body down to what is newer than its account's last archived window (CPU-bound)"""
+    windows = []
+    for requisition_id, account_id, country, raw in payloads:
+        window = payload_since(raw, last_windows.get(account_digest(account_id)))
+        if window is not None:
+            windows.append((requisition_id, account_id, country, window))
+    return windows
+
+
+async def save_raw_payloads(user_id, payloads, codec=RAW_PAYLOAD_CODEC) -> int:
+    """Archive raw account responses from a sync; returns how many new payloads were stored
+
+    `payloads` is a list of (requisition_id, account_id, country, raw body).
+    The first sync of an account archives its whole body; later ones only the
+    window since that account's last archived booking date. Windows already
+    archived for the user are skipped. Failures are logged and ignored, the
+    sync does not depend on them.
+    """
+    if not payloads:
+        return 0
+    codec = resolve_codec(codec)
+    try:
+        async with AsyncSessionLocal() as db:
+            accounts = {account_digest(account_id) for _, account_id, _, _ in payloads}
+            result = await db.execute(
+                select(RawPayload.account_key, func.max(RawPayload.window_to)).where(
+                    RawPayload.user_id == user_id, RawPayload.account_key.in_(list(accounts))
+                ).group_by(RawPayload.account_key)
+            )
+            last_windows = dict(result.all())
+            windows = await asyncio.to_thread(_new_windows, payloads, last_windows)
+
+            digests = {payload_digest(raw) for _, _, _, raw in windows}
+            result = await db.execute(
+                select(RawPayload.payload_digest).where(
+                    RawPayload.user_id == user_id, RawPayload.payload_digest.in_(list(digests))
+                )
+            )
+            archived = set(result.scalars())
+            new_payloads = []
+            for requisition_id, account_id, country, raw in windows:
+                digest = payload_digest(raw)
+                if digest not in archived:
+                    archived.add(digest)
+                    new_payloads.append((requisition_id, account_id, country, raw))
+            if not new_payloads:
+                return 0
+
+            # Parsing, compressing and encrypting are CPU-bound, so build the rows off the event loop
+            rows = await asyncio.to_thread(lambda: [
+                RawPayload.from_raw(user_id, requisition_id, account_id, country, raw, codec)
+                for requisition_id, account_id, country, raw in new_payloads
+            ])
+            db.add_all(rows)
+            await db.commit()
+        raw_size = sum(row.raw_size for row in rows)
+        stored_size = sum(row.stored_size for row in rows)
+        print(f"🗜️ Archived {len(rows)} raw payloads for user {user_id}: "
+              f"{raw_size // 1024} KiB → {stored_size // 1024} KiB")
+        return len(rows)
+    except Exception as e:
+        print(f"❌ Failed to archive raw payloads for user {user_id}: {e}")
+        return 0
@@ -0,0 +1,108 @@
+import asyncio
+from sqlalchemy import inspect, select
+from app.database.db import AsyncSessionLocal, dialect_insert
+from app.database.models.bank_transaction_model import BankTransaction
+from app.database.methods.evaluate_budget_alerts import evaluate_budget_alerts
+from app.database.methods.update_category_rollups import add_rollup_delta, apply_rollup_deltas
+
+# Keys per IN (...) lookup when checking which transactions are already stored
+KEY_LOOKUP_BATCH_SIZE = 500
+INSERT_ATTRIBUTES = inspect(BankTransaction).column_attrs
+
+
+async def save_transactions(user_id, records) -> int:
+    """Store booked transactions the user does not have yet; returns how many were added"""
+    return len(await store_transactions(user_id, records))
+
+
+def column_values(row) -> dict:
+    """A built BankTransaction as {column name: value}, for a Core INSERT"""
+    return {
+        column.name: getattr(row, attribute.key) for attribute in INSERT_ATTRIBUTES for column in attribute.columns
+    }
+
+
+async def store_transactions(user_id, records) -> list:
+    """Store booked transactions the user does not have yet; returns the new BankTransaction rows
+
+    Pending rows are skipped: they change (or vanish) once the bank books them.
+    Stored rows whose category changed are recategorized (and take the new
+    categorizer version, as do unchanged ones categorized by a newer one), and the monthly
+    category rollups are adjusted by the difference in the same commit, and
+    budget alerts are evaluated against those changes.
+
+    Stored rows are read under a row lock and new ones are inserted with ON
+    CONFLICT DO NOTHING, so a concurrent sync (or the recategorization job)
+    never has its changes counted twice; rows another sync inserted first are
+    simply left out of the result. Database errors are raised to the caller.
+    """
+    if not user_id or not records:
+        return []
+    by_key = {}
+    occurrences = {}
+    for record in records:
+        if record.pending:
+            continue
+        if record.id:
+            by_key.setdefault(record.dedupe_key(), record)
+            continue
+        # Id-less rows left after deduping are distinct purchases, so repeats get their own key
+        content = record.content_key()
+        occurrence = occurrences.get(content, 0)
+        occurrences[content] = occurrence + 1
+        by_key[record.dedupe_key(occurrence)] = record
+
+    rollup_deltas = {}
+    recategorized = 0
+    reversioned = 0
+    async with AsyncSessionLocal() as db:
+        # Sorted keys, so concurrent writers lock the same rows in the same order
+        keys = sorted(by_key)
+        for start in range(0, len(keys), KEY_LOOKUP_BATCH_SIZE):
+            result = await db.execute(
+                select(BankTransaction).where(
+                    BankTransaction.user_id == user_id,
+                    BankTransaction.transaction_key.in_(keys[start:start + KEY_LOOKUP_BATCH_SIZE])
+                ).order_by(BankTransaction.transaction_key).with_for_update()
+            )
+            for stored in result.scalars():
+                record = by_key.pop(stored.transaction_key, None)
+                if record is None:
+                    continue
+                if record.category and record.category != stored.category:
+                    add_rollup_delta(rollup_deltas, stored, sign=-1)
+                    stored.category = record.category
+                    add_rollup_delta(rollup_deltas, stored)
+                    recategorized += 1
+                if record.category_version and record.category_version != stored.categorizer_version:
+                    stored.categorizer_version = record.category_version
+                    reversioned += 1
+
+        rows = []
+        if by_key:
+            # Encrypting counterparties is CPU-bound, so build the rows off the event loop
+            built = await asyncio.to_thread(
+                lambda: [BankTransaction.from_record(user_id, record, key) for key, record in by_key.items()]
+            )
+            table = BankTransaction.__table__
+            statement = dialect_insert(db, table).on_conflict_do_nothing(
+                index_elements=[table.c.user_id, table.c.transaction_key]
+            ).returning(table.c.id)
+            inserted = set()
+            for start in range(0, len(built), KEY_LOOKUP_BATCH_SIZE):
+                batch = built[start:start + KEY_LOOKUP_BATCH_SIZE]
+                result = await db.execute(statement, [column_values(row) for row in batch])
+                inserted.update(result.scalars())
+            rows = [row for row in built if row.id in inserted]
+            for row in rows:
+                add_rollup_delta(rollup_deltas, row)
+
+        if not rows and not recategorized and not reversioned:
+            return []
+
+        await apply_rollup_deltas(db, user_id, rollup_deltas)
+        await evaluate_budget_alerts(db, user_id, rollup_deltas)
+        await db.commit()
+
+    print(f"💾 Stored {len(rows)} new transactions for user {user_id} ({recategorized} recategorized)")
+    return rows
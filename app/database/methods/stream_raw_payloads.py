@@ -0,0 +1,32 @@
+from sqlalchemy import select, tuple_
+from app.database.db import AsyncSessionLocal
+from app.database.models.raw_payload_model import RawPayload
+
+REPLAY_BATCH_SIZE = 50
+
+
+async def stream_raw_payloads(user_id=None, fetched_from=None, fetched_to=None, batch_size=REPLAY_BATCH_SIZE):
+    """Yield archived payloads oldest first, one keyset batch at a time (optionally for one user)"""
+    last = None
+    while True:
+        statement = select(RawPayload)
+        if user_id is not None:
+            statement = statement.where(RawPayload.user_id == user_id)
+        if fetched_from is not None:
+            statement = statement.where(RawPayload.fetched_at >= fetched_from)
+        if fetched_to is not None:
+            statement = statement.where(RawPayload.fetched_at <= fetched_to)
+        if last is not None:
+            statement = statement.where(tuple_(RawPayload.fetched_at, RawPayload.id) > last)
+        statement = statement.order_by(RawPayload.fetched_at, RawPayload.id).limit(batch_size)
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(statement)
+            batch = result.scalars().all()
+
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last = (batch[-1].fetched_at, batch[-1].id)
@@ -0,0 +1,62 @@
+from sqlalchemy import select, tuple_
+from app.database.db import AsyncSessionLocal
+from app.database.models.bank_transaction_model import BankTransaction
+
+EXPORT_BATCH_SIZE = 1000
+
+
+async def stream_transactions(user_id, date_from=None, date_to=None, batch_size=EXPORT_BATCH_SIZE, where=None):
+    """Yield a user's stored transactions in (booking_date, id) order, one keyset batch at a time
+
+    Each batch uses its own short session, so memory stays constant however
+    long the history is and no connection is held while the client reads.
+    `where` is an optional list of extra filters.
+    """
+    last = None
+    while True:
+        statement = select(BankTransaction).where(BankTransaction.user_id == user_id, *(where or ()))
+        if date_from is not None:
+            statement = statement.where(BankTransaction.booking_date >= date_from)
+        if date_to is not None:
+            statement = statement.where(BankTransaction.booking_date <= date_to)
+        if last is not None:
+            statement = statement.where(tuple_(BankTransaction.booking_date, BankTransaction.id) > last)
+        statement = statement.order_by(BankTransaction.booking_date, BankTransaction.id).limit(batch_size)
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(statement)
+            batch = result.scalars().all()
+
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last = (batch[-1].booking_date, batch[-1].id)
+
+
+async def stream_all_transactions(where=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield every user's stored transactions in id order, one keyset batch at a time (for offline jobs)
+
+    `where` is an optional extra filter. Rows changed by the caller between
+    batches are not revisited, because each batch starts after the last id.
+    """
+    last_id = None
+    while True:
+        statement = select(BankTransaction)
+        if where is not None:
+            statement = statement.where(where)
+        if last_id is not None:
+            statement = statement.where(BankTransaction.id > last_id)
+        statement = statement.order_by(BankTransaction.id).limit(batch_size)
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(statement)
+            batch = result.scalars().all()
+
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1].id
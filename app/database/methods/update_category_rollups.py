@@ -0,0 +1,47 @@
+import uuid
+from app.database.db import dialect_insert
+from app.database.models.category_rollup_model import CategoryRollup
+
+
+def add_rollup_delta(deltas: dict, transaction, sign=1):
+    """Add (sign=1) or remove (sign=-1) one stored transaction from the pending rollup changes"""
+    key = (transaction.booking_date.replace(day=1), transaction.category or "Unknown", transaction.currency)
+    delta = deltas.setdefault(key, [0, 0, 0])
+    amount = transaction.amount_minor or 0
+    if amount > 0:
+        delta[0] += sign * amount
+    else:
+        delta[1] += sign * -amount
+    delta[2] += sign
+
+
+async def apply_rollup_deltas(db, user_id, deltas: dict) -> int:
+    """Apply rollup changes inside the caller's session (committed together with the transactions)
+
+    Buckets are created or incremented with one INSERT ... ON CONFLICT DO
+    UPDATE that adds the deltas in SQL, so concurrent writers (two syncs, or
+    a sync and the recategorization job) never overwrite each other's
+    increments or collide on a new bucket. Keys are written in sorted order
+    so writers lock buckets in the same order.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return 0
+
+    statement = dialect_insert(db, CategoryRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "month", "category", "currency"],
+        set_={
+            "income_minor": CategoryRollup.income_minor + statement.excluded.income_minor,
+            "spent_minor": CategoryRollup.spent_minor + statement.excluded.spent_minor,
+            "count": CategoryRollup.count + statement.excluded.count,
+        }
+    )
+    await db.execute(statement, [
+        {
+            "id": uuid.uuid4(), "user_id": user_id, "month": month, "category": category, "currency": currency,
+            "income_minor": income, "spent_minor": spent, "count": count
+        }
+        for (month, category, currency), (income, spent, count) in sorted(deltas.items())
+    ])
+    return len(deltas)
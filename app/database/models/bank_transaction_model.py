@@ -0,0 +1,107 @@
+from datetime import date, datetime, timezone
+import uuid
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy import UUID, BigInteger, Column, Date, DateTime, ForeignKey, String, UniqueConstraint
+from app.database.base import Base
+from app.utils.email_encryption import email_encryption  # Reuse existing encryption
+from app.utils.transactions.money import format_amount
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+class BankTransaction(Base):
+    """A synced bank transaction, kept so history can be exported without calling Nordigen"""
+    __tablename__ = 'bank_transactions'
+    __table_args__ = (UniqueConstraint("user_id", "transaction_key", name="uq_bank_transactions_user_key"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    transaction_key = Column(String(40), nullable=False)   # TransactionRecord.dedupe_key()
+    transaction_id = Column(String, nullable=False, default="")
+    merchant_key = Column(String(40), nullable=True, index=True)  # TransactionRecord.merchant_key(), None if undated
+    booking_date = Column(Date, nullable=False, index=True)
+    amount_minor = Column(BigInteger, nullable=True)
+    currency = Column(String(3), nullable=False)
+    _company = Column("company", String, nullable=True)          # 🔐 Encrypted
+    _description = Column("description", String, nullable=True)  # 🔐 Encrypted
+    category = Column(String, nullable=True)
+    categorizer_version = Column(String(40), nullable=True, index=True)  # CategorizerRegistry.version_tag()
+    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        if not self.created_at:
+            self.created_at = datetime.now(timezone.utc)
+
+    @classmethod
+    def from_record(cls, user_id, record, transaction_key=None):
+        """Build a row from a categorized TransactionRecord
+
+        Undated rows get today's date and no merchant key, which keeps that
+        made-up date out of recurring payment detection.
+        """
+        try:
+            booking_date = date.fromisoformat(record.booking_date)
+            merchant_key = record.merchant_key()
+        except (TypeError, ValueError):
+            booking_date = datetime.now(timezone.utc).date()
+            merchant_key = None
+        return cls(
+            user_id=user_id,
+            transaction_key=transaction_key or record.dedupe_key(),
+            transaction_id=record.id or "",
+            merchant_key=merchant_key,
+            booking_date=booking_date,
+            amount_minor=record.amount_minor,
+            currency=record.currency,
+            company=record.company,
+            description=record.description,
+            category=record.category,
+            categorizer_version=record.category_version
+        )
+
+    def to_record(self) -> TransactionRecord:
+        """The stored row as a categorized TransactionRecord (decrypts the counterparty)"""
+        return TransactionRecord(
+            self.transaction_id, self.amount_minor, self.currency, self.booking_date.isoformat(), self.company or "",
+            self.description or "", self.category, category_version=self.categorizer_version
+        )
+
+    @hybrid_property
+    def company(self):
+        """Decrypt company when accessing"""
+        if self._company:
+            return email_encryption.decrypt(self._company)
+        return self._company
+
+    @company.setter
+    def company(self, value):
+        """Encrypt company when setting"""
+        self._company = email_encryption.encrypt(value) if value else value
+
+    @hybrid_property
+    def description(self):
+        """Decrypt description when accessing"""
+        if self._description:
+            return email_encryption.decrypt(self._description)
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        """Encrypt description when setting"""
+        self._description = email_encryption.encrypt(value) if value else value
+
+    def to_export_row(self) -> dict:
+        return {
+            "id": self.transaction_id,
+            "date": self.booking_date.isoformat(),
+            "amount": format_amount(self.amount_minor, self.currency) if self.amount_minor is not None else "",
+            "currency": self.currency,
+            "company": self.company or "",
+            "description": self.description or "",
+            "category": self.category or ""
+        }
+
+    def __repr__(self):
+        return f"<BankTransaction(id={self.id}, user_id={self.user_id}, date={self.booking_date})>"
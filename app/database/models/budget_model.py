@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+import uuid
+from sqlalchemy import UUID, BigInteger, Column, Date, DateTime, Float, ForeignKey, String, UniqueConstraint
+from app.database.base import Base
+
+# Fractions of a budget that raise an alert the first time spending reaches them in a month
+BUDGET_ALERT_THRESHOLDS = (0.8, 1.0)
+
+
+class Budget(Base):
+    """A user's monthly spending limit for one category"""
+    __tablename__ = 'budgets'
+    __table_args__ = (UniqueConstraint("user_id", "category", "currency", name="uq_budgets_category"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    category = Column(String, nullable=False)
+    currency = Column(String(3), nullable=False)
+    limit_minor = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        if not self.created_at:
+            self.created_at = datetime.now(timezone.utc)
+
+    def __repr__(self):
+        return f"<Budget(id={self.id}, user_id={self.user_id}, category={self.category})>"
+
+
+class BudgetAlert(Base):
+    """Raised once per budget, month and threshold when spending first reaches it"""
+    __tablename__ = 'budget_alerts'
+    __table_args__ = (UniqueConstraint("budget_id", "month", "threshold", name="uq_budget_alerts_once"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    budget_id = Column(UUID(as_uuid=True), ForeignKey('budgets.id', ondelete="CASCADE"), nullable=False)
+    month = Column(Date, nullable=False)
+    threshold = Column(Float, nullable=False)
+    spent_minor = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        if not self.created_at:
+            self.created_at = datetime.now(timezone.utc)
+
+    def __repr__(self):
+        return f"<BudgetAlert(budget_id={self.budget_id}, month={self.month}, threshold={self.threshold})>"
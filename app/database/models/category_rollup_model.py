@@ -0,0 +1,31 @@
+import uuid
+from sqlalchemy import UUID, BigInteger, Column, Date, ForeignKey, Integer, String, UniqueConstraint
+from app.database.base import Base
+
+
+class CategoryRollup(Base):
+    """Per user, month, category and currency totals, kept current as transactions are stored"""
+    __tablename__ = 'category_rollups'
+    __table_args__ = (
+        UniqueConstraint("user_id", "month", "category", "currency", name="uq_category_rollups_bucket"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    month = Column(Date, nullable=False)          # First day of the month
+    category = Column(String, nullable=False)
+    currency = Column(String(3), nullable=False)
+    income_minor = Column(BigInteger, nullable=False, default=0)
+    spent_minor = Column(BigInteger, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        for name in ("income_minor", "spent_minor", "count"):
+            if getattr(self, name) is None:
+                setattr(self, name, 0)
+
+    def __repr__(self):
+        return f"<CategoryRollup(user_id={self.user_id}, month={self.month}, category={self.category})>"
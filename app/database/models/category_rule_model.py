@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+import uuid
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, Integer, String
+from app.database.base import Base
+
+MATCH_TYPES = ("keyword", "exact")
+
+
+class CategoryRule(Base):
+    """A user's own merchant → category override, applied before the global dictionary"""
+    __tablename__ = 'category_rules'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    pattern = Column(String, nullable=False)
+    match_type = Column(String, nullable=False, default="keyword")  # "keyword" or "exact"
+    category = Column(String, nullable=False)
+    priority = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        if not self.match_type:
+            self.match_type = "keyword"
+        if self.priority is None:
+            self.priority = 0
+        if not self.created_at:
+            self.created_at = datetime.now(timezone.utc)
+        if not self.updated_at:
+            self.updated_at = self.created_at
+
+    def to_dict(self) -> dict:
+        return {
+            "id": str(self.id),
+            "pattern": self.pattern,
+            "match_type": self.match_type,
+            "category": self.category,
+            "priority": self.priority
+        }
+
+    def __repr__(self):
+        return f"<CategoryRule(id={self.id}, user_id={self.user_id}, category={self.category})>"
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+import uuid
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy import UUID, Column, DateTime, String
+from app.database.base import Base
+from app.utils.email_encryption import email_encryption  # Reuse existing encryption
+
+ALIAS_SOURCES = ("auto", "admin")
+
+
+class MerchantAlias(Base):
+    """A normalized raw counterparty resolved to its canonical merchant, shared by every user.
+
+    Rows are looked up by `alias_key`, a digest of the normalized counterparty
+    (the company, or the description when there is none); the text itself is
+    only kept encrypted, for admins.
+    "auto" rows come from the categorizer and only apply while the merchant
+    dictionary they were derived from (`dictionary_version`) is in use;
+    "admin" rows are corrections that always apply and are never overwritten.
+    """
+    __tablename__ = 'merchant_aliases'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    alias_key = Column(String(40), nullable=False, unique=True)
+    _counterparty = Column("counterparty", String, nullable=True)  # 🔐 Encrypted
+    merchant = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    source = Column(String, nullable=False, default="auto")  # "auto" or "admin"
+    dictionary_version = Column(String(12), nullable=True)   # Categorizer.version, auto rows only
+    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        if not self.source:
+            self.source = "auto"
+        if not self.created_at:
+            self.created_at = datetime.now(timezone.utc)
+        if not self.updated_at:
+            self.updated_at = self.created_at
+
+    @hybrid_property
+    def counterparty(self):
+        """Decrypt counterparty when accessing"""
+        if self._counterparty:
+            return email_encryption.decrypt(self._counterparty)
+        return self._counterparty
+
+    @counterparty.setter
+    def counterparty(self, value):
+        """Encrypt counterparty when setting"""
+        self._counterparty = email_encryption.encrypt(value) if value else value
+
+    def to_dict(self) -> dict:
+        return {
+            "id": str(self.id),
+            "counterparty": self.counterparty or "",
+            "merchant": self.merchant,
+            "category": self.category,
+            "source": self.source
+        }
+
+    def __repr__(self):
+        return f"<MerchantAlias(id={self.id}, merchant={self.merchant}, source={self.source})>"
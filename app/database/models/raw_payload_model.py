@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+import json
+import uuid
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy import UUID, Column, Date, DateTime, ForeignKey, Integer, LargeBinary, String, UniqueConstraint
+from app.database.base import Base
+from app.utils.email_encryption import email_encryption  # Reuse existing encryption
+from app.utils.transactions.payload_archive import (
+    account_digest, compress_payload, decompress_payload, payload_digest, payload_window
+)
+
+
+class RawPayload(Base):
+    """One account's raw Nordigen transactions for one sync window, kept for offline replay.
+
+    The body is compressed and then encrypted (compressing ciphertext would
+    gain nothing). `window_from`/`window_to` are the first and last booking
+    date it covers; an identical body already archived for the user is not
+    stored again. `account_key` groups an account's windows (see
+    payload_archive.account_digest).
+    """
+    __tablename__ = 'raw_payloads'
+    __table_args__ = (UniqueConstraint('user_id', 'payload_digest', name='uq_raw_payload_user_digest'),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    _requisition_id = Column("requisition_id", String, nullable=True)  # 🔐 Encrypted
+    _account_id = Column("account_id", String, nullable=True)          # 🔐 Encrypted
+    account_key = Column(String(40), nullable=True, index=True)
+    country = Column(String(2), nullable=True)  # Merchant dictionary the bank is categorized with
+    codec = Column(String(8), nullable=False)   # "gzip" or "zstd"
+    payload_digest = Column(String(40), nullable=False)
+    _payload = Column("payload", LargeBinary, nullable=False)  # 🔐 Compressed, then encrypted
+    raw_size = Column(Integer, nullable=False)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    window_from = Column(Date, nullable=True)
+    window_to = Column(Date, nullable=True)
+    fetched_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), index=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        if not self.fetched_at:
+            self.fetched_at = datetime.now(timezone.utc)
+
+    @classmethod
+    def from_raw(cls, user_id, requisition_id, account_id, country, raw: bytes, codec="gzip"):
+        """Archive a raw response body (CPU-bound: parses, compresses and encrypts it)"""
+        data = json.loads(raw)
+        transactions = data.get("transactions", {}) if isinstance(data, dict) else {}
+        rows = [row for status in ("booked", "pending") for row in transactions.get(status, [])]
+        window_from, window_to = payload_window(rows)
+        archive = cls(
+            user_id=user_id,
+            account_key=account_digest(account_id),
+            country=country,
+            codec=codec,
+            payload_digest=payload_digest(raw),
+            _payload=email_encryption.cipher.encrypt(compress_payload(raw, codec)),
+            raw_size=len(raw),
+            transaction_count=len(rows),
+            window_from=window_from,
+            window_to=window_to
+        )
+        archive.requisition_id = requisition_id
+        archive.account_id = account_id
+        return archive
+
+    @property
+    def raw(self) -> bytes:
+        """The original response body"""
+        return decompress_payload(email_encryption.cipher.decrypt(self._payload), self.codec)
+
+    @property
+    def stored_size(self) -> int:
+        return len(self._payload)
+
+    @hybrid_property
+    def requisition_id(self):
+        """Decrypt requisition_id when accessing"""
+        if self._requisition_id:
+            return email_encryption.decrypt(self._requisition_id)
+        return self._requisition_id
+
+    @requisition_id.setter
+    def requisition_id(self, value):
+        """Encrypt requisition_id when setting"""
+        self._requisition_id = email_encryption.encrypt(value) if value else value
+
+    @hybrid_property
+    def account_id(self):
+        """Decrypt account_id when accessing"""
+        if self._account_id:
+            return email_encryption.decrypt(self._account_id)
+        return self._account_id
+
+    @account_id.setter
+    def account_id(self, value):
+        """Encrypt account_id when setting"""
+        self._account_id = email_encryption.encrypt(value) if value else value
+
+    def to_dict(self) -> dict:
+        return {
+            "id": str(self.id),
+            "country": self.country,
+            "codec": self.codec,
+            "raw_size": self.raw_size,
+            "stored_size": self.stored_size,
+            "transaction_count": self.transaction_count,
+            "window_from": self.window_from.isoformat() if self.window_from else None,
+            "window_to": self.window_to.isoformat() if self.window_to else None,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None
+        }
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+import uuid
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy import UUID, BigInteger, Column, Date, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint
+from app.database.base import Base
+from app.utils.email_encryption import email_encryption  # Reuse existing encryption
+from app.utils.transactions.money import to_major_units
+
+
+class RecurringPayment(Base):
+    """A detected subscription or other regular payment, refreshed after each sync"""
+    __tablename__ = 'recurring_payments'
+    __table_args__ = (
+        # One merchant can have several plans, told apart by amount
+        UniqueConstraint("user_id", "merchant_key", "currency", "amount_minor", name="uq_recurring_payments_payment"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    merchant_key = Column(String(40), nullable=False)
+    _merchant = Column("merchant", String, nullable=True)  # 🔐 Encrypted
+    category = Column(String, nullable=True)
+    currency = Column(String(3), nullable=False)
+    period = Column(String, nullable=False)
+    interval_days = Column(Float, nullable=False)
+    amount_minor = Column(BigInteger, nullable=False)
+    occurrences = Column(Integer, nullable=False)
+    first_date = Column(Date, nullable=False)
+    last_date = Column(Date, nullable=False)
+    next_date = Column(Date, nullable=False)
+    confidence = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.id:
+            self.id = uuid.uuid4()
+        if not self.updated_at:
+            self.updated_at = datetime.now(timezone.utc)
+
+    @hybrid_property
+    def merchant(self):
+        """Decrypt merchant when accessing"""
+        if self._merchant:
+            return email_encryption.decrypt(self._merchant)
+        return self._merchant
+
+    @merchant.setter
+    def merchant(self, value):
+        """Encrypt merchant when setting"""
+        self._merchant = email_encryption.encrypt(value) if value else value
+
+    def to_dict(self) -> dict:
+        return {
+            "id": str(self.id),
+            "merchant": self.merchant,
+            "category": self.category,
+            "period": self.period,
+            "interval_days": self.interval_days,
+            "amount": to_major_units(self.amount_minor, self.currency),
+            "currency": self.currency,
+            "occurrences": self.occurrences,
+            "first_date": self.first_date.isoformat(),
+            "last_date": self.last_date.isoformat(),
+            "next_date": self.next_date.isoformat(),
+            "confidence": self.confidence
+        }
+
+    def __repr__(self):
+        return f"<RecurringPayment(id={self.id}, user_id={self.user_id}, period={self.period})>"
@@ -0,0 +1,53 @@
+import asyncio
+from sqlalchemy import text
+from app.database.db import engine
+from app.database.methods.load_merchant_aliases import load_merchant_aliases, reload_merchant_alias
+
+# Postgres LISTEN/NOTIFY channel; the payload is the changed alias_key
+ALIAS_CHANNEL = "merchant_aliases"
+RECONNECT_DELAY_SECONDS = 5
+# Running reloads, referenced so they are not garbage collected before they finish
+_reload_tasks = set()
+
+
+async def notify_alias_change(db, key: str):
+    """Tell every server process that an alias changed (sent when `db` commits; Postgres only)"""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    await db.execute(text("SELECT pg_notify(:channel, :key)"), {"channel": ALIAS_CHANNEL, "key": key})
+
+
+async def listen_for_alias_changes():
+    """Keep this process's alias table in step with edits made by other processes
+
+    Each notification reloads the one alias it names. When the listening
+    connection drops, notifications may have been missed, so the whole table
+    is reloaded after reconnecting.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    first_connect = True
+    while True:
+        try:
+            async with engine.connect() as connection:
+                raw_connection = await connection.get_raw_connection()
+                listener = raw_connection.driver_connection
+                closed = asyncio.Event()
+
+                def on_notification(_, __, ___, key):
+                    task = asyncio.create_task(reload_merchant_alias(key))
+                    _reload_tasks.add(task)
+                    task.add_done_callback(_reload_tasks.discard)
+
+                listener.add_termination_listener(lambda _: closed.set())
+                await listener.add_listener(ALIAS_CHANNEL, on_notification)
+                if not first_connect:
+                    await load_merchant_aliases()
+                first_connect = False
+                print(f"👂 Listening for merchant alias changes on '{ALIAS_CHANNEL}'")
+                await closed.wait()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Merchant alias listener failed: {e}")
+        await asyncio.sleep(RECONNECT_DELAY_SECONDS)
@@ -0,0 +1,175 @@
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from sqlalchemy import func, or_, select
+from app.config import RECATEGORIZE_BATCH_SIZE, RECATEGORIZE_PAUSE_SECONDS
+from app.database.db import AsyncSessionLocal
+from app.database.models.bank_transaction_model import BankTransaction
+from app.database.methods.stream_transactions import stream_all_transactions
+from app.database.methods.update_category_rollups import add_rollup_delta, apply_rollup_deltas
+from app.utils.transactions.merchant_registry import categorizer_registry
+from app.utils.transactions.user_rules import get_user_rule_matcher
+
+
+def outdated_filter(version_tags):
+    """Rows never categorized with a version, or with one no current categorizer produces"""
+    return or_(BankTransaction.categorizer_version.is_(None),
+               BankTransaction.categorizer_version.notin_(list(version_tags)))
+
+
+def categorize_stored(categorizer, rows, matchers) -> list:
+    """Categories for stored rows, user rules included, decrypting each counterparty once"""
+    decrypted = [(row.company, row.description, row.amount_minor, row.currency) for row in rows]
+    categories = categorizer.categorize_rows(decrypted)
+    for index, (row, (company, description, _, _)) in enumerate(zip(rows, decrypted)):
+        matcher = matchers.get(row.user_id)
+        if matcher is not None:
+            override = matcher.match(company, description)
+            if override is not None:
+                categories[index] = override
+    return categories
+
+
+async def recategorize_batch(rows, registry=categorizer_registry) -> tuple:
+    """Recategorize one batch of stored rows; returns (rows updated, categories changed)
+
+    Categories are computed outside any transaction. The rows are then
+    re-read under a row lock, taken in transaction_key order like
+    store_transactions does, and only those still holding the category the
+    computation started from are written. A sync that recategorized a row in
+    the meantime therefore wins, and since both writers hold the row lock
+    until their rollup upsert commits, a row's old bucket is only ever
+    decremented once.
+    """
+    by_country = {}
+    matchers = {}
+    for row in rows:
+        by_country.setdefault(registry.country_of_version_tag(row.categorizer_version), []).append(row)
+        if row.user_id not in matchers:
+            matchers[row.user_id] = await get_user_rule_matcher(row.user_id)
+
+    computed = {}
+    for country, country_rows in by_country.items():
+        tag = registry.version_tag(country)
+        # Decrypting counterparties and matching are CPU-bound
+        categories = await asyncio.to_thread(categorize_stored, registry.get(country), country_rows, matchers)
+        for row, category in zip(country_rows, categories):
+            computed[row.id] = (row.category, category, tag)
+
+    updated = changed = 0
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(BankTransaction).where(BankTransaction.id.in_(list(computed)))
+            .order_by(BankTransaction.transaction_key).with_for_update()
+        )
+        rollup_deltas = {}
+        for stored in result.scalars():
+            seen_category, category, tag = computed[stored.id]
+            if stored.category != seen_category or stored.categorizer_version == tag:
+                continue
+            if category != stored.category:
+                deltas = rollup_deltas.setdefault(stored.user_id, {})
+                add_rollup_delta(deltas, stored, sign=-1)
+                stored.category = category
+                add_rollup_delta(deltas, stored)
+                changed += 1
+            stored.categorizer_version = tag
+            updated += 1
+        for user_id in sorted(rollup_deltas, key=str):
+            await apply_rollup_deltas(db, user_id, rollup_deltas[user_id])
+        await db.commit()
+    return updated, changed
+
+
+class RecategorizationJob:
+    """Backfill that brings stored categories up to the current categorizer versions.
+
+    Outdated rows are streamed in id-keyset batches with a pause between
+    batches, so the job can run next to live traffic. Only one run is active
+    per process; `progress()` reports how far it got.
+    """
+
+    def __init__(self, registry=categorizer_registry, batch_size=RECATEGORIZE_BATCH_SIZE,
+                 pause_seconds=RECATEGORIZE_PAUSE_SECONDS):
+        self.registry = registry
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self._task = None
+        self._reset()
+
+    def _reset(self):
+        self.total = 0
+        self.processed = 0
+        self.updated = 0
+        self.changed = 0
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Start a run in the background; False when one is already running"""
+        if self.running:
+            return False
+        self._task = asyncio.ensure_future(self.run())
+        return True
+
+    async def run(self) -> dict:
+        self._reset()
+        self.started_at = datetime.now(timezone.utc)
+        try:
+            version_tags = await asyncio.to_thread(self.registry.current_version_tags)
+            where = outdated_filter(version_tags.values())
+            async with AsyncSessionLocal() as db:
+                self.total = await db.scalar(select(func.count()).select_from(BankTransaction).where(where))
+            print(f"🔁 Recategorizing {self.total} transactions with outdated categories")
+
+            async for batch in stream_all_transactions(where=where, batch_size=self.batch_size):
+                updated, changed = await recategorize_batch(batch, self.registry)
+                self.processed += len(batch)
+                self.updated += updated
+                self.changed += changed
+                print(f"🔁 Recategorized {self.processed}/{self.total} transactions, {self.changed} changed")
+                if self.pause_seconds:
+                    await asyncio.sleep(self.pause_seconds)
+        except Exception as e:
+            self.error = str(e)
+            print(f"❌ Recategorization failed after {self.processed} transactions: {e}")
+        else:
+            print(f"✅ Recategorization done: {self.updated} updated, {self.changed} changed category")
+        finally:
+            self.finished_at = datetime.now(timezone.utc)
+        return self.progress()
+
+    def progress(self) -> dict:
+        end = self.finished_at or datetime.now(timezone.utc)
+        elapsed = (end - self.started_at).total_seconds() if self.started_at else 0.0
+        rate = self.processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.processed, 0)
+        return {
+            "running": self.running,
+            "total": self.total,
+            "processed": self.processed,
+            "updated": self.updated,
+            "changed": self.changed,
+            "rate_per_second": round(rate, 1),
+            "eta_seconds": round(remaining / rate) if self.running and rate else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error
+        }
+
+
+recategorization_job = RecategorizationJob()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recategorize stored transactions with outdated categories")
+    parser.add_argument("--batch-size", type=int, default=RECATEGORIZE_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=RECATEGORIZE_PAUSE_SECONDS, help="seconds between batches")
+    arguments = parser.parse_args()
+    job = RecategorizationJob(batch_size=arguments.batch_size, pause_seconds=arguments.pause)
+    asyncio.run(job.run())
@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from app.database.methods.save_transactions import store_transactions
+from app.database.methods.stream_raw_payloads import stream_raw_payloads
+from app.nordingen.methods.get_all_transactions import account_transactions
+from app.utils.transactions.dedupe_transactions import dedupe_transactions
+from app.utils.transactions.extract_essentials_transactions import extract_essentials_transactions
+
+
+def archived_transactions(archive) -> list:
+    """Decrypt, decompress and flatten one archived payload (CPU-bound)"""
+    return account_transactions(json.loads(archive.raw), archive.account_id)
+
+
+async def replay_raw_payloads(user_id=None, store=False, fetched_from=None, fetched_to=None) -> dict:
+    """Run archived Nordigen payloads through the sync pipeline again, without calling Nordigen
+
+    Each payload is parsed and categorized as a sync would (with the user's
+    rules and the bank's country). With `store`, the result is stored like a
+    sync: new transactions are added and stored ones whose category changed
+    are recategorized. Without it, the replay only reports what it found.
+    """
+    summary = {"payloads": 0, "failed": 0, "transactions": 0, "stored": 0, "categories": {}}
+    async for batch in stream_raw_payloads(user_id, fetched_from, fetched_to):
+        for archive in batch:
+            try:
+                transactions = await asyncio.to_thread(archived_transactions, archive)
+                essentials = await extract_essentials_transactions(
+                    transactions, user_id=archive.user_id, country=archive.country
+                )
+                essentials, _ = dedupe_transactions(essentials)
+                if store:
+                    summary["stored"] += len(await store_transactions(archive.user_id, essentials))
+            except Exception as e:
+                summary["failed"] += 1
+                print(f"❌ Failed to replay payload {archive.id}: {e}")
+                continue
+            summary["payloads"] += 1
+            summary["transactions"] += len(essentials)
+            for essential in essentials:
+                summary["categories"][essential.category] = summary["categories"].get(essential.category, 0) + 1
+        print(f"🔁 Replayed {summary['payloads']} payloads, {summary['transactions']} transactions")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprocess archived Nordigen payloads offline")
+    parser.add_argument("--user-id", type=uuid.UUID, help="only this user's payloads")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only payloads fetched from this date")
+    parser.add_argument("--store", action="store_true", help="store the results (default: report only)")
+    arguments = parser.parse_args()
+    since = arguments.since.replace(tzinfo=arguments.since.tzinfo or timezone.utc) if arguments.since else None
+    result = asyncio.run(replay_raw_payloads(arguments.user_id, arguments.store, fetched_from=since))
+    print(json.dumps(result, indent=2, sort_keys=True))
@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+from app.config import CATEGORY_CLASSIFIER_PATH
+from app.database.methods.stream_transactions import stream_all_transactions
+from app.utils.transactions.categorizer import AMOUNT_CATEGORIES, categorizer
+from app.utils.transactions.ngram_classifier import HASH_BUCKETS, NgramClassifier, classifier_text
+
+
+def training_examples(rows, merchant_categorizer=categorizer) -> tuple:
+    """(texts, labels) worth learning from in a batch of stored transactions
+
+    Rows whose category is only an amount band are skipped (unless a merchant
+    really matched), otherwise the model would learn to guess amount bands
+    from the text.
+    """
+    texts, labels = [], []
+    for row in rows:
+        company, description = row.company, row.description
+        if not row.category or not (company or description):
+            continue
+        if row.category in AMOUNT_CATEGORIES and merchant_categorizer.merchant_category(company, description) is None:
+            continue
+        texts.append(classifier_text(company, description))
+        labels.append(row.category)
+    return texts, labels
+
+
+async def train_category_classifier(path=CATEGORY_CLASSIFIER_PATH, buckets=HASH_BUCKETS):
+    """Train the n-gram classifier from every stored, categorized transaction and save it to `path`"""
+    if not path:
+        raise ValueError("No output path (set CATEGORY_CLASSIFIER_PATH or pass one)")
+    classifier = NgramClassifier(buckets=buckets)
+    seen = used = 0
+    async for batch in stream_all_transactions():
+        # Decrypting counterparties and hashing n-grams are CPU-bound
+        texts, labels = await asyncio.to_thread(training_examples, batch)
+        await asyncio.to_thread(classifier.partial_fit, texts, labels)
+        seen += len(batch)
+        used += len(texts)
+        print(f"🧠 Read {seen} transactions, {used} used for training")
+
+    if not used:
+        print("❌ No categorized transactions to train on, classifier not saved")
+        return None
+    classifier.finalize()
+    classifier.save(path)
+    print(f"✅ Saved n-gram classifier ({len(classifier.categories)} categories, {used} examples) to {path}")
+    return classifier
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the fallback n-gram category classifier")
+    parser.add_argument("path", nargs="?", default=CATEGORY_CLASSIFIER_PATH, help="output .npz file")
+    parser.add_argument("--buckets", type=int, default=HASH_BUCKETS, help="hash buckets (a power of two)")
+    arguments = parser.parse_args()
+    asyncio.run(train_category_classifier(arguments.path, arguments.buckets))
@@ -10,4 +10,13 @@ import app.nordingen.end_points.nordingen_add_requisition
 import app.neutral_end_points.login_user
 import app.nordingen.end_points.nordingen_get_transactions
 import app.neutral_end_points.refresh_token
-import app.neutral_end_points.check_token_validity
\ No newline at end of file
+import app.neutral_end_points.check_token_validity
+import app.neutral_end_points.category_rules
+import app.neutral_end_points.export_transactions
+import app.neutral_end_points.monthly_summary
+import app.neutral_end_points.analytics_timeseries
+import app.neutral_end_points.recurring_payments
+import app.neutral_end_points.budgets
+import app.neutral_end_points.search_transactions
+import app.neutral_end_points.merchant_aliases
+import app.neutral_end_points.recategorization
\ No newline at end of file
@@ -0,0 +1,77 @@
+import calendar
+from datetime import date
+import numpy as np
+from quart import jsonify, request
+from app.main_routes import routes
+from app.database.methods.get_category_rollups import get_category_rollups
+from app.database.methods.get_transaction_amounts import get_transaction_amounts
+from app.database.methods.get_user_id import get_user_id
+from app.utils.transactions.timeseries import (
+    GRANULARITIES, MAX_PERIODS, build_timeseries, period_count, timeseries_from_rollups
+)
+from app.utils.security.jwt_utils import require_jwt
+
+
+@routes.route("/analytics/timeseries", methods=["GET"])
+@require_jwt
+async def analytics_timeseries():
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    granularity = request.args.get("granularity", "month")
+    if granularity not in GRANULARITIES:
+        return jsonify({"error": f"granularity must be one of {', '.join(GRANULARITIES)}"}), 400
+
+    try:
+        date_from = date.fromisoformat(request.args["date_from"]) if request.args.get("date_from") else None
+        date_to = date.fromisoformat(request.args["date_to"]) if request.args.get("date_to") else None
+    except ValueError:
+        return jsonify({"error": "date_from and date_to must be YYYY-MM-DD dates"}), 400
+    if date_from and date_to and date_from > date_to:
+        return jsonify({"error": "date_from must not be after date_to"}), 400
+    # The series is zero-filled over the requested range (an open end is measured from today)
+    if date_from or date_to:
+        today = date.today()
+        span_from = date_from or min(date_to, today)
+        span_to = date_to or max(date_from, today)
+        if period_count(span_from, span_to, granularity) > MAX_PERIODS:
+            return jsonify({"error": f"date range spans more than {MAX_PERIODS} {granularity} buckets"}), 400
+
+    category = request.args.get("category")
+    categories = [name.strip() for name in category.split(",") if name.strip()] if category else None
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    # Whole months come straight from the rollups; partial months and finer buckets need the rows
+    whole_months = (date_from is None or date_from.day == 1) and \
+        (date_to is None or date_to.day == calendar.monthrange(date_to.year, date_to.month)[1])
+    if granularity == "month" and whole_months:
+        rollups = await get_category_rollups(
+            user_id,
+            month_from=date_from,
+            month_to=date_to.replace(day=1) if date_to else None,
+            categories=categories
+        )
+        series = timeseries_from_rollups(rollups, date_from, date_to)
+        source = "rollups"
+    else:
+        rows = await get_transaction_amounts(user_id, date_from, date_to, categories)
+        series = build_timeseries(
+            np.array([row[0] for row in rows], dtype="datetime64[D]"),
+            np.array([row[1] or 0 for row in rows], dtype=np.int64),
+            [row[2] for row in rows],
+            granularity,
+            date_from,
+            date_to
+        )
+        source = "transactions"
+
+    return jsonify({
+        "granularity": granularity,
+        "categories": categories,
+        "source": source,
+        "series": series
+    }), 200
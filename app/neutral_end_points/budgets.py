@@ -0,0 +1,144 @@
+import uuid
+from datetime import datetime, timezone
+from quart import jsonify, request
+from sqlalchemy import select
+from app.main_routes import routes
+from app.database.db import AsyncSessionLocal
+from app.database.models.budget_model import Budget, BudgetAlert
+from app.database.models.category_rollup_model import CategoryRollup
+from app.database.methods.get_user_id import get_user_id
+from app.utils.transactions.money import DEFAULT_CURRENCY, parse_minor_units, to_major_units
+from app.utils.transactions.timeseries import parse_month
+from app.utils.security.jwt_utils import require_jwt
+
+
+def budget_status(budget, spent_minor, alerts) -> dict:
+    return {
+        "id": str(budget.id),
+        "category": budget.category,
+        "currency": budget.currency,
+        "limit": to_major_units(budget.limit_minor, budget.currency),
+        "spent": to_major_units(spent_minor, budget.currency),
+        "remaining": to_major_units(budget.limit_minor - spent_minor, budget.currency),
+        "percent_used": round(spent_minor / budget.limit_minor * 100, 1) if budget.limit_minor else None,
+        "alerts": [{"threshold": alert.threshold, "raised_at": alert.created_at.isoformat()} for alert in alerts]
+    }
+
+
+@routes.route("/budgets", methods=["GET"])
+@require_jwt
+async def list_budgets():
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    try:
+        month = parse_month(request.args.get("month")) or datetime.now(timezone.utc).date().replace(day=1)
+    except ValueError:
+        return jsonify({"error": "month must be YYYY-MM"}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    # Spending comes from the month's rollups, never from the transactions
+    async with AsyncSessionLocal() as db:
+        budgets = (await db.execute(
+            select(Budget).where(Budget.user_id == user_id).order_by(Budget.category)
+        )).scalars().all()
+        rollups = (await db.execute(
+            select(CategoryRollup).where(CategoryRollup.user_id == user_id, CategoryRollup.month == month)
+        )).scalars().all()
+        alerts = (await db.execute(
+            select(BudgetAlert).where(BudgetAlert.user_id == user_id, BudgetAlert.month == month)
+            .order_by(BudgetAlert.threshold)
+        )).scalars().all()
+
+    spent = {(rollup.category, rollup.currency): rollup.spent_minor for rollup in rollups}
+    alerts_by_budget = {}
+    for alert in alerts:
+        alerts_by_budget.setdefault(alert.budget_id, []).append(alert)
+
+    return jsonify({
+        "month": month.strftime("%Y-%m"),
+        "budgets": [
+            budget_status(budget, spent.get((budget.category, budget.currency), 0), alerts_by_budget.get(budget.id, []))
+            for budget in budgets
+        ]
+    }), 200
+
+
+@routes.route("/budgets", methods=["POST"])
+@require_jwt
+async def set_budget():
+    """Create a category budget, or change its limit when one already exists"""
+    data = await request.get_json() or {}
+    email = data.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    category = (data.get("category") or "").strip()
+    if not category:
+        return jsonify({"error": "category is required"}), 400
+
+    currency = (data.get("currency") or DEFAULT_CURRENCY).upper()
+    limit = data.get("limit")
+    limit_minor = parse_minor_units(str(limit), currency) if isinstance(limit, (int, float, str)) and not isinstance(limit, bool) else None
+    if not limit_minor or limit_minor <= 0:
+        return jsonify({"error": "limit must be a positive amount"}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        async with AsyncSessionLocal() as db:
+            budget = (await db.execute(
+                select(Budget).where(Budget.user_id == user_id, Budget.category == category, Budget.currency == currency)
+            )).scalar_one_or_none()
+            created = budget is None
+            if created:
+                budget = Budget(user_id=user_id, category=category, currency=currency, limit_minor=limit_minor)
+                db.add(budget)
+            else:
+                budget.limit_minor = limit_minor
+            await db.commit()
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    print(f"💰 {'Created' if created else 'Updated'} {category} budget for user {user_id}")
+    return jsonify({"message": "Budget saved", "budget": budget_status(budget, 0, [])}), 201 if created else 200
+
+
+@routes.route("/budgets/<budget_id>", methods=["DELETE"])
+@require_jwt
+async def delete_budget(budget_id):
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    try:
+        parsed_id = uuid.UUID(budget_id)
+    except ValueError:
+        return jsonify({"error": "Budget not found"}), 404
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        async with AsyncSessionLocal() as db:
+            budget = (await db.execute(
+                select(Budget).where(Budget.id == parsed_id, Budget.user_id == user_id)
+            )).scalar_one_or_none()
+            if not budget:
+                return jsonify({"error": "Budget not found"}), 404
+            alerts = (await db.execute(select(BudgetAlert).where(BudgetAlert.budget_id == parsed_id))).scalars().all()
+            for alert in alerts:
+                await db.delete(alert)
+            await db.delete(budget)
+            await db.commit()
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    return jsonify({"message": "Budget deleted", "budget_id": budget_id}), 200
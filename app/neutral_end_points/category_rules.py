@@ -0,0 +1,170 @@
+import uuid
+from datetime import datetime, timezone
+from quart import jsonify, request
+from sqlalchemy import select
+from app.main_routes import routes
+from app.database.db import AsyncSessionLocal
+from app.database.models.category_rule_model import MATCH_TYPES, CategoryRule
+from app.database.methods.get_user_id import get_user_id
+from app.utils.security.jwt_utils import require_jwt
+
+MAX_PATTERN_LENGTH = 100
+MAX_CATEGORY_LENGTH = 50
+
+
+def _validate_rule(data, partial=False):
+    """Return (fields, error) for a rule payload; `partial` allows missing fields on update"""
+    fields = {}
+
+    if "pattern" in data or not partial:
+        pattern = (data.get("pattern") or "").strip()
+        if not pattern or len(pattern) > MAX_PATTERN_LENGTH:
+            return None, f"pattern is required (max {MAX_PATTERN_LENGTH} characters)"
+        fields["pattern"] = pattern
+
+    if "category" in data or not partial:
+        category = (data.get("category") or "").strip()
+        if not category or len(category) > MAX_CATEGORY_LENGTH:
+            return None, f"category is required (max {MAX_CATEGORY_LENGTH} characters)"
+        fields["category"] = category
+
+    if "match_type" in data or not partial:
+        match_type = data.get("match_type") or "keyword"
+        if match_type not in MATCH_TYPES:
+            return None, f"match_type must be one of {', '.join(MATCH_TYPES)}"
+        fields["match_type"] = match_type
+
+    if "priority" in data or not partial:
+        priority = data.get("priority", 0)
+        if isinstance(priority, bool) or not isinstance(priority, int):
+            return None, "priority must be an integer"
+        fields["priority"] = priority
+
+    return fields, None
+
+
+def _parse_rule_id(rule_id):
+    try:
+        return uuid.UUID(rule_id)
+    except ValueError:
+        return None
+
+
+async def _find_user_rule(db, user_id, rule_id):
+    result = await db.execute(
+        select(CategoryRule).where(CategoryRule.id == rule_id, CategoryRule.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+@routes.route("/category-rules", methods=["GET"])
+@require_jwt
+async def list_category_rules():
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CategoryRule)
+            .where(CategoryRule.user_id == user_id)
+            .order_by(CategoryRule.priority.desc(), CategoryRule.created_at)
+        )
+        rules = result.scalars().all()
+
+    return jsonify({"rules": [rule.to_dict() for rule in rules]}), 200
+
+
+@routes.route("/category-rules", methods=["POST"])
+@require_jwt
+async def create_category_rule():
+    data = await request.get_json() or {}
+    email = data.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    fields, error = _validate_rule(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        async with AsyncSessionLocal() as db:
+            rule = CategoryRule(user_id=user_id, **fields)
+            db.add(rule)
+            await db.commit()
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    print(f"🏷️ Added category rule '{rule.pattern}' → {rule.category} for user {user_id}")
+    return jsonify({"message": "Rule created", "rule": rule.to_dict()}), 201
+
+
+@routes.route("/category-rules/<rule_id>", methods=["PUT"])
+@require_jwt
+async def update_category_rule(rule_id):
+    data = await request.get_json() or {}
+    email = data.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    parsed_id = _parse_rule_id(rule_id)
+    if not parsed_id:
+        return jsonify({"error": "Rule not found"}), 404
+
+    fields, error = _validate_rule(data, partial=True)
+    if error:
+        return jsonify({"error": error}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        async with AsyncSessionLocal() as db:
+            rule = await _find_user_rule(db, user_id, parsed_id)
+            if not rule:
+                return jsonify({"error": "Rule not found"}), 404
+            for name, value in fields.items():
+                setattr(rule, name, value)
+            rule.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    return jsonify({"message": "Rule updated", "rule": rule.to_dict()}), 200
+
+
+@routes.route("/category-rules/<rule_id>", methods=["DELETE"])
+@require_jwt
+async def delete_category_rule(rule_id):
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    parsed_id = _parse_rule_id(rule_id)
+    if not parsed_id:
+        return jsonify({"error": "Rule not found"}), 404
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        async with AsyncSessionLocal() as db:
+            rule = await _find_user_rule(db, user_id, parsed_id)
+            if not rule:
+                return jsonify({"error": "Rule not found"}), 404
+            await db.delete(rule)
+            await db.commit()
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    return jsonify({"message": "Rule deleted", "rule_id": rule_id}), 200
@@ -0,0 +1,55 @@
+from datetime import date
+from quart import Response, jsonify, request
+from app.main_routes import routes
+from app.database.methods.get_user_id import get_user_id
+from app.database.methods.stream_transactions import stream_transactions
+from app.utils.transactions.export_transactions import EXPORT_FORMATS, encode_export
+from app.utils.security.jwt_utils import require_jwt
+
+
+def _parse_date(value):
+    return date.fromisoformat(value) if value else None
+
+
+@routes.route("/transactions/export", methods=["GET"])
+@require_jwt
+async def export_transactions():
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+
+    compression = request.args.get("compression")
+    if compression not in (None, "gzip"):
+        return jsonify({"error": "compression must be gzip"}), 400
+
+    try:
+        date_from = _parse_date(request.args.get("date_from"))
+        date_to = _parse_date(request.args.get("date_to"))
+    except ValueError:
+        return jsonify({"error": "date_from and date_to must be YYYY-MM-DD dates"}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    print(f"📤 Exporting transactions for user {user_id} as {export_format}{' (gzip)' if compression else ''}")
+
+    filename = f"transactions.{export_format}"
+    mimetype = EXPORT_FORMATS[export_format]
+    if compression:
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    body = encode_export(
+        stream_transactions(user_id, date_from=date_from, date_to=date_to),
+        export_format,
+        compress=bool(compression)
+    )
+    response = Response(body, mimetype=mimetype)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.timeout = None  # Long histories may take longer than the default response timeout
+    return response
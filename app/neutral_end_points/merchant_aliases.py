@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime, timezone
+from quart import jsonify, request
+from sqlalchemy import select
+from app.main_routes import routes
+from app.database.db import AsyncSessionLocal
+from app.database.models.merchant_alias_model import ALIAS_SOURCES, MerchantAlias
+from app.database.methods.load_merchant_aliases import load_merchant_aliases
+from app.jobs.merchant_alias_listener import notify_alias_change
+from app.utils.transactions.category_cache import cache_key
+from app.utils.transactions.merchant_aliases import alias_key, alias_subject, merchant_aliases
+from app.utils.transactions.transaction_query import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.security.jwt_utils import require_admin
+
+MAX_NAME_LENGTH = 100
+
+
+@routes.route("/admin/merchant-aliases", methods=["GET"])
+@require_admin
+async def list_merchant_aliases():
+    source = request.args.get("source")
+    if source is not None and source not in ALIAS_SOURCES:
+        return jsonify({"error": f"source must be one of {', '.join(ALIAS_SOURCES)}"}), 400
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+        offset = int(request.args.get("offset", 0))
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE or offset < 0:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}, offset at least 0"}), 400
+
+    statement = select(MerchantAlias).order_by(MerchantAlias.updated_at.desc(), MerchantAlias.id)
+    if source:
+        statement = statement.where(MerchantAlias.source == source)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(statement.offset(offset).limit(limit))
+        aliases = result.scalars().all()
+
+    return jsonify({"aliases": [alias.to_dict() for alias in aliases], "loaded": len(merchant_aliases)}), 200
+
+
+@routes.route("/admin/merchant-aliases", methods=["PUT"])
+@require_admin
+async def set_merchant_alias():
+    """Correct (or create) the merchant and category for a raw counterparty, for every user"""
+    data = await request.get_json() or {}
+    merchant = (data.get("merchant") or "").strip()
+    category = (data.get("category") or "").strip()
+    if not merchant or not category:
+        return jsonify({"error": "merchant and category are required"}), 400
+    if len(merchant) > MAX_NAME_LENGTH or len(category) > MAX_NAME_LENGTH:
+        return jsonify({"error": f"merchant and category must be at most {MAX_NAME_LENGTH} characters"}), 400
+
+    subject = alias_subject(cache_key(data.get("company"), data.get("description")))
+    if not subject:
+        return jsonify({"error": "company or description is required"}), 400
+    digest = alias_key(subject)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            alias = (await db.execute(
+                select(MerchantAlias).where(MerchantAlias.alias_key == digest)
+            )).scalar_one_or_none()
+            created = alias is None
+            if created:
+                alias = MerchantAlias(alias_key=digest, counterparty=subject)
+                db.add(alias)
+            alias.merchant = merchant
+            alias.category = category
+            alias.source = "admin"
+            alias.dictionary_version = None
+            alias.updated_at = datetime.now(timezone.utc)
+            await notify_alias_change(db, digest)
+            await db.commit()
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    merchant_aliases.set(digest, merchant, category)
+    print(f"📚 Merchant alias {'created' if created else 'corrected'}: {merchant} → {category}")
+    return jsonify({"message": "Alias saved", "alias": alias.to_dict()}), 201 if created else 200
+
+
+@routes.route("/admin/merchant-aliases/<alias_id>", methods=["DELETE"])
+@require_admin
+async def delete_merchant_alias(alias_id):
+    try:
+        parsed_id = uuid.UUID(alias_id)
+    except ValueError:
+        return jsonify({"error": "Alias not found"}), 404
+
+    try:
+        async with AsyncSessionLocal() as db:
+            alias = (await db.execute(
+                select(MerchantAlias).where(MerchantAlias.id == parsed_id)
+            )).scalar_one_or_none()
+            if not alias:
+                return jsonify({"error": "Alias not found"}), 404
+            digest = alias.alias_key
+            await db.delete(alias)
+            await notify_alias_change(db, digest)
+            await db.commit()
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    merchant_aliases.discard(digest)
+    return jsonify({"message": "Alias deleted", "alias_id": alias_id}), 200
+
+
+@routes.route("/admin/merchant-aliases/reload", methods=["POST"])
+@require_admin
+async def reload_merchant_aliases():
+    """Reload the in-memory alias table from the database"""
+    loaded = await load_merchant_aliases()
+    return jsonify({"message": "Aliases reloaded", "loaded": loaded}), 200
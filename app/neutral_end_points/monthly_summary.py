@@ -0,0 +1,59 @@
+from quart import jsonify, request
+from app.main_routes import routes
+from app.database.methods.get_category_rollups import get_category_rollups
+from app.database.methods.get_user_id import get_user_id
+from app.utils.transactions.money import to_major_units
+from app.utils.transactions.timeseries import parse_month
+from app.utils.security.jwt_utils import require_jwt
+
+
+def summarize_rollups(rollups) -> list:
+    """One entry per (month, currency) with totals and per-category sums, built from rollup rows"""
+    months = {}
+    for rollup in rollups:
+        key = (rollup.month, rollup.currency)
+        entry = months.get(key)
+        if entry is None:
+            entry = months[key] = {"month": rollup.month.strftime("%Y-%m"), "currency": rollup.currency,
+                                   "income_minor": 0, "spent_minor": 0, "count": 0, "categories": {}}
+        entry["income_minor"] += rollup.income_minor
+        entry["spent_minor"] += rollup.spent_minor
+        entry["count"] += rollup.count
+        entry["categories"][rollup.category] = {
+            "income": to_major_units(rollup.income_minor, rollup.currency),
+            "spent": to_major_units(rollup.spent_minor, rollup.currency),
+            "count": rollup.count
+        }
+
+    summaries = []
+    for entry in months.values():
+        income = entry.pop("income_minor")
+        spent = entry.pop("spent_minor")
+        currency = entry["currency"]
+        entry["total_income"] = to_major_units(income, currency)
+        entry["total_spent"] = to_major_units(spent, currency)
+        entry["net_amount"] = to_major_units(income - spent, currency)
+        summaries.append(entry)
+    return summaries
+
+
+@routes.route("/transactions/summary/monthly", methods=["GET"])
+@require_jwt
+async def monthly_summary():
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    try:
+        month_from = parse_month(request.args.get("month_from"))
+        month_to = parse_month(request.args.get("month_to"))
+    except ValueError:
+        return jsonify({"error": "month_from and month_to must be YYYY-MM"}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    # Reads the precomputed rollups only - a few rows per month, never the transactions
+    rollups = await get_category_rollups(user_id, month_from, month_to)
+    return jsonify({"months": summarize_rollups(rollups)}), 200
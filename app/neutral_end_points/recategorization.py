@@ -0,0 +1,19 @@
+from quart import jsonify
+from app.main_routes import routes
+from app.jobs.recategorize_transactions import recategorization_job
+from app.utils.security.jwt_utils import require_admin
+
+
+@routes.route("/admin/recategorization", methods=["GET"])
+@require_admin
+async def recategorization_progress():
+    return jsonify(recategorization_job.progress()), 200
+
+
+@routes.route("/admin/recategorization", methods=["POST"])
+@require_admin
+async def start_recategorization():
+    """Start recategorizing stored transactions whose categorizer version is outdated"""
+    if not recategorization_job.start():
+        return jsonify({"error": "Recategorization is already running", **recategorization_job.progress()}), 409
+    return jsonify({"message": "Recategorization started"}), 202
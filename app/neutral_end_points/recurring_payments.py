@@ -0,0 +1,29 @@
+from quart import jsonify, request
+from sqlalchemy import select
+from app.main_routes import routes
+from app.database.db import AsyncSessionLocal
+from app.database.models.recurring_payment_model import RecurringPayment
+from app.database.methods.get_user_id import get_user_id
+from app.utils.security.jwt_utils import require_jwt
+
+
+@routes.route("/recurring-payments", methods=["GET"])
+@require_jwt
+async def list_recurring_payments():
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(RecurringPayment)
+            .where(RecurringPayment.user_id == user_id)
+            .order_by(RecurringPayment.next_date)
+        )
+        payments = result.scalars().all()
+
+    return jsonify({"recurring_payments": [payment.to_dict() for payment in payments]}), 200
@@ -0,0 +1,51 @@
+import time
+from quart import jsonify, request
+from app.main_routes import routes
+from app.database.methods.get_user_id import get_user_id
+from app.utils.transactions.search_index import get_search_index
+from app.utils.transactions.transaction_query import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.security.jwt_utils import require_jwt
+
+MAX_QUERY_LENGTH = 200
+
+
+@routes.route("/transactions/search", methods=["GET"])
+@require_jwt
+async def search_transactions():
+    """Stored transactions whose merchant or description contains every word of q, newest first"""
+    email = request.args.get("email")
+    if not email:
+        return jsonify({"error": "Missing email"}), 400
+
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "Missing q"}), 400
+    if len(query) > MAX_QUERY_LENGTH:
+        return jsonify({"error": f"q must be at most {MAX_QUERY_LENGTH} characters"}), 400
+
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        index = await get_search_index(user_id)
+    except Exception as db_error:
+        return jsonify({"error": f"Database error: {str(db_error)}"}), 500
+
+    start_time = time.perf_counter()
+    total, documents = index.search(query, limit)
+    search_time = time.perf_counter() - start_time
+
+    return jsonify({
+        "query": query,
+        "total": total,
+        "transactions": [index.result(document) for document in documents],
+        "search_time_ms": round(search_time * 1000, 3)
+    }), 200
@@ -1,13 +1,117 @@
 import asyncio
-import json
 from quart import jsonify, request
 from app.main_routes import routes
-from app.database.methods.get_requisition_db import get_requisition
-from app.nordingen.methods.get_all_transactions import get_all_transactions
+from app.config import RAW_PAYLOAD_ARCHIVE
+from app.database.methods.get_requisition_institutions import get_requisition_institutions
+from app.database.methods.get_stored_transactions import get_stored_transactions
+from app.database.methods.get_transaction_page import get_transaction_page, transaction_filters
+from app.database.methods.get_transaction_totals import get_transaction_totals
+from app.database.methods.get_user_id import get_user_id
+from app.database.methods.refresh_recurring_payments import refresh_recurring_payments
+from app.database.methods.save_merchant_aliases import save_merchant_aliases
+from app.database.methods.save_raw_payloads import archive_raw_payloads
+from app.database.methods.save_transactions import store_transactions
+from app.nordingen.methods.fetch_transactions_with_deadline import (
+    fetch_transactions_with_deadline, STATUS_TIMEOUT, STATUS_ERROR
+)
+from app.utils.transactions.dedupe_transactions import dedupe_transactions
 from app.utils.transactions.extract_essentials_transactions import extract_essentials_transactions
+from app.utils.transactions.merchant_registry import categorizer_registry, country_from_institution_id
+from app.utils.transactions.search_index import index_new_transactions
+from app.utils.transactions.summarize_transactions import (
+    TransactionColumns, sort_by_absolute_amount, summarize_totals, summarize_transactions
+)
+from app.utils.transactions.transaction_query import ResponseView, TransactionQuery, TransactionQueryError
+from app.utils.transactions.user_category_cache import persist_user_category_cache, warm_user_category_cache
 from app.utils.security.jwt_utils import require_jwt
 
 
+def add_transactions_view(response_data, essentials_data, query, view):
+    """Add the listed transactions, page and summary parts `view` asks for to `response_data`"""
+    include_transactions = view.category_transactions(paged=query is not None)
+    needs_summary = any(view.wants(part) for part in ("summary", "categories", "top_categories"))
+
+    if query is None:
+        if include_transactions:
+            # Sort by amount (highest first), keeping the parsed columns for the summary
+            essentials_data, columns = sort_by_absolute_amount(essentials_data)
+        else:
+            # Nothing is listed, so the order does not matter
+            columns = TransactionColumns(essentials_data)
+        matching, matching_columns = essentials_data, columns
+    else:
+        # Filter on the columns, then order and serialize only one page
+        columns = TransactionColumns(essentials_data)
+        rows = query.matching_rows(essentials_data, columns)
+        matching = [essentials_data[row] for row in rows.tolist()]
+        if include_transactions:
+            matching, matching_columns = sort_by_absolute_amount(matching)
+        else:
+            matching_columns = columns.take(rows)
+
+        response_data.update({
+            "total_count": len(rows),
+            "limit": query.limit,
+            "sort": query.sort
+        })
+        if view.wants("transactions"):
+            page_rows, next_cursor = query.page(essentials_data, columns, rows)
+            response_data["transactions"] = [
+                essentials_data[row].to_dict(view.transaction_fields) for row in page_rows.tolist()
+            ]
+            response_data["next_cursor"] = next_cursor
+
+    if needs_summary:
+        # Generate category summary (vectorized over the columns)
+        summary = summarize_transactions(matching, matching_columns, include_transactions=include_transactions)
+        response_data.update({
+            # 🆕 Your new enhanced data
+            "summary": summary["summary"],
+
+            "categories": summary["categories"],
+
+            "top_categories": summary["top_categories"]
+        })
+
+
+async def stored_page(email, query, view):
+    """Serve a cursor follow-up page from the stored transactions instead of syncing again
+
+    The first page's sync stored every booked transaction, so later pages
+    are read back from bank_transactions (pending rows are not stored).
+    Filters, order and page size run in SQL and the summary comes from SQL
+    sums, so only the page's rows are decrypted. A merchant filter or the
+    per-category lists of view=full need every matching counterparty, so
+    those read all rows that pass the SQL filters.
+    """
+    user_id = await get_user_id(email)
+    if not user_id:
+        return jsonify({"error": "User not found"}), 404
+    try:
+        if query.merchant or view.category_transactions(paged=True):
+            essentials_data = await get_stored_transactions(user_id, where=transaction_filters(query))
+            response_data = {"total_count": len(essentials_data)}
+            add_transactions_view(response_data, essentials_data, query, view)
+            return jsonify(view.apply(response_data)), 200
+
+        totals = await get_transaction_totals(user_id, query)
+        response_data = {
+            "total_count": sum(count for _, _, _, _, count in totals),
+            "limit": query.limit,
+            "sort": query.sort
+        }
+        if view.wants("transactions"):
+            page, next_cursor = await get_transaction_page(user_id, query)
+            response_data["transactions"] = [record.to_dict(view.transaction_fields) for record in page]
+            response_data["next_cursor"] = next_cursor
+    except Exception as e:
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
+
+    if any(view.wants(part) for part in ("summary", "categories", "top_categories")):
+        response_data.update(summarize_totals(totals))
+    return jsonify(view.apply(response_data)), 200
+
+
 @routes.route("/nordingen-get-transactions", methods=["GET"])
 @require_jwt
 async def get_transactions():
@@ -15,113 +119,126 @@ async def get_transactions():
     if not email:
         return jsonify({"error": "Missing email"}), 400
 
-    requisition_ids = await get_requisition(email)
+    # Filters / sort / keyset page; without any of them the full legacy response is returned.
+    # view= and fields= decide which parts of the response are built at all.
+    try:
+        query = TransactionQuery.from_args(request.args) if TransactionQuery.requested(request.args) else None
+        view = ResponseView.from_args(request.args)
+    except TransactionQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    # The flat transaction list is only built one page at a time
+    if query is None and view.fields is not None and "transactions" in view.fields:
+        return jsonify({"error": "transactions fields need paging (add limit=, a filter or a cursor)"}), 400
+    
+    # Later pages of a paged sync come from storage; only the first page calls the banks
+    if query is not None and query.cursor is not None:
+        return await stored_page(email, query, view)
+
+    institutions = await get_requisition_institutions(email)
+    requisition_ids = list(institutions)
     if not requisition_ids:
         return jsonify({"error": "No requisitions found"}), 404
     
     print(f"🔄 Fetching transactions for {len(requisition_ids)} requisitions in parallel...")
     
-    async def fetch_transactions_for_requisition(requisition_id):
-        try:
-            print(f"📡 Starting fetch for requisition: {requisition_id}")
-            transactions = await get_all_transactions(requisition_id)
-            print(f"✅ Completed fetch for requisition: {requisition_id} - Got {len(transactions) if transactions else 0} transactions")
-            return transactions or []
-        except Exception as e:
-            print(f"❌ Error fetching transactions for requisition {requisition_id}: {e}")
-            return []
-    
-    # Execute all requests concurrently
+    # Execute all requests concurrently within one overall time budget
     start_time = asyncio.get_event_loop().time()
     
-    transaction_results = await asyncio.gather(
-        *[fetch_transactions_for_requisition(req_id) for req_id in requisition_ids],
-        return_exceptions=True
-    )
+    bank_results = await fetch_transactions_with_deadline(requisition_ids)
     
     end_time = asyncio.get_event_loop().time()
     processing_time = round(end_time - start_time, 2)
     
     # Combine all results into raw JSON
     all_transactions_raw = []
+    raw_by_country = {}
+    raw_payloads = []
     failed_requisitions = []
+    banks_status = []
     
-    for i, result in enumerate(transaction_results):
-        if isinstance(result, Exception):
-            failed_requisitions.append(requisition_ids[i])
-            print(f"❌ Failed to process requisition {requisition_ids[i]}: {result}")
-        elif result:
-            all_transactions_raw.extend(result)
+    for result in bank_results:
+        if result["status"] in (STATUS_TIMEOUT, STATUS_ERROR):
+            failed_requisitions.append(result["requisition_id"])
+            print(f"❌ Failed to process requisition {result['requisition_id']}: {result['status']}")
+        all_transactions_raw.extend(result["transactions"])
+        # Each bank is categorized with its own country's merchant dictionary
+        country = categorizer_registry.resolve(country_from_institution_id(institutions.get(result["requisition_id"])))
+        raw_by_country.setdefault(country, []).extend(result["transactions"])
+        for account_id, raw in result.get("payloads", {}).items():
+            raw_payloads.append((result["requisition_id"], account_id, country, raw))
+        banks_status.append({
+            "requisition_id": result["requisition_id"],
+            "status": result["status"],
+            "country": country,
+            "transaction_count": len(result["transactions"])
+        })
     
     # 🚀 Use your new extraction function to get clean, categorized data
     if all_transactions_raw:
-        print(f"🏷️ Processing {len(all_transactions_raw)} transactions with Romanian categorization...")
+        print(f"🏷️ Processing {len(all_transactions_raw)} transactions with per-country categorization...")
         
-        # Convert raw transactions to JSON string for your function
-        raw_transactions_json = json.dumps(all_transactions_raw)
+        # Start from the user's saved categorization results when snapshots are enabled
+        user_id = await get_user_id(email)
+        await warm_user_category_cache(user_id)
         
-        # Extract essentials with Romanian categories
-        essentials_json = await extract_essentials_transactions(raw_transactions_json)
-        essentials_data = json.loads(essentials_json)
+        # Keep the raw responses so parsing or categorization fixes can be replayed without Nordigen
+        # (in the background; the response does not wait for it)
+        if RAW_PAYLOAD_ARCHIVE:
+            archive_raw_payloads(user_id, raw_payloads)
         
-        # Sort by amount (highest first) or by date if you prefer
-        essentials_data.sort(key=lambda x: abs(float(x.get('amount', 0)) if x.get('amount') else 0), reverse=True)
+        # Extract essentials with each bank's country categories and the user's own rules
+        # (objects in, objects out; the response is serialized once by jsonify)
+        essentials_data = []
+        for country, country_transactions in raw_by_country.items():
+            country_essentials = await extract_essentials_transactions(
+                country_transactions, user_id=user_id, country=country
+            )
+            essentials_data.extend(country_essentials)
+            
+            # Counterparties matched to a merchant for the first time become shared aliases
+            country_categorizer = categorizer_registry.get(country)
+            await save_merchant_aliases(
+                await country_categorizer.new_aliases_async(country_essentials), country_categorizer.version
+            )
         
-        print(f"✅ Processed and categorized {len(essentials_data)} transactions")
+        # Drop banks linked twice and pending rows that have since booked, before anything is summed
+        essentials_data, duplicates = dedupe_transactions(essentials_data)
+        duplicates_by_reason = {}
+        for _, reason in duplicates:
+            duplicates_by_reason[reason] = duplicates_by_reason.get(reason, 0) + 1
+        if duplicates:
+            print(f"🧹 Removed {len(duplicates)} duplicate transactions: {duplicates_by_reason}")
         
-        # Generate category summary
-        category_summary = {}
-        total_spent = 0
-        total_income = 0
+        await persist_user_category_cache(user_id, essentials_data)
         
-        for transaction in essentials_data:
-            category = transaction.get('category', 'Unknown')
-            amount = float(transaction.get('amount', 0)) if transaction.get('amount') else 0
-            
-            # Update category summary
-            if category not in category_summary:
-                category_summary[category] = {
-                    "count": 0,
-                    "total_amount": 0,
-                    "transactions": []
-                }
-            
-            category_summary[category]["count"] += 1
-            category_summary[category]["total_amount"] += abs(amount)
-            category_summary[category]["transactions"].append({
-                "company": transaction.get("company"),
-                "amount": transaction.get("amount")
-            })
+        # Keep the history so it can be exported without going back to the banks
+        storage_error = None
+        try:
+            new_rows = await store_transactions(user_id, essentials_data)
+        except Exception as e:
+            print(f"❌ Failed to store transactions for user {user_id}: {e}")
+            storage_error = str(e)
+        else:
+            # Re-check subscriptions only for merchants that got new payments
+            await refresh_recurring_payments(user_id, new_rows)
             
-            # Track income vs expenses
-            if amount > 0:
-                total_income += amount
-            else:
-                total_spent += abs(amount)
+            # A search index that is already in memory picks up the new rows instead of being rebuilt
+            index_new_transactions(user_id, new_rows)
+        
+        print(f"✅ Processed and categorized {len(essentials_data)} transactions")
         
         response_data = {
             "total_count": len(essentials_data),
             "requisitions_processed": len(requisition_ids),
             "failed_requisitions": len(failed_requisitions),
             "processing_time_seconds": processing_time,
-            
-            # 🆕 Your new enhanced data
-            "summary": {
-                "total_income": round(total_income, 2),
-                "total_spent": round(total_spent, 2),
-                "net_amount": round(total_income - total_spent, 2),
-                "categories_found": len(category_summary)
-            },
-            
-            "categories": category_summary,
-            
-            "top_categories": sorted(
-                [{"category": cat, "amount": data["total_amount"], "count": data["count"]} 
-                 for cat, data in category_summary.items()],
-                key=lambda x: x["amount"], 
-                reverse=True
-            )[:5]
+            "banks": banks_status,
+            "duplicates": {"removed": len(duplicates), "by_reason": duplicates_by_reason}
         }
+        if storage_error:
+            response_data["storage_error"] = f"Transactions were not saved: {storage_error}"
+        
+        add_transactions_view(response_data, essentials_data, query, view)
         
     else:
         # No transactions found
@@ -132,6 +249,7 @@ async def get_transactions():
             "requisitions_processed": len(requisition_ids),
             "failed_requisitions": len(failed_requisitions),
             "processing_time_seconds": processing_time,
+            "banks": banks_status,
             "summary": {
                 "total_income": 0,
                 "total_spent": 0,
@@ -142,6 +260,8 @@ async def get_transactions():
             "top_categories": []
         }
     
+    response_data = view.apply(response_data)
+    
     if failed_requisitions:
         response_data["warning"] = f"Failed to fetch transactions from {len(failed_requisitions)} bank(s)"
     
@@ -0,0 +1,63 @@
+import asyncio
+import httpx
+from app.config import TRANSACTIONS_TIME_BUDGET_SECONDS
+from app.nordingen.methods.get_all_transactions import get_all_transactions
+from app.nordingen.methods.transactions_cache import get_cached_transactions, remember_transactions
+
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+STATUS_CACHED = "cached"
+
+
+async def fetch_transactions_with_deadline(requisition_ids, budget_seconds=TRANSACTIONS_TIME_BUDGET_SECONDS):
+    """Fetch every requisition in parallel within one overall time budget.
+
+    Fetches still running when the budget runs out are cancelled. Returns one
+    entry per requisition, in input order, with its status and transactions;
+    timed-out banks fall back to their last cached transactions when available.
+    Freshly fetched entries also carry the raw response body of each account
+    ("payloads", by account id) for the payload archive.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget_seconds
+
+    payloads = {requisition_id: {} for requisition_id in requisition_ids}
+    tasks = {
+        asyncio.create_task(
+            get_all_transactions(requisition_id, deadline=deadline, payloads=payloads[requisition_id])
+        ): requisition_id
+        for requisition_id in requisition_ids
+    }
+    if not tasks:
+        return []
+
+    done, pending = await asyncio.wait(tasks, timeout=budget_seconds)
+
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        print(f"⏰ Time budget of {budget_seconds}s exhausted, cancelled {len(pending)} bank fetch(es)")
+
+    results = []
+    for task, requisition_id in tasks.items():
+        if task in pending or isinstance(task.exception(), (httpx.TimeoutException, asyncio.TimeoutError)):
+            cached = get_cached_transactions(requisition_id)
+            if cached is not None:
+                results.append({"requisition_id": requisition_id, "status": STATUS_CACHED, "transactions": cached})
+            else:
+                results.append({"requisition_id": requisition_id, "status": STATUS_TIMEOUT, "transactions": []})
+        elif task.exception() is not None or task.result() is None:
+            if task.exception() is not None:
+                print(f"❌ Error fetching transactions for requisition {requisition_id}: {task.exception()}")
+            results.append({"requisition_id": requisition_id, "status": STATUS_ERROR, "transactions": []})
+        else:
+            transactions = task.result()
+            remember_transactions(requisition_id, transactions)
+            results.append({
+                "requisition_id": requisition_id, "status": STATUS_OK, "transactions": transactions,
+                "payloads": payloads[requisition_id]
+            })
+
+    return results
@@ -3,67 +3,111 @@ import httpx
 from app.database.methods.get_token_from_db import get_token_from_db
 from app.config import NORDIGEN_API_URL
 
-async def get_all_transactions(requisition_id):
-    """Optimized version with parallel account processing"""
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+
+def _remaining_timeout(deadline):
+    """Seconds left until the loop-time deadline, capped at the default httpx timeout"""
+    if deadline is None:
+        return DEFAULT_TIMEOUT_SECONDS
+    remaining = deadline - asyncio.get_running_loop().time()
+    if remaining <= 0:
+        raise asyncio.TimeoutError("Transaction time budget exhausted")
+    return min(remaining, DEFAULT_TIMEOUT_SECONDS)
+
+
+def account_transactions(data, account_id=None):
+    """Flatten one account's transactions response into booked then pending rows"""
+    transactions = []
+    # Tag each row so the dedupe stage can prefer booked over pending copies
+    # and tell an account linked twice from repeated purchases on one account
+    for status in ("booked", "pending"):
+        for transaction in data.get("transactions", {}).get(status, []):
+            transaction["bookingStatus"] = status
+            transaction["sourceAccount"] = account_id
+            transactions.append(transaction)
+    return transactions
+
+
+async def get_all_transactions(requisition_id, deadline=None, payloads=None):
+    """Optimized version with parallel account processing
+
+    `deadline` is an absolute event-loop time (`loop.time()`); every Nordigen
+    call gets only the time that is left of it. Returns None when the
+    requisition could not be fetched, so callers can tell errors from banks
+    that simply have no transactions. When a `payloads` dict is given, each
+    account's raw response body is stored in it by account id.
+    """
     try:
         access_token = await get_token_from_db()
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
+
+        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT_SECONDS) as client:
             # Get requisition details
             requisition_response = await client.get(
                 f"{NORDIGEN_API_URL}/requisitions/{requisition_id}/",
-                headers={"Authorization": f"Bearer {access_token}"}
+                headers={"Authorization": f"Bearer {access_token}"},
+                timeout=_remaining_timeout(deadline)
             )
-            
+
             if requisition_response.status_code != 200:
                 print(f"❌ Failed to get requisition {requisition_id}")
-                return []
-            
+                return None
+
             requisition_data = requisition_response.json()
             account_ids = requisition_data.get("accounts", [])
-            
+
             if not account_ids:
                 print(f"ℹ️ No accounts found for requisition {requisition_id}")
                 return []
-            
+
             print(f"📊 Processing {len(account_ids)} accounts for requisition {requisition_id}")
-            
+
             # ✨ PARALLEL ACCOUNT PROCESSING
             async def fetch_account_transactions(account_id):
                 try:
                     response = await client.get(
                         f"{NORDIGEN_API_URL}/accounts/{account_id}/transactions/",
-                        headers={"Authorization": f"Bearer {access_token}"}
+                        headers={"Authorization": f"Bearer {access_token}"},
+                        timeout=_remaining_timeout(deadline)
                     )
-                    
+
                     if response.status_code == 200:
-                        data = response.json()
-                        transactions = []
-                        transactions.extend(data.get("transactions", {}).get("booked", []))
-                        transactions.extend(data.get("transactions", {}).get("pending", []))
-                        return transactions
+                        if payloads is not None:
+                            payloads[account_id] = response.content
+                        return account_transactions(response.json(), account_id)
                     else:
                         print(f"❌ Failed to get transactions for account {account_id}")
                         return []
+                except (httpx.TimeoutException, asyncio.TimeoutError):
+                    raise
                 except Exception as e:
                     print(f"❌ Error fetching account {account_id}: {e}")
                     return []
-            
+
             # Process all accounts in parallel
             account_results = await asyncio.gather(
                 *[fetch_account_transactions(account_id) for account_id in account_ids],
                 return_exceptions=True
             )
-            
+
             # Combine all transactions
             all_transactions = []
+            timed_out_accounts = 0
             for result in account_results:
-                if not isinstance(result, Exception) and result:
+                if isinstance(result, (httpx.TimeoutException, asyncio.TimeoutError)):
+                    timed_out_accounts += 1
+                elif not isinstance(result, Exception) and result:
                     all_transactions.extend(result)
-            
+
+            if timed_out_accounts and timed_out_accounts == len(account_ids):
+                raise asyncio.TimeoutError(f"All accounts timed out for requisition {requisition_id}")
+
             print(f"✅ Got {len(all_transactions)} total transactions for requisition {requisition_id}")
             return all_transactions
-            
+
+    except (httpx.TimeoutException, asyncio.TimeoutError):
+        print(f"⏰ Timed out fetching transactions for {requisition_id}")
+        raise
     except Exception as e:
         print(f"❌ Error in get_all_transactions for {requisition_id}: {e}")
-        return []
+        return None
@@ -0,0 +1,23 @@
+from collections import OrderedDict
+
+MAX_CACHED_REQUISITIONS = 256
+
+# Last successfully fetched transactions per requisition (most recent last)
+_last_transactions = OrderedDict()
+
+
+def remember_transactions(requisition_id, transactions):
+    """Keep the latest successful fetch so timed-out banks can fall back to it"""
+    _last_transactions[requisition_id] = transactions
+    _last_transactions.move_to_end(requisition_id)
+    while len(_last_transactions) > MAX_CACHED_REQUISITIONS:
+        _last_transactions.popitem(last=False)
+
+
+def get_cached_transactions(requisition_id):
+    """Return the last fetched transactions for a requisition, or None"""
+    return _last_transactions.get(requisition_id)
+
+
+def clear_transactions_cache():
+    _last_transactions.clear()
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 
 from quart import request
+from app.config import ADMIN_EMAILS
 
 class JWTManager:
     def __init__(self, secret_key: Optional[str] = None):
@@ -107,4 +108,25 @@ def require_jwt(f):
         
         return await f(*args, **kwargs)
         
+    return decorated
+
+
+def require_admin(f):
+    """Like require_jwt, but the token's email must also be listed in ADMIN_EMAILS"""
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer "):
+            return {"error": "No token provided"}, 401
+        
+        payload = jwt_manager.verify_token(auth_header.split(" ")[1])
+        if not payload or payload.get("type") != "access_token":
+            return {"error": "Invalid or expired token"}, 401
+        
+        if payload.get("email", "").lower() not in ADMIN_EMAILS:
+            print(f"❌ Admin access denied for {payload.get('email')}")
+            return {"error": "Admin access required"}, 403
+        
+        return await f(*args, **kwargs)
+        
     return decorated
\ No newline at end of file
@@ -0,0 +1,78 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.config import CATEGORIZATION_POOL_VERSIONS, CATEGORIZATION_PROCESS_WORKERS
+
+# Per-worker categorizer, compiled once by the pool initializer
+_worker_categorizer = None
+
+
+def _init_worker(merchants):
+    global _worker_categorizer
+    from app.utils.transactions.categorizer import Categorizer
+    from app.utils.transactions.merchant_aliases import MerchantAliasTable
+    # A forked worker would otherwise inherit the parent's alias table as it was at fork time
+    _worker_categorizer = Categorizer(merchants=merchants, aliases=MerchantAliasTable())
+
+
+def _categorize_shard(rows):
+    return _worker_categorizer.categorize_rows(rows)
+
+
+class CategorizationPool:
+    """Process pools that shard very large categorization batches across cores
+
+    Workers compile one merchant dictionary once, so there is a pool per
+    dictionary version: categorizers for different countries each use their
+    own and never disturb one another. At most `max_versions` pools are kept;
+    the least recently used one is retired, letting work it already has finish.
+    """
+
+    def __init__(self, workers=CATEGORIZATION_PROCESS_WORKERS, max_versions=CATEGORIZATION_POOL_VERSIONS):
+        self.workers = max(1, workers)
+        self.max_versions = max(1, max_versions)
+        self._executors = {}  # version → ProcessPoolExecutor, least recently used first
+
+    def _get_executor(self, merchants, version):
+        executor = self._executors.pop(version, None)
+        if executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(merchants,)
+            )
+            while len(self._executors) >= self.max_versions:
+                retired = self._executors.pop(next(iter(self._executors)))
+                retired.shutdown(wait=False)
+        self._executors[version] = executor
+        return executor
+
+    async def categorize_rows(self, rows, merchants, version) -> list:
+        """Categorize (company, description, amount_minor, currency) rows in worker processes"""
+        executor = self._get_executor(merchants, version)
+        shard_size = -(-len(rows) // self.workers)
+        shards = [rows[start:start + shard_size] for start in range(0, len(rows), shard_size)]
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.gather(
+                *[loop.run_in_executor(executor, _categorize_shard, shard) for shard in shards]
+            )
+        except BrokenProcessPool:
+            if self._executors.get(version) is executor:
+                del self._executors[version]
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        categories = []
+        for shard_categories in results:
+            categories.extend(shard_categories)
+        return categories
+
+    def shutdown(self):
+        executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+categorization_pool = CategorizationPool()
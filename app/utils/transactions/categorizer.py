@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+from concurrent.futures.process import BrokenProcessPool
+from app.config import (
+    CATEGORIZATION_PROCESS_THRESHOLD, CATEGORIZATION_THREAD_THRESHOLD, CATEGORY_CACHE_SIZE,
+    CATEGORY_CLASSIFIER_MIN_CONFIDENCE, CATEGORY_CLASSIFIER_PATH, FUZZY_MATCH_THRESHOLD, MERCHANT_INDEX_DIR
+)
+from app.utils.transactions.categorization_pool import categorization_pool
+from app.utils.transactions.category_cache import (
+    MISSING, CategoryCache, cache_key, merchants_fingerprint
+)
+from app.utils.transactions.fuzzy_merchant_index import WORD_PATTERN, FuzzyMerchantIndex
+from app.utils.transactions.merchant_aliases import alias_key, alias_subject, merchant_aliases
+from app.utils.transactions.merchant_matcher import load_or_compile_matcher
+from app.utils.transactions.money import currency_exponent, parse_minor_units
+from app.utils.transactions.merchants_romania import ROMANIAN_MERCHANT_CATEGORIES
+from app.utils.transactions.ngram_classifier import classifier_text, load_classifier
+
+# Matched as whole words, so "sa" in "salariu" or "ii" in "taxii" do not count
+LEGAL_FORM_WORDS = frozenset(("srl", "sa", "pfa", "ii", "magazin"))
+GROCERY_WORDS = ("alimentar", "market", "shop")
+RESTAURANT_WORDS = ("restaurant", "pizzerie", "crama")
+SHOPPING_WORDS = ("magazin", "boutique", "fashion")
+# Everything categorize_by_amount can return; these labels say nothing about the counterparty
+AMOUNT_CATEGORIES = frozenset(("Salary", "Income", "Housing", "Bills", "Shopping", "Food", "Small Purchase", "Unknown"))
+
+
+class Categorizer:
+    """Synchronous merchant categorization that works on whole batches
+
+    Counterparties with a merchant alias resolve with one lookup. Others are
+    matched exactly first and then, failing that, fuzzily against an n-gram
+    index (`fuzzy_threshold` of 0 disables it). Merchant-stage
+    results are memoized in an LRU keyed by the normalized
+    (company, description) pair. Rows no merchant matched go, as one batch,
+    through the optional n-gram classifier, and whatever is still unlabelled
+    falls back to amount bands, which are cheap and always recomputed because
+    they depend on the amount, not the counterparty.
+    """
+
+    def __init__(self, merchants=None, thread_threshold=CATEGORIZATION_THREAD_THRESHOLD,
+                 cache_size=CATEGORY_CACHE_SIZE, process_threshold=CATEGORIZATION_PROCESS_THRESHOLD,
+                 pool=None, index_dir=MERCHANT_INDEX_DIR, fuzzy_threshold=FUZZY_MATCH_THRESHOLD, aliases=None,
+                 classifier=None, classifier_min_confidence=CATEGORY_CLASSIFIER_MIN_CONFIDENCE):
+        self.merchants = ROMANIAN_MERCHANT_CATEGORIES if merchants is None else merchants
+        self.thread_threshold = thread_threshold
+        self.process_threshold = process_threshold
+        self.pool = categorization_pool if pool is None else pool
+        self.index_dir = index_dir
+        self.fuzzy_threshold = fuzzy_threshold
+        self.aliases = merchant_aliases if aliases is None else aliases
+        self.classifier = category_classifier if classifier is None else classifier
+        self.classifier_min_confidence = classifier_min_confidence
+        self.cache = CategoryCache(cache_size)
+        self._compile()
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the merchant dictionary the matcher was compiled from"""
+        return self.cache.version
+
+    @property
+    def categorization_version(self) -> str:
+        """Fingerprint of everything that decides a category: dictionary, fuzzy threshold and classifier"""
+        classifier = self.classifier.fingerprint if self.classifier is not None else None
+        settings = (self.version, self.fuzzy_threshold, classifier, self.classifier_min_confidence if classifier else None)
+        return hashlib.sha1(repr(settings).encode()).hexdigest()[:12]
+
+    def _compile(self):
+        self.matcher = load_or_compile_matcher(self.merchants, self.index_dir)
+        self.fuzzy = FuzzyMerchantIndex(self.merchants, self.fuzzy_threshold) if self.fuzzy_threshold else None
+        self.cache.invalidate(merchants_fingerprint(self.merchants))
+
+    def refresh(self) -> bool:
+        """Recompile and drop cached results if the merchant dictionary changed"""
+        if merchants_fingerprint(self.merchants) == self.cache.version:
+            return False
+        print("🔁 Merchant dictionary changed, recompiling matcher and clearing category cache")
+        self._compile()
+        return True
+
+    def categorize(self, company: str, description: str, amount, currency=None) -> str:
+        """Categorize a single transaction (amount as a decimal string)"""
+        self.refresh()
+        return self._categorize_rows([(company, description, parse_minor_units(amount, currency), currency)])[0]
+
+    def categorize_batch(self, records) -> list:
+        """Categorize a list of TransactionRecord, returning one category per record"""
+        self.refresh()
+        return self._categorize_rows([
+            (record.company, record.description, record.amount_minor, record.currency) for record in records
+        ])
+
+    def categorize_rows(self, rows) -> list:
+        """Categorize plain (company, description, amount_minor, currency) tuples"""
+        self.refresh()
+        return self._categorize_rows(rows)
+
+    async def categorize_batch_async(self, records) -> list:
+        """Categorize a batch without blocking the event loop
+
+        Small batches run inline, large ones in a worker thread, and very large
+        ones (process_threshold and up) are sharded across worker processes.
+        """
+        if self.process_threshold and len(records) >= self.process_threshold:
+            categories = await self._categorize_in_processes(records)
+        elif len(records) < self.thread_threshold:
+            categories = self.categorize_batch(records)
+        else:
+            loop = asyncio.get_running_loop()
+            categories = await loop.run_in_executor(None, self.categorize_batch, records)
+        stats = self.cache.stats()
+        print(f"🏷️ Categorized {len(records)} transactions - cache hit rate {stats['hit_rate']:.0%} ({stats['size']} entries)")
+        return categories
+
+    async def _categorize_in_processes(self, records) -> list:
+        self.refresh()
+        rows = [(r.company, r.description, r.amount_minor, r.currency) for r in records]
+        try:
+            categories = await self.pool.categorize_rows(rows, self.merchants, self.version)
+        except BrokenProcessPool as e:
+            print(f"❌ Categorization process pool failed ({e}), falling back to a worker thread")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.categorize_rows, rows)
+        # Workers are given an empty alias table, so aliases are applied here
+        if len(self.aliases):
+            for index, (company, description, _, _) in enumerate(rows):
+                alias = self.aliases.get(company, description, self.version)
+                if alias is not None:
+                    categories[index] = alias[1]
+        return categories
+
+    async def new_aliases_async(self, records) -> dict:
+        """new_aliases, off the event loop for large batches"""
+        if len(records) < self.thread_threshold:
+            return self.new_aliases(records)
+        return await asyncio.to_thread(self.new_aliases, records)
+
+    def new_aliases(self, records) -> dict:
+        """{alias_key: (counterparty, merchant, category)} for counterparties naming a merchant without a current alias
+
+        Only a named counterparty is matched, and only exactly: a payment
+        processor whose descriptions name various shops is not aliased to
+        whichever shop came first, and a free-text description or a fuzzy
+        guess never becomes an alias shared by every later payment.
+        """
+        self.refresh()
+        found = {}
+        for record in records:
+            key = cache_key(record.company, record.description)
+            if not key[0]:
+                continue  # No counterparty, alias_subject would fall back to the description
+            subject = alias_subject(key)
+            digest = alias_key(subject)
+            if digest in found or self.aliases.lookup(digest, self.version) is not None:
+                continue
+            if self.cache.peek(key, MISSING) is None:
+                continue  # Already known not to name a merchant
+            match = self.matcher.best_match(subject)
+            if match is not None:
+                found[digest] = (subject, *match)
+        return found
+
+    def cached_entries(self, records) -> list:
+        """Return [company_key, description_key, result] for the cached results of `records`"""
+        entries = {}
+        for record in records:
+            key = cache_key(record.company, record.description)
+            value = self.cache.peek(key, MISSING)
+            if value is not MISSING:
+                entries[key] = value
+        return [[company, description, value] for (company, description), value in entries.items()]
+
+    def warm_cache(self, entries, version):
+        """Load previously cached results, ignoring them if they were built for another dictionary"""
+        if version != self.cache.version:
+            return 0
+        for company, description, value in entries:
+            self.cache.put((company, description), value)
+        return len(entries)
+
+    def _categorize_rows(self, rows) -> list:
+        merchant_category = self.merchant_category
+        categories = [merchant_category(company, description) for company, description, _, _ in rows]
+        unmatched = [index for index, category in enumerate(categories) if category is None]
+        if not unmatched:
+            return categories
+
+        if self.classifier is not None:
+            predicted = self.classifier.predict(
+                [classifier_text(rows[index][0], rows[index][1]) for index in unmatched],
+                self.classifier_min_confidence
+            )
+            for index, category in zip(unmatched, predicted):
+                categories[index] = category
+
+        for index in unmatched:
+            if categories[index] is None:
+                _, _, amount_minor, currency = rows[index]
+                categories[index] = categorize_by_amount(amount_minor, currency)
+        return categories
+
+    def merchant_category(self, company, description):
+        """Category from aliases or the merchant dictionary alone, None when no merchant matches"""
+        key = cache_key(company, description)
+        if len(self.aliases):
+            subject = alias_subject(key)
+            alias = self.aliases.lookup(alias_key(subject), self.version) if subject else None
+            if alias is not None:
+                return alias[1]
+        category = self.cache.get(key)
+        if category is MISSING:
+            category = self._match_text(f"{company or ''} {description or ''}".lower().strip())
+            self.cache.put(key, category)
+        return category
+
+    def _match_merchant(self, text: str):
+        """(keyword, category) of the merchant named in `text`, or None"""
+        # Check Romanian merchants first (single pass over the text)
+        found = self.matcher.best_match(text)
+        if found is not None:
+            return found
+
+        # Misspelled, split or merged merchant names
+        if self.fuzzy is not None:
+            found = self.fuzzy.best_match(text)
+            if found is not None:
+                return found[:2]
+        return None
+
+    def _match_text(self, text: str):
+        found = self._match_merchant(text)
+        if found is not None:
+            return found[1]
+
+        # Romanian-specific patterns
+        if not LEGAL_FORM_WORDS.isdisjoint(WORD_PATTERN.findall(text)):
+            if any(word in text for word in GROCERY_WORDS):
+                return "Groceries"
+            elif any(word in text for word in RESTAURANT_WORDS):
+                return "Restaurants"
+            elif any(word in text for word in SHOPPING_WORDS):
+                return "Shopping"
+
+        return None
+
+
+def categorize_by_amount(amount_minor, currency=None) -> str:
+    """Amount-based categorization for Romanian context (amount in minor units)"""
+    if amount_minor is None:
+        return "Unknown"
+    unit = 10 ** currency_exponent(currency)
+
+    if amount_minor > 0:
+        if amount_minor > 5000 * unit:  # Large income (RON)
+            return "Salary"
+        else:
+            return "Income"
+    else:
+        amount_minor = abs(amount_minor)
+        if amount_minor > 2000 * unit:  # Rent in major Romanian cities
+            return "Housing"
+        elif amount_minor > 500 * unit:
+            return "Bills"
+        elif amount_minor > 100 * unit:
+            return "Shopping"
+        elif amount_minor > 20 * unit:
+            return "Food"
+        else:
+            return "Small Purchase"
+
+
+# Optional fallback for rows no merchant matches (train with app/jobs/train_category_classifier.py)
+category_classifier = load_classifier(CATEGORY_CLASSIFIER_PATH)
+categorizer = Categorizer()
@@ -0,0 +1,92 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# Masked or full card numbers: "****1234", "xxxx1234", "4111 1111 1111 1111"
+CARD_NUMBER_PATTERN = re.compile(r"[*x]{4,}\s?\d{2,4}|(?:\d{4}[ -]?){3}\d{1,7}")
+# Dates such as "12.10.2024", "2024-10-12", "12/10"
+DATE_PATTERN = re.compile(r"\d{1,4}[./-]\d{1,2}(?:[./-]\d{1,4})?")
+# Store ids, terminal ids and references (short digits like "7card" are kept)
+DIGIT_RUN_PATTERN = re.compile(r"\d{3,}")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Returned by CategoryCache.get on a miss (None is a valid cached result)
+MISSING = object()
+
+
+def normalize_counterparty(text) -> str:
+    """Lowercase text with card numbers, dates and store ids stripped"""
+    text = (text or "").lower()
+    text = CARD_NUMBER_PATTERN.sub(" ", text)
+    text = DATE_PATTERN.sub(" ", text)
+    text = DIGIT_RUN_PATTERN.sub(" ", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def cache_key(company, description) -> tuple:
+    return normalize_counterparty(company), normalize_counterparty(description)
+
+
+def merchants_fingerprint(merchants: dict) -> str:
+    """Short digest of a merchant dictionary; changes whenever an entry does"""
+    return hashlib.sha1(repr(tuple(merchants.items())).encode()).hexdigest()[:12]
+
+
+class CategoryCache:
+    """Bounded LRU cache of merchant-stage categorization results"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached value for `key`, or MISSING"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, key, default=None):
+        """Read an entry without touching recency or statistics"""
+        return self._entries.get(key, default)
+
+    def invalidate(self, version=None):
+        """Drop every entry, e.g. because the merchant dictionary changed"""
+        with self._lock:
+            self._entries.clear()
+            self.version = version
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "version": self.version,
+        }
+
@@ -0,0 +1,73 @@
+def _content(record) -> tuple:
+    return record.booking_date, record.amount_minor, record.currency, record.counterparty()
+
+
+def _repeats_another_source(record, content, source_counts, kept_counts) -> bool:
+    """Count an id-less row and tell whether it only repeats a copy kept from another source
+
+    Each source (account) keeps all of its own rows, so identical purchases on
+    one account all stay. The same content seen from several sources (an
+    account linked twice) is kept as often as the source that has the most
+    copies of it.
+    """
+    counts = source_counts.setdefault(content, {})
+    count = counts.get(record.source, 0) + 1
+    counts[record.source] = count
+    if count <= kept_counts.get(content, 0):
+        return True
+    kept_counts[content] = count
+    return False
+
+
+def dedupe_transactions(records):
+    """Drop repeated transactions in one O(n) pass; returns (kept, dropped)
+
+    Booked rows are considered before pending ones. A row is a duplicate when
+    its bank id was already kept (the same account linked twice), or when it
+    is pending and a booked row with the same date, amount, currency and
+    counterparty exists (a pending payment that has since booked). Rows
+    without an id fall back to that content key, but only copies from another
+    source are dropped: repeats on the same account are genuine purchases.
+    Each booked row absorbs at most one pending copy. `dropped` holds
+    (record, reason) pairs.
+    """
+    seen_ids = set()
+    source_counts = {}
+    kept_counts = {}
+    booked_content = {}
+    kept = []
+    dropped = []
+
+    booked = [record for record in records if not record.pending]
+    pending = [record for record in records if record.pending]
+
+    for record in booked:
+        content = _content(record)
+        if record.id:
+            if record.id in seen_ids:
+                dropped.append((record, "duplicate_id"))
+                continue
+            seen_ids.add(record.id)
+        elif _repeats_another_source(record, content, source_counts, kept_counts):
+            dropped.append((record, "duplicate_content"))
+            continue
+        booked_content[content] = booked_content.get(content, 0) + 1
+        kept.append(record)
+
+    for record in pending:
+        if record.id and record.id in seen_ids:
+            dropped.append((record, "duplicate_id"))
+            continue
+        content = _content(record)
+        if booked_content.get(content):
+            booked_content[content] -= 1
+            dropped.append((record, "pending_booked"))
+            continue
+        if record.id:
+            seen_ids.add(record.id)
+        elif _repeats_another_source(record, content, source_counts, kept_counts):
+            dropped.append((record, "duplicate_content"))
+            continue
+        kept.append(record)
+
+    return kept, dropped
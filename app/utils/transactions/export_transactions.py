@@ -0,0 +1,50 @@
+import asyncio
+import csv
+import io
+import json
+import zlib
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_COLUMNS = ("id", "date", "amount", "currency", "company", "description", "category")
+# Text cells starting with these are formulas to spreadsheet apps
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@")
+CSV_TEXT_COLUMNS = ("company", "description", "category")
+
+
+def _csv_safe(row: dict) -> dict:
+    for column in CSV_TEXT_COLUMNS:
+        if row[column].startswith(CSV_FORMULA_PREFIXES):
+            row[column] = f"'{row[column]}"
+    return row
+
+
+def format_batch(batch, export_format: str) -> str:
+    """Render one batch of BankTransaction rows (decrypting their counterparties)"""
+    rows = [transaction.to_export_row() for transaction in batch]
+    if export_format == "ndjson":
+        return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writerows(_csv_safe(row) for row in rows)
+    return buffer.getvalue()
+
+
+async def encode_export(batches, export_format: str, compress=False):
+    """Stream batches as NDJSON or CSV bytes, gzip-compressed on the fly when `compress` is set"""
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 writes a gzip member
+
+    def encode(text):
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    if export_format == "csv":
+        yield encode(",".join(EXPORT_COLUMNS) + "\n")
+
+    async for batch in batches:
+        # Decryption and formatting are CPU-bound; keep them off the event loop
+        chunk = encode(await asyncio.to_thread(format_batch, batch, export_format))
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
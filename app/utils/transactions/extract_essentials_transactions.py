@@ -1,8 +1,18 @@
 import json
-from app.utils.transactions.get_category_romania import get_category_romanian
+from app.utils.transactions.merchant_registry import categorizer_registry
+from app.utils.transactions.transaction_record import TransactionRecord
+from app.utils.transactions.user_rules import apply_user_rules, get_user_rule_matcher
 
-async def extract_essentials_transactions(data:str):
-    full_data = json.loads(data)    
+async def extract_essentials_transactions(data, user_id=None, country=None):
+    """Turn raw Nordigen transactions into categorized essentials.
+
+    Accepts the parsed payload (a list of transactions or an account response
+    dict) and returns a list of TransactionRecord; serialization is left to
+    the caller. A JSON string is still accepted for older callers. When
+    `user_id` is given, that user's own category rules override the result.
+    `country` selects the merchant dictionary (the default country otherwise).
+    """
+    full_data = json.loads(data) if isinstance(data, (str, bytes)) else data
     transactions_list = []
     if isinstance(full_data,dict):
         if 'transactions' in full_data:
@@ -13,26 +23,20 @@ async def extract_essentials_transactions(data:str):
             else:
                 transactions_list=trans
         else:
-            return "[]"
+            return []
     else:
         transactions_list = full_data
         
-    essentials = []
+    # Parse each transaction once into a compact record (amount in minor units)
+    essentials = [TransactionRecord.from_nordigen(t) for t in transactions_list]
     
-    for t in transactions_list:
-        company = t.get("creditorName",'') or t.get("debtorName", '')
-        description = t.get("remittanceInformationUnstructured", '') or t.get("remittanceInformationStructured", '')
-        amount = t.get("transactionAmount", {}).get("amount", '') or t.get("transactionAmount", '')
-        
-        category = await get_category_romanian(company, description, amount) 
-        
-        essentials.append({
-            "id": t.get("transactionId", ''),
-            "amount": amount,
-            "description": description,
-            "company": company,
-            "category": category
-        })
+    # Categorize the whole batch at once (off the event loop when it is large)
+    categories = await categorizer_registry.get(country).categorize_batch_async(essentials)
+    user_rules = await get_user_rule_matcher(user_id)
+    categories = await apply_user_rules(user_rules, essentials, categories)
+    version = categorizer_registry.version_tag(country)
+    for essential, category in zip(essentials, categories):
+        essential.category = category
+        essential.category_version = version
         
-    return json.dumps(essentials, indent=2)
-    
\ No newline at end of file
+    return essentials
@@ -0,0 +1,109 @@
+import math
+import re
+from app.utils.transactions.category_cache import normalize_counterparty
+
+NGRAM_SIZE = 3
+# Shorter keywords ("omv", "ing", "lidl") are too easy to hit by accident and stay exact-match only
+MIN_FUZZY_KEYWORD_LENGTH = 5
+WORD_PATTERN = re.compile(r"[^\W_]+")
+# Romanian nouns inflect by their last vowel: "alimentara" (a grocery) but "alimentare" (a top-up)
+VOWELS = frozenset("aeiouăâî")
+
+
+def ngrams(text: str) -> set:
+    """Character n-grams of `text`, padded so word starts and ends count"""
+    padded = f" {text} "
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def inflected(keyword: str, text: str) -> bool:
+    """True when `text` is `keyword` with another final vowel ("alimentare" for "alimentara")
+
+    That is a different form of the word (Romanian inflects at the end), not
+    a misspelling of the merchant, however high the n-gram score.
+    """
+    return (len(keyword) == len(text) and keyword[:-1] == text[:-1] and keyword[-1] != text[-1]
+            and keyword[-1] in VOWELS and text[-1] in VOWELS)
+
+
+def similarity(first: set, second: set) -> float:
+    """Dice coefficient of two n-gram sets"""
+    if not first or not second:
+        return 0.0
+    return 2 * len(first & second) / (len(first) + len(second))
+
+
+class FuzzyMerchantIndex:
+    """Approximate merchant lookup over a precomputed character n-gram index.
+
+    Used after exact keyword matching fails, for misspelled, split or
+    run-together counterparties ("CARREFUR EXPRES", "MEGAIMAGE", "STAR BUCKS").
+    Keywords and runs of the text's words are compared with spaces removed, so
+    word breaks do not matter. Each keyword is indexed by its n-grams; the
+    text's n-grams vote for candidate keywords and only those that can still
+    reach `threshold` are scored. The best Dice score wins, ties go to the
+    earliest dictionary entry. A run that only changes the keyword's last
+    letter is an inflected word, not the merchant, and never matches.
+    """
+
+    def __init__(self, merchants: dict, threshold: float):
+        self.threshold = threshold
+        self._keywords = []
+        self._postings = {}
+        self.max_words = 1
+        for priority, (keyword, category) in enumerate(merchants.items()):
+            words = WORD_PATTERN.findall(keyword.lower())
+            compact = "".join(words)
+            if len(compact) < MIN_FUZZY_KEYWORD_LENGTH:
+                continue
+            grams = ngrams(compact)
+            # A window must share at least this many n-grams to score `threshold` (Dice: 2c/(a+b) with c <= b)
+            min_overlap = math.ceil(threshold * len(grams) / (2 - threshold))
+            keyword_index = len(self._keywords)
+            self._keywords.append((keyword, category, compact, grams, len(words), min_overlap, priority))
+            self.max_words = max(self.max_words, len(words))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(keyword_index)
+
+    def __len__(self):
+        return len(self._keywords)
+
+    def best_match(self, text: str):
+        """Return (keyword, category, score) of the closest keyword in `text`, or None"""
+        words = WORD_PATTERN.findall(normalize_counterparty(text))
+        if not words:
+            return None
+
+        # N-grams of every run of words a keyword can be compared with (one word more than the longest keyword)
+        windows = {}
+        for size in range(1, min(self.max_words + 1, len(words)) + 1):
+            for start in range(len(words) - size + 1):
+                run = "".join(words[start:start + size])
+                windows[(start, size)] = (run, ngrams(run))
+
+        votes = {}
+        postings = self._postings
+        for gram in set().union(*(window for _, window in windows.values())):
+            for keyword_index in postings.get(gram, ()):
+                votes[keyword_index] = votes.get(keyword_index, 0) + 1
+
+        best = None
+        best_rank = None
+        for keyword_index, overlap in votes.items():
+            keyword, category, compact, grams, word_count, min_overlap, priority = self._keywords[keyword_index]
+            if overlap < min_overlap:
+                continue
+            # Runs of as many words as the keyword has, give or take one for split or merged words
+            for (start, size), (run, window) in windows.items():
+                if abs(size - word_count) > 1 or inflected(compact, run):
+                    continue
+                score = similarity(grams, window)
+                rank = (-score, priority)
+                if score >= self.threshold and (best_rank is None or rank < best_rank):
+                    best, best_rank = (keyword, category, round(score, 3)), rank
+        return best
+
+    def match(self, text: str):
+        """Return the category of the closest keyword in `text`, or None"""
+        found = self.best_match(text)
+        return found[1] if found else None
@@ -0,0 +1,78 @@
+import hashlib
+from app.config import MERCHANT_ALIAS_CACHE_SIZE
+from app.utils.transactions.category_cache import cache_key
+
+
+def alias_subject(key: tuple) -> str:
+    """The counterparty an alias is for, from a normalized (company, description) pair
+
+    The company when there is one, otherwise the description. Descriptions
+    next to a company are per-transaction free text and are never part of
+    the key, so there is one alias per merchant rather than per payment.
+    """
+    company, description = key
+    return company or description
+
+
+def alias_key(subject: str) -> str:
+    """Digest of a normalized counterparty, as stored in merchant_aliases.alias_key"""
+    return hashlib.sha1(subject.encode()).hexdigest()
+
+
+class MerchantAliasTable:
+    """In-memory copy of the merchant_aliases table: alias_key → (merchant, category, dictionary_version).
+
+    Admin corrections carry no dictionary version and always apply; automatic
+    aliases only apply to the merchant dictionary they were derived from, so
+    editing the dictionary cannot be shadowed by stale aliases.
+
+    Admin corrections are all kept. At most `max_size` automatic aliases are,
+    oldest dropped first: an automatic alias only repeats what the dictionary
+    matches anyway, so a dropped one costs a dictionary match, not a category.
+    """
+
+    def __init__(self, max_size=MERCHANT_ALIAS_CACHE_SIZE):
+        self.max_size = max_size
+        self._admin = {}
+        self._auto = {}
+
+    def __len__(self):
+        return len(self._admin) + len(self._auto)
+
+    def lookup(self, key: str, version=None):
+        """Return (merchant, category) for an alias_key, or None"""
+        alias = self._admin.get(key)
+        if alias is None:
+            alias = self._auto.get(key)
+            if alias is None or alias[2] != version:
+                return None
+        return alias[0], alias[1]
+
+    def get(self, company, description, version=None):
+        subject = alias_subject(cache_key(company, description))
+        return self.lookup(alias_key(subject), version) if subject else None
+
+    def set(self, key: str, merchant, category, version=None):
+        self.discard(key)
+        if version is None:
+            self._admin[key] = (merchant, category, version)
+            return
+        self._auto[key] = (merchant, category, version)
+        while len(self._auto) > self.max_size:
+            self._auto.pop(next(iter(self._auto)), None)
+
+    def discard(self, key: str):
+        self._admin.pop(key, None)
+        self._auto.pop(key, None)
+
+    def replace(self, aliases: dict):
+        """Swap in a freshly loaded table in one step (automatic aliases oldest first)"""
+        admin = {key: alias for key, alias in aliases.items() if alias[2] is None}
+        auto = {key: alias for key, alias in aliases.items() if alias[2] is not None}
+        if len(auto) > self.max_size:
+            auto = dict(list(auto.items())[-self.max_size:])
+        self._admin, self._auto = admin, auto
+
+
+# Shared by every categorizer; loaded at startup and kept current by change notifications
+merchant_aliases = MerchantAliasTable()
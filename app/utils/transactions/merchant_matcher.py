@@ -0,0 +1,138 @@
+import os
+import pickle
+from collections import deque
+from app.utils.transactions.category_cache import merchants_fingerprint
+
+# Keywords this short ("ing", "bt", "mol", "sala") must match a whole word;
+# longer ones only need to start at a word boundary ("mcdonald" in "mcdonalds").
+SHORT_PATTERN_LENGTH = 4
+
+
+class MerchantMatcher:
+    """Aho-Corasick automaton compiled from a {keyword: category} dictionary.
+
+    `match` scans a lowercase string once and returns the category of the best
+    keyword found: the longest one wins, ties go to the earliest dictionary entry.
+    """
+
+    def __init__(self, merchants: dict):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._patterns = []
+
+        for priority, (keyword, category) in enumerate(merchants.items()):
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            self._patterns.append((keyword, category, len(keyword), priority, len(keyword) <= SHORT_PATTERN_LENGTH))
+            self._insert(keyword, len(self._patterns) - 1)
+
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _insert(self, keyword, pattern_index):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] = self._out[state] + (pattern_index,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # Outputs of the failure state are suffixes of this one
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> list:
+        """Return (start, end, keyword, category) for every boundary-respecting keyword hit"""
+        hits = []
+        for end, pattern_index in self._scan(text):
+            keyword, category, length, _, _ = self._patterns[pattern_index]
+            hits.append((end - length, end, keyword, category))
+        return hits
+
+    def best_match(self, text: str):
+        """Return (keyword, category) of the most specific hit in `text`, or None"""
+        best = None
+        best_rank = None
+        for _, pattern_index in self._scan(text):
+            _, _, length, priority, _ = self._patterns[pattern_index]
+            rank = (-length, priority)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = pattern_index, rank
+        if best is None:
+            return None
+        keyword, category, _, _, _ = self._patterns[best]
+        return keyword, category
+
+    def match(self, text: str):
+        """Return the category of the most specific keyword in `text`, or None"""
+        found = self.best_match(text)
+        return found[1] if found else None
+
+    def _scan(self, text):
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self._patterns
+        text_length = len(text)
+        state = 0
+        for index, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = index + 1
+            for pattern_index in out[state]:
+                _, _, length, _, whole_word = patterns[pattern_index]
+                start = end - length
+                if start > 0 and text[start - 1].isalpha():
+                    continue
+                if whole_word and end < text_length and text[end].isalpha():
+                    continue
+                yield end, pattern_index
+
+
+def load_or_compile_matcher(merchants: dict, index_dir=None) -> MerchantMatcher:
+    """Compile `merchants`, reusing a pickled matcher from `index_dir` when one exists for this dictionary"""
+    if not index_dir:
+        return MerchantMatcher(merchants)
+
+    path = os.path.join(index_dir, f"matcher-{merchants_fingerprint(merchants)}.pickle")
+    try:
+        with open(path, "rb") as index_file:
+            matcher = pickle.load(index_file)
+        if isinstance(matcher, MerchantMatcher):
+            return matcher
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"❌ Ignoring unreadable merchant index {path}: {e}")
+
+    matcher = MerchantMatcher(merchants)
+    try:
+        os.makedirs(index_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as index_file:
+            pickle.dump(matcher, index_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"❌ Failed to save merchant index {path}: {e}")
+    return matcher
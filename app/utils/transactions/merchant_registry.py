@@ -0,0 +1,78 @@
+import importlib
+import threading
+from app.config import DEFAULT_CATEGORIZATION_COUNTRY
+from app.utils.transactions.categorizer import Categorizer, categorizer
+
+# Country → "module:attribute" of its merchant dictionary, imported on first use
+COUNTRY_MERCHANT_DICTIONARIES = {
+    "RO": "app.utils.transactions.merchants_romania:ROMANIAN_MERCHANT_CATEGORIES",
+}
+
+
+def country_from_institution_id(institution_id):
+    """ISO country of a Nordigen institution id, read from its BIC ("BCR_RNCBROBU" → "RO")"""
+    if not institution_id:
+        return None
+    bic = institution_id.rsplit("_", 1)[-1]
+    if len(bic) not in (8, 11):
+        return None
+    country = bic[4:6]
+    return country.upper() if country.isalpha() else None
+
+
+def load_merchant_dictionary(reference: str) -> dict:
+    module_name, _, attribute = reference.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class CategorizerRegistry:
+    """Per-country categorizers, each built (and its matcher compiled) the first time it is needed"""
+
+    def __init__(self, dictionaries=None, default_country=DEFAULT_CATEGORIZATION_COUNTRY, preloaded=None):
+        self.dictionaries = COUNTRY_MERCHANT_DICTIONARIES if dictionaries is None else dictionaries
+        self.default_country = default_country
+        if default_country not in self.dictionaries:
+            self.default_country = next(iter(self.dictionaries))
+            print(f"❌ No merchant dictionary for {default_country}, defaulting to {self.default_country}")
+        self._categorizers = dict(preloaded or {})
+        self._lock = threading.Lock()
+
+    def resolve(self, country) -> str:
+        """The country whose dictionary will be used for `country` (the default when it has none)"""
+        country = (country or "").upper()
+        return country if country in self.dictionaries else self.default_country
+
+    def loaded_countries(self) -> list:
+        return sorted(self._categorizers)
+
+    def version_tag(self, country=None) -> str:
+        """"RO:<categorization version>", stored with each transaction to spot stale categories"""
+        country = self.resolve(country)
+        return f"{country}:{self.get(country).categorization_version}"
+
+    def current_version_tags(self) -> dict:
+        """{country: version_tag} for every country with a dictionary (loads each one)"""
+        return {country: self.version_tag(country) for country in self.dictionaries}
+
+    def country_of_version_tag(self, tag) -> str:
+        """The country a stored version tag was categorized for (the default for untagged rows)"""
+        return self.resolve((tag or "").partition(":")[0])
+
+    def get(self, country=None) -> Categorizer:
+        country = self.resolve(country)
+        active = self._categorizers.get(country)
+        if active is not None:
+            return active
+
+        with self._lock:
+            active = self._categorizers.get(country)
+            if active is None:
+                merchants = load_merchant_dictionary(self.dictionaries[country])
+                active = Categorizer(merchants=merchants)
+                self._categorizers[country] = active
+                print(f"📚 Loaded {len(merchants)} merchants for {country}")
+        return active
+
+
+# The Romanian categorizer is shared with the rest of the app instead of being compiled twice
+categorizer_registry = CategorizerRegistry(preloaded={"RO": categorizer})
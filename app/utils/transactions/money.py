@@ -0,0 +1,66 @@
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+
+DEFAULT_CURRENCY = "RON"
+DEFAULT_EXPONENT = 2
+
+# ISO 4217 minor-unit exponents that differ from the usual 2
+CURRENCY_EXPONENTS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0,
+    "PYG": 0, "RWF": 0, "UGX": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+}
+
+
+def currency_exponent(currency) -> int:
+    """Number of minor-unit digits for an ISO currency code"""
+    return CURRENCY_EXPONENTS.get((currency or DEFAULT_CURRENCY).upper(), DEFAULT_EXPONENT)
+
+
+def parse_minor_units(amount, currency=None, exponent=None):
+    """Parse a decimal amount string ("-12.3") into integer minor units (-1230).
+
+    Empty amounts count as 0; anything unparseable returns None. Amounts with
+    more decimals than the currency allows are rounded half-even. `exponent`
+    overrides the currency's own number of minor-unit digits.
+    """
+    if amount is None or amount == "":
+        return 0
+    if isinstance(amount, bool) or not isinstance(amount, (str, int)):
+        return None
+    if exponent is None:
+        exponent = currency_exponent(currency)
+    text = str(amount).strip()
+
+    # Fast path for plain "[-]digits[.digits]" strings
+    sign = 1
+    digits = text
+    if digits[:1] in ("-", "+"):
+        sign = -1 if digits[0] == "-" else 1
+        digits = digits[1:]
+    whole, _, fraction = digits.partition(".")
+    # isdecimal() alone accepts non-ASCII digits and isdigit() even "²", which int() cannot parse
+    if digits.isascii() and (whole.isdecimal() or (whole == "" and fraction)) and (fraction == "" or fraction.isdecimal()) \
+            and len(fraction) <= exponent:
+        return sign * (int(whole or "0") * 10 ** exponent + int(fraction.ljust(exponent, "0") or "0"))
+
+    try:
+        value = Decimal(text).scaleb(exponent).quantize(Decimal(1), rounding=ROUND_HALF_EVEN)
+    except (InvalidOperation, ValueError):
+        return None
+    if not value.is_finite():
+        return None
+    return int(value)
+
+
+def to_major_units(minor: int, currency=None) -> float:
+    """Convert minor units to a JSON-friendly number (only at the response boundary)"""
+    return int(minor) / 10 ** currency_exponent(currency)
+
+
+def format_amount(minor: int, currency=None) -> str:
+    """Format minor units as a fixed-point string ("-12.30")"""
+    exponent = currency_exponent(currency)
+    minor = int(minor)
+    sign = "-" if minor < 0 else ""
+    whole, fraction = divmod(abs(minor), 10 ** exponent)
+    return f"{sign}{whole}.{fraction:0{exponent}d}" if exponent else f"{sign}{whole}"
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import numpy as np
+from app.utils.transactions.category_cache import normalize_counterparty
+
+NGRAM_SIZES = (3, 4)
+HASH_BUCKETS = 2 ** 16
+# Multiplicative hashing constants; fixed so a saved model means the same thing in every process
+HASH_BASE = np.uint64(1099511628211)
+HASH_MULTIPLIER = np.uint64(11400714819323198485)
+
+
+def classifier_text(company, description) -> str:
+    return normalize_counterparty(f"{company or ''} {description or ''}")
+
+
+def hashed_ngrams(texts, buckets=HASH_BUCKETS, sizes=NGRAM_SIZES) -> tuple:
+    """Hash every character n-gram of every text in one vectorized pass.
+
+    Returns (rows, columns): the text index and bucket of each n-gram. Texts
+    are padded with a space so word starts and ends form their own n-grams;
+    n-grams never span two texts.
+    """
+    encoded = [f" {text} ".encode() for text in texts]
+    lengths = np.fromiter((len(text) for text in encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    owner = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths)
+    shift = np.uint64(64 - int(buckets).bit_length() + 1)
+
+    rows, columns = [], []
+    for size in sizes:
+        count = len(data) - size + 1
+        if count <= 0:
+            continue
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes = hashes * HASH_BASE + data[offset:offset + count]
+        valid = owner[:count] == owner[size - 1:size - 1 + count]
+        rows.append(owner[:count][valid])
+        columns.append(((hashes[valid] * HASH_MULTIPLIER) >> shift).astype(np.int64))
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(columns)
+
+
+class NgramClassifier:
+    """Multinomial naive Bayes over hashed character n-grams of the counterparty text.
+
+    Trained offline (`partial_fit` can be fed batch by batch) and saved as a
+    compressed .npz. `predict` scores a whole batch with one gather and one
+    segmented sum over a (buckets × categories) log-probability table, and
+    leaves a row unlabelled when its best category is below `min_confidence`.
+    """
+
+    def __init__(self, categories=(), buckets=HASH_BUCKETS, alpha=0.1):
+        if buckets <= 0 or buckets & (buckets - 1):
+            raise ValueError("buckets must be a power of two")
+        self.buckets = buckets
+        self.alpha = alpha
+        self.categories = list(categories)
+        self._counts = np.zeros((buckets, len(self.categories)), dtype=np.float64)
+        self._documents = np.zeros(len(self.categories), dtype=np.float64)
+        self.log_probs = None
+        self.log_priors = None
+        self.fingerprint = None
+
+    def _category_indexes(self, labels) -> np.ndarray:
+        known = {category: index for index, category in enumerate(self.categories)}
+        new = [label for label in dict.fromkeys(labels) if label not in known]
+        if new:
+            for label in new:
+                known[label] = len(self.categories)
+                self.categories.append(label)
+            self._counts = np.pad(self._counts, ((0, 0), (0, len(new))))
+            self._documents = np.pad(self._documents, (0, len(new)))
+        return np.fromiter((known[label] for label in labels), dtype=np.int64, count=len(labels))
+
+    def partial_fit(self, texts, labels):
+        """Add one batch of (text, category) examples to the counts"""
+        if not texts:
+            return self
+        targets = self._category_indexes(labels)
+        rows, columns = hashed_ngrams(texts, self.buckets)
+        np.add.at(self._counts, (columns, targets[rows]), 1)
+        self._documents += np.bincount(targets, minlength=len(self.categories))
+        return self
+
+    def finalize(self):
+        """Turn the accumulated counts into log-probabilities"""
+        smoothed = self._counts + self.alpha
+        # Rounded to the float16 it is saved as, so a trained model and its saved copy predict alike
+        log_probs = np.log(smoothed) - np.log(smoothed.sum(axis=0))
+        self.log_probs = log_probs.astype(np.float16).astype(np.float32)
+        self.log_priors = (np.log(self._documents + 1) - np.log(self._documents.sum() + len(self.categories)))
+        self.log_priors = self.log_priors.astype(np.float32)
+        self._set_fingerprint()
+        return self
+
+    def _set_fingerprint(self):
+        digest = hashlib.sha1(repr((self.buckets, self.categories)).encode())
+        digest.update(self.log_priors.tobytes())
+        digest.update(self.log_probs.tobytes())
+        self.fingerprint = digest.hexdigest()[:12]
+
+    def fit(self, texts, labels):
+        return self.partial_fit(texts, labels).finalize()
+
+    def predict_proba(self, texts) -> np.ndarray:
+        """(len(texts) × categories) posterior probabilities"""
+        scores = np.tile(self.log_priors, (len(texts), 1))
+        rows, columns = hashed_ngrams(texts, self.buckets)
+        if len(rows):
+            # n-grams come out grouped by size, so order by text before the segmented sum
+            order = np.argsort(rows, kind="stable")
+            rows, columns = rows[order], columns[order]
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            scores[rows[starts]] += np.add.reduceat(self.log_probs[columns], starts, axis=0)
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def predict(self, texts, min_confidence=0.0) -> list:
+        """Most likely category per text, or None where it is less likely than `min_confidence`"""
+        if not texts or not self.categories:
+            return [None] * len(texts)
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        confident = probabilities[np.arange(len(texts)), best] >= min_confidence
+        return [self.categories[index] if ok else None for index, ok in zip(best.tolist(), confident.tolist())]
+
+    def save(self, path):
+        """Write the model as a compressed .npz (log-probabilities stored as float16)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            log_probs=self.log_probs.astype(np.float16),
+            log_priors=self.log_priors,
+            categories=np.array(self.categories),
+            buckets=np.array(self.buckets)
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as saved:
+            model = cls(buckets=int(saved["buckets"]))
+            model.categories = saved["categories"].tolist()
+            model.log_probs = saved["log_probs"].astype(np.float32)
+            model.log_priors = saved["log_priors"]
+        model._set_fingerprint()
+        return model
+
+
+def load_classifier(path):
+    """Load a saved classifier, or None when no path is configured or the file is unusable"""
+    if not path:
+        return None
+    try:
+        classifier = NgramClassifier.load(path)
+        print(f"🧠 Loaded n-gram classifier with {len(classifier.categories)} categories from {path}")
+        return classifier
+    except FileNotFoundError:
+        print(f"❌ No n-gram classifier at {path}, falling back to amount bands")
+    except Exception as e:
+        print(f"❌ Ignoring unreadable n-gram classifier {path}: {e}")
+    return None
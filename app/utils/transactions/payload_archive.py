@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import json
+from datetime import date
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def available_codecs() -> tuple:
+    return ("gzip", "zstd") if zstandard is not None else ("gzip",)
+
+
+def resolve_codec(codec) -> str:
+    """The configured codec when it can be used here, gzip otherwise"""
+    codec = (codec or "gzip").lower()
+    if codec not in available_codecs():
+        print(f"❌ Payload codec {codec!r} is not available, archiving with gzip")
+        return "gzip"
+    return codec
+
+
+def compress_payload(raw: bytes, codec="gzip") -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if codec == "gzip":
+        # mtime=0 keeps the output identical for identical payloads
+        return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unknown payload codec: {codec}")
+
+
+def decompress_payload(blob: bytes, codec="gzip") -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Payload was archived with zstd, which is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if codec == "gzip":
+        return gzip.decompress(blob)
+    raise ValueError(f"Unknown payload codec: {codec}")
+
+
+def payload_digest(raw: bytes) -> str:
+    """Identifies a payload, so a sync that returns nothing new is not archived twice"""
+    return hashlib.sha1(raw).hexdigest()
+
+
+def account_digest(account_id) -> str:
+    """Identifies an account's archives without storing its id in clear text"""
+    return hashlib.sha1(f"account:{account_id}".encode()).hexdigest()
+
+
+def _booking_date(transaction):
+    value = transaction.get("bookingDate") or transaction.get("valueDate")
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def payload_window(transactions) -> tuple:
+    """(first, last) booking date in a list of raw transactions, (None, None) when there are none"""
+    dates = [day for day in map(_booking_date, transactions) if day is not None]
+    return (min(dates), max(dates)) if dates else (None, None)
+
+
+def payload_since(raw: bytes, since):
+    """The part of a response body dated on or after `since`, None when nothing is newer than it
+
+    Nordigen returns the whole history on every sync; only what is newer than
+    an account's last archived window needs keeping. The last archived day is
+    included again, since rows can still book on it, and so are undated rows.
+    Without `since` the body is returned unchanged.
+    """
+    if since is None:
+        return raw
+    data = json.loads(raw)
+    transactions = data.get("transactions", {}) if isinstance(data, dict) else {}
+    window = {}
+    newer = False
+    for status in ("booked", "pending"):
+        rows = []
+        for row in transactions.get(status, []):
+            day = _booking_date(row)
+            if day is None or day >= since:
+                rows.append(row)
+                newer = newer or (day is not None and day > since)
+        if rows:
+            window[status] = rows
+    if not newer:
+        return None
+    return json.dumps({"transactions": window}, separators=(",", ":")).encode()
@@ -0,0 +1,110 @@
+import numpy as np
+
+# (name, typical interval in days, tolerance in days)
+PERIODS = (
+    ("weekly", 7, 1),
+    ("biweekly", 14, 2),
+    ("monthly", 30, 4),
+    ("quarterly", 91, 7),
+    ("yearly", 365, 12),
+)
+MIN_OCCURRENCES = 3
+# Categories the merchant dictionary already marks as subscriptions need fewer payments
+SUBSCRIPTION_CATEGORIES = {"Streaming", "Gym", "Phone", "Internet", "Utilities"}
+SUBSCRIPTION_MIN_OCCURRENCES = 2
+MIN_REGULARITY = 0.75
+# Payments within this fraction of the typical amount count as the "same" amount,
+# and at least this share of a payment's amounts must be the "same" for it to be reported
+AMOUNT_TOLERANCE = 0.10
+MIN_AMOUNT_STABILITY = 0.5
+# A merchant's payments split into separate candidates where sorted amounts jump by more than this fraction
+# (two plans at one shop), while a bill that drifts from month to month stays one
+AMOUNT_CLUSTER_GAP = 0.25
+
+
+def _period_for(interval):
+    for name, days, tolerance in PERIODS:
+        if abs(interval - days) <= tolerance:
+            return name, tolerance
+    return None, None
+
+
+def detect_recurring_payments(merchant_keys, dates, amounts_minor, currencies, categories) -> list:
+    """Find payments that repeat at a regular interval for roughly the same amount
+
+    Inputs are parallel sequences, one item per outgoing transaction; rows
+    without a merchant key or a date are skipped. Each merchant's payments
+    are first split into amount clusters, then rows are sorted once by
+    (cluster, date); intervals come from a single np.diff and each cluster's
+    stats from a slice of it, so there are no pairwise comparisons. Returns
+    one dict per detected payment.
+    """
+    usable = [row for row, (key, day) in enumerate(zip(merchant_keys, dates)) if key and day is not None]
+    if not usable:
+        return []
+    group_index = {}
+    codes = np.fromiter(
+        (group_index.setdefault((merchant_keys[row], currencies[row]), len(group_index)) for row in usable),
+        dtype=np.int64, count=len(usable)
+    )
+    days = np.array([dates[row] for row in usable], dtype="datetime64[D]").astype(np.int64)
+    amounts = np.abs(np.asarray([amounts_minor[row] for row in usable], dtype=np.int64))
+    categories = [categories[row] for row in usable]
+    groups = list(group_index)
+
+    # Amount clusters: sorted by (merchant, amount), a new cluster starts at each merchant or large jump
+    by_amount = np.lexsort((amounts, codes))
+    sorted_codes, sorted_amounts = codes[by_amount], amounts[by_amount]
+    breaks = (np.diff(sorted_codes) != 0) | (sorted_amounts[1:] > sorted_amounts[:-1] * (1 + AMOUNT_CLUSTER_GAP))
+    clusters = np.empty(len(codes), dtype=np.int64)
+    clusters[by_amount] = np.concatenate(([0], np.cumsum(breaks)))
+
+    order = np.lexsort((days, clusters))
+    codes, clusters, days, amounts = codes[order], clusters[order], days[order], amounts[order]
+    categories = [categories[row] for row in order.tolist()]
+    intervals = np.diff(days)
+    boundaries = np.flatnonzero(np.diff(clusters)) + 1
+    starts = np.concatenate(([0], boundaries)).tolist()
+    ends = np.concatenate((boundaries, [len(codes)])).tolist()
+
+    detected = []
+    for start, end in zip(starts, ends):
+        count = end - start
+        category = categories[end - 1]
+        needed = SUBSCRIPTION_MIN_OCCURRENCES if category in SUBSCRIPTION_CATEGORIES else MIN_OCCURRENCES
+        if count < needed:
+            continue
+
+        group_intervals = intervals[start:end - 1]
+        interval = float(np.median(group_intervals))
+        period, tolerance = _period_for(interval)
+        if period is None:
+            continue
+        regularity = float(np.mean(np.abs(group_intervals - interval) <= tolerance))
+        if regularity < MIN_REGULARITY:
+            continue
+
+        group_amounts = amounts[start:end]
+        typical_amount = int(np.median(group_amounts))
+        amount_stability = float(np.mean(
+            np.abs(group_amounts - typical_amount) <= max(typical_amount * AMOUNT_TOLERANCE, 1)
+        ))
+        if amount_stability < MIN_AMOUNT_STABILITY:
+            continue
+
+        merchant_key, currency = groups[int(codes[start])]
+        last_day = int(days[end - 1])
+        detected.append({
+            "merchant_key": merchant_key,
+            "currency": currency,
+            "category": category,
+            "period": period,
+            "interval_days": round(interval, 1),
+            "amount_minor": typical_amount,
+            "occurrences": count,
+            "first_date": np.datetime64(int(days[start]), "D").item(),
+            "last_date": np.datetime64(last_day, "D").item(),
+            "next_date": np.datetime64(last_day + int(round(interval)), "D").item(),
+            "confidence": round((regularity + amount_stability) / 2, 2),
+        })
+    return detected
@@ -0,0 +1,265 @@
+import asyncio
+import re
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from datetime import date
+import numpy as np
+from app.config import SEARCH_INDEX_MEMORY_MB
+from app.database.methods.stream_transactions import stream_transactions
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+# Rough per-entry costs used for the memory budget (postings themselves are 4-byte ints)
+DOCUMENT_BYTES = 160
+TERM_BYTES = 120
+TRIGRAM_ENTRY_BYTES = 40
+
+
+def fold(text) -> str:
+    """Lowercase text with diacritics removed, so "Plată" and "plata" match"""
+    decomposed = unicodedata.normalize("NFKD", (text or "").lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text) -> list:
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+def trigrams(token) -> set:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class TransactionSearchIndex:
+    """Inverted index over one user's stored transactions (company and description).
+
+    Every distinct token maps to the sorted document numbers containing it, and
+    every trigram maps to the tokens containing it. A query term matches any
+    token that contains it: terms of three or more characters find candidate
+    tokens through the trigram index, shorter ones match token prefixes. Terms
+    are ANDed together and results come back newest first.
+
+    Documents are only ever appended, so postings stay sorted and can be
+    intersected as NumPy views without copying.
+    """
+
+    def __init__(self):
+        self.row_ids = []
+        self.transaction_ids = []
+        self._dates = array("i")
+        self._known = set()
+        self._postings = {}
+        self._trigrams = {}
+        self.posting_count = 0
+        self.trigram_entries = 0
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated memory held by the index"""
+        return (len(self.row_ids) * DOCUMENT_BYTES + len(self._postings) * TERM_BYTES
+                + self.trigram_entries * TRIGRAM_ENTRY_BYTES + self.posting_count * 4)
+
+    def add(self, rows) -> int:
+        """Index stored BankTransaction rows, skipping any already indexed; returns how many were added"""
+        added = 0
+        for row in rows:
+            row_id = str(row.id)
+            if row_id in self._known:
+                continue
+            self._known.add(row_id)
+            document = len(self.row_ids)
+            self.row_ids.append(row_id)
+            self.transaction_ids.append(row.transaction_id or "")
+            self._dates.append(row.booking_date.toordinal())
+            for token in set(tokenize(row.company)) | set(tokenize(row.description)):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = array("I")
+                    for trigram in trigrams(token):
+                        self._trigrams.setdefault(trigram, set()).add(token)
+                        self.trigram_entries += 1
+                postings.append(document)
+                self.posting_count += 1
+            added += 1
+        return added
+
+    def _matching_tokens(self, term) -> list:
+        if len(term) < 3:
+            return [token for token in self._postings if token.startswith(term)]
+        candidates = None
+        for trigram in sorted(trigrams(term), key=lambda t: len(self._trigrams.get(t, ()))):
+            tokens = self._trigrams.get(trigram)
+            if not tokens:
+                return []
+            candidates = set(tokens) if candidates is None else candidates & tokens
+            if not candidates:
+                return []
+        return [token for token in candidates if term in token]
+
+    def _documents(self, term):
+        tokens = self._matching_tokens(term)
+        if not tokens:
+            return np.empty(0, dtype=np.uint32)
+        if len(tokens) == 1:
+            return np.frombuffer(self._postings[tokens[0]], dtype=np.uint32)
+        return np.unique(np.concatenate([np.frombuffer(self._postings[t], dtype=np.uint32) for t in tokens]))
+
+    def search(self, query, limit=None) -> tuple:
+        """Return (total, document numbers newest first) for documents matching every query term"""
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return 0, []
+        matches = None
+        for term in terms:
+            documents = self._documents(term)
+            matches = documents if matches is None else np.intersect1d(matches, documents, assume_unique=True)
+            if not len(matches):
+                return 0, []
+
+        total = len(matches)
+        dates = np.frombuffer(self._dates, dtype=np.int32)[matches]
+        if limit is not None and limit < total:
+            # Only the newest `limit` need ordering
+            keep = np.argpartition(-dates, limit - 1)[:limit]
+            matches, dates = matches[keep], dates[keep]
+        order = np.lexsort((-matches.astype(np.int64), -dates))
+        return total, matches[order].tolist()
+
+    def result(self, document) -> dict:
+        return {
+            "id": self.row_ids[document],
+            "transaction_id": self.transaction_ids[document],
+            "date": date.fromordinal(self._dates[document]).isoformat()
+        }
+
+
+class SearchIndexCache:
+    """Per-user search indexes kept under a memory budget, least recently used evicted first.
+
+    Rows synced while a user's index is being built are held back and added
+    when the build finishes, so nothing stored in the meantime is missed.
+    """
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self._indexes = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._indexes)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(index.size_bytes for index in self._indexes.values())
+
+    def get(self, user_id):
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                self.misses += 1
+                return None
+            self._indexes.move_to_end(user_id)
+            self.hits += 1
+            return index
+
+    def begin_build(self, user_id):
+        with self._lock:
+            self._pending.setdefault(user_id, [])
+
+    def cancel_build(self, user_id):
+        with self._lock:
+            self._pending.pop(user_id, None)
+
+    def put(self, user_id, index):
+        """Store a freshly built index, adding rows synced during the build, then enforce the budget"""
+        with self._lock:
+            index.add(self._pending.pop(user_id, []))
+            self._indexes[user_id] = index
+            self._indexes.move_to_end(user_id)
+            self._evict()
+            return index
+
+    def extend(self, user_id, rows) -> int:
+        """Add newly stored rows to a user's index; a no-op when the index has not been built"""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                pending = self._pending.get(user_id)
+                if pending is not None:
+                    pending.extend(rows)
+                return 0
+            added = index.add(rows)
+            self._evict()
+            return added
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(user_id, None)
+
+    def _evict(self):
+        # The most recently used index is kept even when it alone exceeds the budget
+        total = sum(index.size_bytes for index in self._indexes.values())
+        while total > self.memory_budget and len(self._indexes) > 1:
+            _, index = self._indexes.popitem(last=False)
+            total -= index.size_bytes
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._indexes),
+            "size_bytes": self.size_bytes,
+            "memory_budget": self.memory_budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+search_indexes = SearchIndexCache(SEARCH_INDEX_MEMORY_MB * 1024 * 1024)
+_builds = {}
+
+
+async def _build_search_index(user_id):
+    search_indexes.begin_build(user_id)
+    try:
+        # The index is private until stored, so batches can be decrypted and indexed off the event loop
+        index = TransactionSearchIndex()
+        async for batch in stream_transactions(user_id):
+            await asyncio.to_thread(index.add, batch)
+    except Exception:
+        search_indexes.cancel_build(user_id)
+        raise
+    print(f"🔎 Built search index for user {user_id}: {len(index)} transactions, {index.size_bytes // 1024} KiB")
+    return search_indexes.put(user_id, index)
+
+
+async def get_search_index(user_id):
+    """Return a user's search index, building it from stored transactions on first use"""
+    index = search_indexes.get(user_id)
+    if index is not None:
+        return index
+    build = _builds.get(user_id)
+    if build is None:
+        build = _builds[user_id] = asyncio.ensure_future(_build_search_index(user_id))
+        build.add_done_callback(lambda _: _builds.pop(user_id, None))
+    # Concurrent searches share one build, and a cancelled request does not abort it
+    return await asyncio.shield(build)
+
+
+def index_new_transactions(user_id, rows) -> int:
+    """Keep a loaded search index current after a sync stored `rows`"""
+    if not rows:
+        return 0
+    return search_indexes.extend(user_id, rows)
@@ -0,0 +1,225 @@
+import numpy as np
+from app.utils.transactions.money import currency_exponent
+
+TOP_CATEGORIES_LIMIT = 5
+
+
+def _parse_dates(dates):
+    try:
+        return np.array(dates, dtype="datetime64[D]")
+    except ValueError:
+        parsed = np.empty(len(dates), dtype="datetime64[D]")
+        for row, value in enumerate(dates):
+            try:
+                parsed[row] = np.datetime64(value, "D")
+            except ValueError:
+                parsed[row] = np.datetime64("NaT")
+        return parsed
+
+
+def _group_sums(codes, values, size):
+    """Exact per-group int64 sums"""
+    sums = np.zeros(size, dtype=np.int64)
+    np.add.at(sums, codes, values)
+    return sums
+
+
+class TransactionColumns:
+    """Columnar view of categorized TransactionRecord rows (one array per field)
+
+    Amounts are int64 minor units. When several currencies are present they are
+    all scaled to the largest minor-unit exponent so sums stay exact.
+    """
+
+    def __init__(self, essentials):
+        category_index = {}
+        currency_index = {}
+        count = len(essentials)
+        self.amount_minor = np.array([t.amount_minor or 0 for t in essentials], dtype=np.int64)
+        self.category_code = np.fromiter(
+            (category_index.setdefault(t.category or "Unknown", len(category_index)) for t in essentials),
+            dtype=np.int32, count=count
+        )
+        self.currency_code = np.fromiter(
+            (currency_index.setdefault(t.currency or "", len(currency_index)) for t in essentials),
+            dtype=np.int32, count=count
+        )
+        self.category_names = list(category_index)
+        self.currencies = list(currency_index)
+        self.date = _parse_dates([t.booking_date or "NaT" for t in essentials])
+
+        exponents = [currency_exponent(currency) for currency in self.currencies]
+        self.exponent = max(exponents, default=2)
+        if any(exponent != self.exponent for exponent in exponents):
+            scale = np.array([10 ** (self.exponent - exponent) for exponent in exponents], dtype=np.int64)
+            self.amount_minor = self.amount_minor * scale[self.currency_code]
+        self.sign = np.sign(self.amount_minor).astype(np.int8)
+
+    def __len__(self):
+        return len(self.amount_minor)
+
+    @property
+    def currency(self):
+        """The single currency of these rows, or None when they are mixed"""
+        return self.currencies[0] if len(self.currencies) == 1 else None
+
+    def to_number(self, minor) -> float:
+        """Minor units at this view's exponent as a JSON number"""
+        return int(minor) / 10 ** self.exponent
+
+    def take(self, order):
+        """Select/reorder rows by an index array; categories are re-coded in first-seen order"""
+        codes = self.category_code[order]
+        present, first_seen = np.unique(codes, return_index=True)
+        by_first_seen = present[np.argsort(first_seen)]
+        remap = np.zeros(len(self.category_names), dtype=np.int32)
+        remap[by_first_seen] = np.arange(len(by_first_seen), dtype=np.int32)
+
+        reordered = object.__new__(TransactionColumns)
+        reordered.amount_minor = self.amount_minor[order]
+        reordered.category_code = remap[codes]
+        reordered.category_names = [self.category_names[code] for code in by_first_seen.tolist()]
+        reordered.currency_code = self.currency_code[order]
+        reordered.currencies = self.currencies
+        reordered.exponent = self.exponent
+        reordered.sign = self.sign[order]
+        reordered.date = self.date[order]
+        return reordered
+
+
+def sort_by_absolute_amount(essentials):
+    """Sort transactions by absolute amount, highest first; returns (sorted list, columns)"""
+    columns = TransactionColumns(essentials)
+    order = np.argsort(-np.abs(columns.amount_minor), kind="stable")
+    return [essentials[i] for i in order.tolist()], columns.take(order)
+
+
+def summarize_transactions(essentials, columns=None, top_limit=TOP_CATEGORIES_LIMIT, include_transactions=True):
+    """Totals, income/spend split, per-category sums/counts and top categories, computed with NumPy
+
+    Sums are exact int64 minor units and are only turned into numbers for the
+    response here. Building the per-category transaction lists is the only
+    per-row Python work left; pass include_transactions=False when they are
+    not needed.
+    """
+    if columns is None:
+        columns = TransactionColumns(essentials)
+
+    amounts = columns.amount_minor
+    codes = columns.category_code
+    category_count = len(columns.category_names)
+    to_number = columns.to_number
+
+    total_income = int(amounts[columns.sign > 0].sum())
+    total_spent = int(-amounts[columns.sign < 0].sum())
+
+    category_totals = _group_sums(codes, np.abs(amounts), category_count)
+    category_counts = np.bincount(codes, minlength=category_count)
+
+    categories = {
+        name: {"count": int(category_counts[code]), "total_amount": to_number(category_totals[code])}
+        for code, name in enumerate(columns.category_names)
+    }
+
+    if include_transactions:
+        # Group row indices by category (stable, so each group keeps the input order)
+        grouped_rows = np.argsort(codes, kind="stable")
+        category_rows = np.split(grouped_rows, np.cumsum(category_counts)[:-1]) if category_count else []
+        for code, name in enumerate(columns.category_names):
+            categories[name]["transactions"] = [
+                {"company": essentials[row].company, "amount": essentials[row].amount}
+                for row in category_rows[code].tolist()
+            ]
+
+    top_codes = np.argsort(-category_totals, kind="stable")[:top_limit]
+    top_categories = [
+        {
+            "category": columns.category_names[code],
+            "amount": to_number(category_totals[code]),
+            "count": int(category_counts[code])
+        }
+        for code in top_codes.tolist()
+    ]
+
+    summary = {
+        "total_income": to_number(total_income),
+        "total_spent": to_number(total_spent),
+        "net_amount": to_number(total_income - total_spent),
+        "categories_found": category_count,
+        "currency": columns.currency
+    }
+
+    if len(columns.currencies) > 1:
+        currency_count = len(columns.currencies)
+        income = _group_sums(columns.currency_code, np.where(amounts > 0, amounts, 0), currency_count)
+        spent = _group_sums(columns.currency_code, np.where(amounts < 0, -amounts, 0), currency_count)
+        summary["by_currency"] = {
+            currency: {
+                "total_income": to_number(income[code]),
+                "total_spent": to_number(spent[code]),
+                "net_amount": to_number(income[code] - spent[code])
+            }
+            for code, currency in enumerate(columns.currencies)
+        }
+
+    return {
+        "summary": summary,
+        "categories": categories,
+        "top_categories": top_categories
+    }
+
+
+def summarize_totals(totals, top_limit=TOP_CATEGORIES_LIMIT):
+    """summarize_transactions' result, without transaction lists, from pre-aggregated totals
+
+    `totals` holds (category, currency, income_minor, spent_minor, count)
+    rows, such as a GROUP BY over stored transactions, so no transaction has
+    to be loaded or decrypted.
+    """
+    currencies = list(dict.fromkeys(currency or "" for _, currency, _, _, _ in totals))
+    exponent = max((currency_exponent(currency) for currency in currencies), default=2)
+
+    def to_number(minor) -> float:
+        return int(minor) / 10 ** exponent
+
+    categories = {}
+    by_currency = {currency: [0, 0] for currency in currencies}
+    for category, currency, income, spent, count in totals:
+        scale = 10 ** (exponent - currency_exponent(currency or ""))
+        income, spent = int(income or 0) * scale, int(spent or 0) * scale
+        entry = categories.setdefault(category or "Unknown", [0, 0])
+        entry[0] += income + spent
+        entry[1] += int(count)
+        by_currency[currency or ""][0] += income
+        by_currency[currency or ""][1] += spent
+
+    total_income = sum(income for income, _ in by_currency.values())
+    total_spent = sum(spent for _, spent in by_currency.values())
+    ranked = sorted(categories.items(), key=lambda item: -item[1][0])[:top_limit]
+
+    summary = {
+        "total_income": to_number(total_income),
+        "total_spent": to_number(total_spent),
+        "net_amount": to_number(total_income - total_spent),
+        "categories_found": len(categories),
+        "currency": currencies[0] if len(currencies) == 1 else None
+    }
+    if len(currencies) > 1:
+        summary["by_currency"] = {
+            currency: {
+                "total_income": to_number(income),
+                "total_spent": to_number(spent),
+                "net_amount": to_number(income - spent)
+            }
+            for currency, (income, spent) in by_currency.items()
+        }
+
+    return {
+        "summary": summary,
+        "categories": {
+            name: {"count": count, "total_amount": to_number(total)} for name, (total, count) in categories.items()
+        },
+        "top_categories": [
+            {"category": name, "amount": to_number(total), "count": count} for name, (total, count) in ranked
+        ]
+    }
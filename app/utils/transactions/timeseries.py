@@ -0,0 +1,118 @@
+from datetime import date
+import numpy as np
+from app.utils.transactions.money import currency_exponent
+
+GRANULARITIES = ("day", "week", "month")
+# Most buckets a requested date range may span (about ten years of days)
+MAX_PERIODS = 3660
+
+
+def parse_month(value):
+    """"YYYY-MM" → first day of that month (None when missing); raises ValueError when malformed"""
+    if not value:
+        return None
+    year, month = value.split("-")
+    return date(int(year), int(month), 1)
+
+
+def bucket_starts(dates, granularity):
+    """First day of the day/ISO week/month each datetime64[D] date falls in"""
+    if granularity == "day":
+        return dates
+    if granularity == "week":
+        # 1970-01-01 was a Thursday, so (days + 3) % 7 is the offset from Monday
+        days = dates.astype(np.int64)
+        return (days - (days + 3) % 7).astype("datetime64[D]")
+    return dates.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def period_count(date_from, date_to, granularity) -> int:
+    """How many buckets the dates `date_from`..`date_to` span, without building them"""
+    if granularity == "month":
+        return (date_to.year - date_from.year) * 12 + date_to.month - date_from.month + 1
+    if granularity == "week":
+        first = date_from.toordinal() - date_from.weekday()
+        last = date_to.toordinal() - date_to.weekday()
+        return (last - first) // 7 + 1
+    return (date_to - date_from).days + 1
+
+
+def _axis(starts, granularity, date_from=None, date_to=None):
+    """Bucket starts covering the data and the requested date_from..date_to"""
+    first, last = starts.min(), starts.max()
+    if date_from is not None:
+        first = min(first, bucket_starts(np.array([date_from], dtype="datetime64[D]"), granularity)[0])
+    if date_to is not None:
+        last = max(last, bucket_starts(np.array([date_to], dtype="datetime64[D]"), granularity)[0])
+    return period_range(first, last, granularity)
+
+
+def period_range(first, last, granularity):
+    """Every bucket start from `first` to `last`, so charts get a continuous axis"""
+    if granularity == "month":
+        return np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    step = 7 if granularity == "week" else 1
+    return np.arange(first, last + 1, step)
+
+
+def _points(periods, income, spent, counts, currency):
+    unit = 10 ** currency_exponent(currency)
+    return [
+        {
+            "period": str(period),
+            "income": int(period_income) / unit,
+            "spent": int(period_spent) / unit,
+            "net": int(period_income - period_spent) / unit,
+            "count": int(count)
+        }
+        for period, period_income, period_spent, count in zip(periods.tolist(), income, spent, counts)
+    ]
+
+
+def build_timeseries(dates, amounts_minor, currencies, granularity, date_from=None, date_to=None) -> dict:
+    """{currency: [points]} of income/spent/net/count per bucket, gaps filled with zeros
+
+    `dates` is datetime64[D], `amounts_minor` int64 and `currencies` a list of
+    ISO codes, one per row. Rows without a date are left out. The axis spans
+    the requested `date_from`..`date_to` as well as the data.
+    """
+    series = {}
+    dated = ~np.isnat(dates)
+    currency_array = np.asarray(currencies, dtype=object)
+    for currency in sorted(set(currencies)):
+        mask = dated & (currency_array == currency)
+        if not mask.any():
+            continue
+        starts = bucket_starts(dates[mask], granularity)
+        amounts = amounts_minor[mask]
+        periods = _axis(starts, granularity, date_from, date_to)
+        slots = np.searchsorted(periods, starts)
+
+        income = np.zeros(len(periods), dtype=np.int64)
+        spent = np.zeros(len(periods), dtype=np.int64)
+        np.add.at(income, slots, np.where(amounts > 0, amounts, 0))
+        np.add.at(spent, slots, np.where(amounts < 0, -amounts, 0))
+        counts = np.bincount(slots, minlength=len(periods))
+        series[currency] = _points(periods, income, spent, counts, currency)
+    return series
+
+
+def timeseries_from_rollups(rollups, date_from=None, date_to=None) -> dict:
+    """Monthly {currency: [points]} straight from category rollup rows, spanning date_from..date_to too"""
+    by_currency = {}
+    for rollup in rollups:
+        by_currency.setdefault(rollup.currency, []).append(rollup)
+
+    series = {}
+    for currency, rows in sorted(by_currency.items()):
+        months = np.array([row.month for row in rows], dtype="datetime64[D]")
+        periods = _axis(months, "month", date_from, date_to)
+        slots = np.searchsorted(periods, months)
+        income = np.zeros(len(periods), dtype=np.int64)
+        spent = np.zeros(len(periods), dtype=np.int64)
+        counts = np.zeros(len(periods), dtype=np.int64)
+        np.add.at(income, slots, np.array([row.income_minor for row in rows], dtype=np.int64))
+        np.add.at(spent, slots, np.array([row.spent_minor for row in rows], dtype=np.int64))
+        np.add.at(counts, slots, np.array([row.count for row in rows], dtype=np.int64))
+        series[currency] = _points(periods, income, spent, counts, currency)
+    return series
@@ -0,0 +1,275 @@
+import base64
+import binascii
+import json
+import numpy as np
+from app.utils.transactions.money import parse_minor_units
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_SORT = "-abs_amount"
+SORT_FIELDS = ("date", "amount", "abs_amount")
+VIEWS = ("summary", "categories", "full")
+# Top-level response parts each view builds; "full" adds the per-category transaction lists
+VIEW_PARTS = {
+    "summary": ("summary", "top_categories"),
+    "categories": ("summary", "top_categories", "categories"),
+    "full": ("summary", "top_categories", "categories", "transactions"),
+}
+RESPONSE_FIELDS = (
+    "total_count", "requisitions_processed", "failed_requisitions", "processing_time_seconds", "banks", "duplicates",
+    "summary", "categories", "top_categories", "transactions", "next_cursor", "limit", "sort"
+)
+TRANSACTION_FIELDS = ("id", "amount", "currency", "date", "description", "company", "category")
+# Always returned so clients can tell partial or empty results apart
+ALWAYS_RETURNED = ("message", "warning")
+QUERY_PARAMS = ("date_from", "date_to", "category", "min_amount", "max_amount", "merchant", "sort", "limit", "cursor")
+
+# Stands in for a missing booking date so it can still be ordered and negated
+MISSING_DATE_KEY = -(2 ** 40)
+
+
+class TransactionQueryError(ValueError):
+    """Raised for query parameters that cannot be applied"""
+
+
+def encode_cursor(sort: str, key: int, tie: str) -> str:
+    payload = json.dumps([sort, int(key), tie], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str):
+    """Return the (key, tie) a page ended at; the cursor must come from the same sort"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key, tie = json.loads(payload)
+    except (binascii.Error, ValueError, TypeError):
+        raise TransactionQueryError("Invalid cursor")
+    if cursor_sort != sort or not isinstance(key, int) or not isinstance(tie, str):
+        raise TransactionQueryError("Cursor does not match this query")
+    return key, tie
+
+
+def _parse_date(value, name):
+    try:
+        return np.datetime64(value, "D")
+    except ValueError:
+        raise TransactionQueryError(f"{name} must be a YYYY-MM-DD date")
+
+
+def _tie(record) -> str:
+    """Stable tie-breaker for rows with the same sort key"""
+    return record.id or f"{record.booking_date}|{record.amount_minor}|{record.company}"
+
+
+class TransactionQuery:
+    """Filters, sort order and keyset page requested for the transactions endpoint"""
+
+    def __init__(self, date_from=None, date_to=None, categories=None, min_amount=None, max_amount=None,
+                 merchant=None, sort=DEFAULT_SORT, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.categories = categories
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.merchant = merchant
+        self.sort = sort
+        self.limit = limit
+        self.cursor = decode_cursor(cursor, sort) if cursor else None
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a query from request args; raises TransactionQueryError for bad values"""
+        sort = args.get("sort") or DEFAULT_SORT
+        if sort.lstrip("-") not in SORT_FIELDS:
+            raise TransactionQueryError(f"sort must be one of {', '.join(SORT_FIELDS)} (prefix with - for descending)")
+
+        try:
+            limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise TransactionQueryError("limit must be an integer")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise TransactionQueryError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        for name in ("min_amount", "max_amount"):
+            if args.get(name) and parse_minor_units(args[name]) is None:
+                raise TransactionQueryError(f"{name} must be a number")
+
+        categories = args.get("category")
+        return cls(
+            date_from=_parse_date(args["date_from"], "date_from") if args.get("date_from") else None,
+            date_to=_parse_date(args["date_to"], "date_to") if args.get("date_to") else None,
+            categories={name.strip() for name in categories.split(",") if name.strip()} if categories else None,
+            min_amount=args.get("min_amount") or None,
+            max_amount=args.get("max_amount") or None,
+            merchant=(args.get("merchant") or "").strip().lower() or None,
+            sort=sort,
+            limit=limit,
+            cursor=args.get("cursor")
+        )
+
+    @staticmethod
+    def requested(args) -> bool:
+        """True when the request uses any filter or paging parameter"""
+        return any(name in args for name in QUERY_PARAMS)
+
+    def matching_rows(self, records, columns):
+        """Indices of the rows that pass every filter (amount bounds apply to the absolute amount)"""
+        mask = np.ones(len(columns), dtype=bool)
+        if self.date_from is not None:
+            mask &= columns.date >= self.date_from
+        if self.date_to is not None:
+            mask &= columns.date <= self.date_to
+        if self.categories is not None:
+            wanted = [code for code, name in enumerate(columns.category_names) if name in self.categories]
+            mask &= np.isin(columns.category_code, wanted)
+        if self.min_amount is not None or self.max_amount is not None:
+            magnitude = np.abs(columns.amount_minor)
+            if self.min_amount is not None:
+                mask &= magnitude >= abs(parse_minor_units(self.min_amount, exponent=columns.exponent))
+            if self.max_amount is not None:
+                mask &= magnitude <= abs(parse_minor_units(self.max_amount, exponent=columns.exponent))
+
+        rows = np.flatnonzero(mask)
+        if self.merchant:
+            # The only per-row string work, done on the rows that survived the array filters
+            merchant = self.merchant
+            rows = np.array(
+                [row for row in rows.tolist() if merchant in (records[row].company or "").lower()],
+                dtype=np.int64
+            )
+        return rows
+
+    def sort_keys(self, columns):
+        """int64 keys whose ascending order is the requested order"""
+        field = self.sort.lstrip("-")
+        if field == "date":
+            keys = np.where(np.isnat(columns.date), MISSING_DATE_KEY, columns.date.astype(np.int64))
+        elif field == "amount":
+            keys = columns.amount_minor
+        else:
+            keys = np.abs(columns.amount_minor)
+        return -keys if self.sort.startswith("-") else keys
+
+    def page(self, records, columns, rows):
+        """Return (page row indices, next cursor) for the rows after the cursor
+
+        Only rows that can land on this page are fully ordered: the key
+        threshold comes from np.partition, and tie-breakers are built for
+        those rows alone.
+        """
+        keys = self.sort_keys(columns)[rows]
+
+        if self.cursor is not None:
+            cursor_key, cursor_tie = self.cursor
+            after = keys > cursor_key
+            for position in np.flatnonzero(keys == cursor_key).tolist():
+                after[position] = _tie(records[rows[position]]) > cursor_tie
+            rows, keys = rows[after], keys[after]
+
+        has_more = len(rows) > self.limit
+        if has_more:
+            threshold = np.partition(keys, self.limit - 1)[self.limit - 1]
+            candidates = keys <= threshold
+            rows, keys = rows[candidates], keys[candidates]
+
+        ties = np.array([_tie(records[row]) for row in rows.tolist()], dtype=str)
+        order = np.lexsort((ties, keys))[:self.limit]
+        page_rows = rows[order]
+
+        next_cursor = None
+        if has_more and len(order):
+            last = order[-1]
+            next_cursor = encode_cursor(self.sort, keys[last], str(ties[last]))
+        return page_rows, next_cursor
+
+    def record_key(self, record) -> int:
+        """The sort key of one record (sort_keys for a single row, amounts in its own minor units)"""
+        field = self.sort.lstrip("-")
+        if field == "date":
+            try:
+                day = np.datetime64(record.booking_date or "NaT", "D")
+            except ValueError:
+                day = np.datetime64("NaT")
+            key = MISSING_DATE_KEY if np.isnat(day) else int(day.astype(np.int64))
+        elif field == "amount":
+            key = record.amount_minor or 0
+        else:
+            key = abs(record.amount_minor or 0)
+        return -key if self.sort.startswith("-") else key
+
+    def after_cursor(self, record) -> bool:
+        """True when `record` comes after the cursor (always, without one)"""
+        return self.cursor is None or (self.record_key(record), _tie(record)) > self.cursor
+
+    def page_records(self, records):
+        """Return (page records, next cursor) like page(), for candidate records read from storage
+
+        `records` must include every matching record after the cursor up to
+        the last one on the page, plus one more when there is a next page.
+        """
+        keyed = [(self.record_key(record), _tie(record), record) for record in records if self.after_cursor(record)]
+        keyed.sort(key=lambda entry: entry[:2])
+
+        page = keyed[:self.limit]
+        next_cursor = None
+        if len(keyed) > self.limit:
+            key, tie, _ = page[-1]
+            next_cursor = encode_cursor(self.sort, key, tie)
+        return [record for _, _, record in page], next_cursor
+
+
+class ResponseView:
+    """Which parts of the transactions response to build (`view=`) and return (`fields=`)
+
+    `fields` takes top-level keys ("summary,banks") and transaction attributes
+    prefixed with "transactions." ("transactions.id,transactions.amount").
+    """
+
+    def __init__(self, view=None, fields=None, transaction_fields=None):
+        self.view = view
+        self.fields = fields
+        self.transaction_fields = transaction_fields
+
+    @classmethod
+    def from_args(cls, args):
+        view = args.get("view") or None
+        if view is not None and view not in VIEWS:
+            raise TransactionQueryError(f"view must be one of {', '.join(VIEWS)}")
+
+        fields = None
+        transaction_fields = None
+        if args.get("fields"):
+            fields = []
+            transaction_fields = []
+            for name in (name.strip() for name in args["fields"].split(",")):
+                if not name:
+                    continue
+                if name.startswith("transactions."):
+                    attribute = name.split(".", 1)[1]
+                    if attribute not in TRANSACTION_FIELDS:
+                        raise TransactionQueryError(f"Unknown transaction field: {attribute}")
+                    transaction_fields.append(attribute)
+                    name = "transactions"
+                elif name not in RESPONSE_FIELDS:
+                    raise TransactionQueryError(f"Unknown field: {name}")
+                if name not in fields:
+                    fields.append(name)
+            transaction_fields = transaction_fields or None
+
+        return cls(view=view, fields=fields, transaction_fields=transaction_fields)
+
+    def wants(self, part: str) -> bool:
+        """True when `part` should be built and returned for this response"""
+        if self.view is not None and part in VIEW_PARTS["full"] and part not in VIEW_PARTS[self.view]:
+            return False
+        return self.fields is None or part in self.fields
+
+    def category_transactions(self, paged: bool) -> bool:
+        """Embed transactions under each category (legacy default, unless paging or a slimmer view)"""
+        if not self.wants("categories"):
+            return False
+        return self.view == "full" if self.view is not None or paged else True
+
+    def apply(self, response: dict) -> dict:
+        """Drop every top-level key the client did not ask for"""
+        return {key: value for key, value in response.items() if key in ALWAYS_RETURNED or self.wants(key)}
@@ -0,0 +1,101 @@
+import hashlib
+from app.utils.transactions.category_cache import normalize_counterparty
+from app.utils.transactions.money import DEFAULT_CURRENCY, format_amount, parse_minor_units
+
+
+class TransactionRecord:
+    """Compact transaction used from Nordigen parsing through categorization and aggregation"""
+
+    __slots__ = ("id", "amount_minor", "currency", "booking_date", "company", "description", "category", "pending",
+                 "category_version", "source")
+
+    def __init__(self, id, amount_minor, currency, booking_date, company, description, category=None, pending=False,
+                 category_version=None, source=None):
+        self.id = id
+        self.amount_minor = amount_minor
+        self.currency = currency
+        self.booking_date = booking_date
+        self.company = company
+        self.description = description
+        self.category = category
+        self.pending = pending
+        self.category_version = category_version  # CategorizerRegistry.version_tag() of whatever set `category`
+        self.source = source  # Account the row was fetched from, when known
+
+    @classmethod
+    def from_nordigen(cls, t):
+        """Parse one raw Nordigen transaction (amount parsed once into minor units)"""
+        company = t.get("creditorName",'') or t.get("debtorName", '')
+        description = t.get("remittanceInformationUnstructured", '') or t.get("remittanceInformationStructured", '')
+        transaction_amount = t.get("transactionAmount") or {}
+        amount = transaction_amount.get("amount", '') if isinstance(transaction_amount, dict) else transaction_amount
+        currency = (transaction_amount.get("currency") if isinstance(transaction_amount, dict) else None) or DEFAULT_CURRENCY
+        return cls(
+            t.get("transactionId", '') or t.get("internalTransactionId", ''),
+            parse_minor_units(amount, currency),
+            currency,
+            t.get("bookingDate", '') or t.get("valueDate", ''),
+            company,
+            description,
+            pending=t.get("bookingStatus") == "pending",
+            source=t.get("sourceAccount")
+        )
+
+    @property
+    def amount(self) -> str:
+        """Fixed-point amount string, formatted on demand for responses"""
+        return format_amount(self.amount_minor, self.currency) if self.amount_minor is not None else ''
+
+    def dedupe_key(self, occurrence=0) -> str:
+        """Digest identifying this transaction across syncs: the bank's id, or its content
+
+        `occurrence` tells apart id-less rows with the same content (two
+        identical tickets bought the same day): the first keeps the plain
+        content key, the n-th repeat gets its own.
+        """
+        return self.id_key() if self.id else self.content_key(occurrence)
+
+    def id_key(self) -> str:
+        return hashlib.sha1(f"id:{self.id}".encode()).hexdigest()
+
+    def counterparty(self) -> str:
+        """Normalized company, or description when there is no company"""
+        return normalize_counterparty(self.company) or normalize_counterparty(self.description)
+
+    def merchant_key(self):
+        """Digest of the normalized counterparty (groups a merchant's payments without storing its name)
+
+        None when there is no counterparty, so nameless payments are not all grouped together.
+        """
+        counterparty = self.counterparty()
+        return hashlib.sha1(f"m:{counterparty}".encode()).hexdigest() if counterparty else None
+
+    def content_key(self, occurrence=0) -> str:
+        """Digest of the date, amount, currency and normalized counterparty"""
+        content = f"tx:{self.booking_date}|{self.amount_minor}|{self.currency}|{self.counterparty()}"
+        if occurrence:
+            content = f"{content}|{occurrence}"
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def to_dict(self, fields=None) -> dict:
+        """Response dict; `fields` limits it to those keys (in the order given)"""
+        if fields is not None:
+            full = self.to_dict()
+            return {name: full[name] for name in fields}
+        return {
+            "id": self.id,
+            "amount": self.amount,
+            "currency": self.currency,
+            "date": self.booking_date,
+            "description": self.description,
+            "company": self.company,
+            "category": self.category
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, TransactionRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"<TransactionRecord(id={self.id}, amount={self.amount} {self.currency}, category={self.category})>"
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+from app.config import CATEGORY_CACHE_DIR
+from app.utils.email_encryption import email_encryption  # Reuse existing encryption
+from app.utils.transactions.merchant_registry import categorizer_registry
+
+
+def _snapshot_path(user_id):
+    return os.path.join(CATEGORY_CACHE_DIR, f"{user_id}.cache")
+
+
+def _read_snapshot(user_id):
+    path = _snapshot_path(user_id)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as snapshot_file:
+        return json.loads(email_encryption.decrypt(snapshot_file.read()))
+
+
+def _write_snapshot(user_id, snapshot):
+    os.makedirs(CATEGORY_CACHE_DIR, exist_ok=True)
+    path = _snapshot_path(user_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as snapshot_file:
+        snapshot_file.write(email_encryption.encrypt(json.dumps(snapshot)))  # 🔐 Counterparties are personal data
+    os.replace(tmp_path, path)
+
+
+async def warm_user_category_cache(user_id):
+    """Load a user's saved categorization results into each country's cache (no-op unless CATEGORY_CACHE_DIR is set)"""
+    if not CATEGORY_CACHE_DIR or not user_id:
+        return 0
+    try:
+        snapshot = await asyncio.to_thread(_read_snapshot, user_id)
+        if not snapshot:
+            return 0
+        # Snapshots from before per-country sections hold the default country's results
+        countries = snapshot.get("countries") or {categorizer_registry.default_country: snapshot}
+        loaded = 0
+        for country, section in countries.items():
+            loaded += categorizer_registry.get(country).warm_cache(section.get("entries", []), section.get("version"))
+        print(f"♻️ Warmed category cache with {loaded} entries for user {user_id}")
+        return loaded
+    except Exception as e:
+        print(f"❌ Failed to load category cache for user {user_id}: {e}")
+        return 0
+
+
+async def persist_user_category_cache(user_id, records):
+    """Save the cached categorization results for `records` so the next sync starts warm
+
+    Each record's results come from the categorizer of the country it was
+    categorized for (read from its version tag), kept in its own section.
+    """
+    if not CATEGORY_CACHE_DIR or not user_id:
+        return
+    try:
+        by_country = {}
+        for record in records:
+            by_country.setdefault(categorizer_registry.country_of_version_tag(record.category_version), []).append(record)
+        countries = {}
+        for country, country_records in by_country.items():
+            country_categorizer = categorizer_registry.get(country)
+            countries[country] = {
+                "version": country_categorizer.version, "entries": country_categorizer.cached_entries(country_records)
+            }
+        snapshot = {"countries": countries}
+        await asyncio.to_thread(_write_snapshot, user_id, snapshot)
+    except Exception as e:
+        print(f"❌ Failed to save category cache for user {user_id}: {e}")
@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+from app.config import CATEGORIZATION_THREAD_THRESHOLD, USER_RULES_CACHE_SIZE
+from app.database.methods.get_category_rules import get_category_rules
+from app.utils.transactions.category_cache import MISSING, CategoryCache, normalize_counterparty
+from app.utils.transactions.merchant_matcher import MerchantMatcher
+
+
+def rules_version(rules) -> str:
+    """Short digest of a user's rules; changes whenever a rule is added, edited or removed"""
+    return hashlib.sha1(repr(tuple(rules)).encode()).hexdigest()[:12]
+
+
+class UserRuleMatcher:
+    """A user's categorization rules compiled once and layered over the global categorizer.
+
+    `rules` are (pattern, match_type, category, priority) tuples, highest priority
+    first. "exact" rules compare the normalized counterparty, "keyword" rules use
+    the same boundary-aware Aho-Corasick matching as the merchant dictionary.
+    When several rules match, the highest-priority one wins.
+    """
+
+    def __init__(self, rules):
+        self.rule_count = len(rules)
+        self._exact = {}
+        self._keyword_rank = {}
+        keywords = {}
+        for rank, (pattern, match_type, category, _) in enumerate(rules):
+            if match_type == "exact":
+                self._exact.setdefault(normalize_counterparty(pattern), (rank, category))
+                continue
+            keyword = (pattern or "").lower().strip()
+            if keyword and keyword not in keywords:
+                keywords[keyword] = category
+                self._keyword_rank[keyword] = rank
+        self._matcher = MerchantMatcher(keywords) if keywords else None
+
+    def match(self, company, description):
+        """Category of the highest-priority matching rule, or None"""
+        best = None
+        for field in (company, description):
+            hit = self._exact.get(normalize_counterparty(field)) if field else None
+            if hit and (best is None or hit < best):
+                best = hit
+        if self._matcher is not None:
+            text = f"{company or ''} {description or ''}".lower().strip()
+            for _, _, keyword, category in self._matcher.find_all(text):
+                hit = (self._keyword_rank[keyword], category)
+                if best is None or hit < best:
+                    best = hit
+        return best[1] if best else None
+
+    def apply(self, records, categories) -> list:
+        """Override `categories` wherever a rule matches the corresponding record"""
+        match = self.match
+        overridden = []
+        for record, category in zip(records, categories):
+            override = match(record.company, record.description)
+            overridden.append(category if override is None else override)
+        return overridden
+
+
+# Compiled matchers keyed by (user_id, rules_version); stale versions simply age out
+user_rule_matchers = CategoryCache(USER_RULES_CACHE_SIZE)
+
+
+def compile_user_rules(user_id, rules):
+    """Return the cached UserRuleMatcher for these rules, compiling it on first use"""
+    if not rules:
+        return None
+    key = (user_id, rules_version(rules))
+    matcher = user_rule_matchers.get(key)
+    if matcher is MISSING:
+        matcher = UserRuleMatcher(rules)
+        user_rule_matchers.put(key, matcher)
+    return matcher
+
+
+async def get_user_rule_matcher(user_id):
+    """Load a user's rules and return their compiled matcher (None when there are no rules)"""
+    if not user_id:
+        return None
+    try:
+        rows = await get_category_rules(user_id)
+    except Exception as e:
+        print(f"❌ Failed to load category rules for user {user_id}: {e}")
+        return None
+    rules = [(row.pattern, row.match_type, row.category, row.priority) for row in rows]
+    return compile_user_rules(user_id, rules)
+
+
+async def apply_user_rules(matcher, records, categories) -> list:
+    """Apply a user's rules to a categorized batch without blocking the event loop"""
+    if matcher is None:
+        return categories
+    if len(records) < CATEGORIZATION_THREAD_THRESHOLD:
+        return matcher.apply(records, categories)
+    return await asyncio.to_thread(matcher.apply, records, categories)
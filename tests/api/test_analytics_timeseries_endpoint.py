@@ -0,0 +1,100 @@
+import pytest
+import pytest_asyncio
+from app.database.models.user_model import User
+from app.database.methods import get_category_rollups as get_category_rollups_module
+from app.database.methods import get_transaction_amounts as get_transaction_amounts_module
+from app.database.methods import get_user_id as get_user_id_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods.save_transactions import save_transactions
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+EMAIL = "analytics@example.com"
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def analytics_user(test_db, monkeypatch):
+    for module in (get_user_id_module, save_transactions_module, get_category_rollups_module,
+                   get_transaction_amounts_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        user = User(email=EMAIL)
+        session.add(user)
+        await session.commit()
+    await save_transactions(user.id, [
+        record("Kaufland", amount="-120.50", category="Groceries", date="2024-03-04", id="t1"),
+        record("Lidl", amount="-30.00", category="Groceries", date="2024-03-10", id="t2"),
+        record("Employer SRL", amount="6500.00", category="Salary", date="2024-03-25", id="t3"),
+        record("Bolt", amount="-18.20", category="Transport", date="2024-05-02", id="t4"),
+    ])
+    return user
+
+
+class TestAnalyticsTimeseriesEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_monthly_from_rollups(self, test_client, analytics_user, auth_headers):
+        """Test whole-month series are served from the rollups"""
+        response = await test_client.get(f'/analytics/timeseries?email={EMAIL}', headers=auth_headers)
+        data = await response.get_json()
+
+        assert response.status_code == 200
+        assert data["source"] == "rollups"
+        assert [(p["period"], p["spent"]) for p in data["series"]["RON"]] == [
+            ("2024-03-01", 150.5), ("2024-04-01", 0.0), ("2024-05-01", 18.2)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_weekly_by_category(self, test_client, analytics_user, auth_headers):
+        """Test weekly buckets over stored transactions with a category filter"""
+        response = await test_client.get(
+            f'/analytics/timeseries?email={EMAIL}&granularity=week&category=Groceries', headers=auth_headers
+        )
+        data = await response.get_json()
+
+        assert data["source"] == "transactions"
+        assert [(p["period"], p["spent"]) for p in data["series"]["RON"]] == [("2024-03-04", 150.5)]
+
+    @pytest.mark.asyncio
+    async def test_invalid_granularity(self, test_client, analytics_user, auth_headers):
+        """Test unknown granularities are rejected"""
+        response = await test_client.get(f'/analytics/timeseries?email={EMAIL}&granularity=hour', headers=auth_headers)
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_requested_range_is_zero_filled(self, test_client, analytics_user, auth_headers):
+        """Test months of the requested range without transactions still appear, on both paths"""
+        for date_to, source in (("2024-06-30", "rollups"), ("2024-06-15", "transactions")):
+            response = await test_client.get(
+                f'/analytics/timeseries?email={EMAIL}&date_from=2024-02-01&date_to={date_to}', headers=auth_headers
+            )
+            data = await response.get_json()
+
+            assert data["source"] == source
+            assert [p["period"] for p in data["series"]["RON"]] == [
+                "2024-02-01", "2024-03-01", "2024-04-01", "2024-05-01", "2024-06-01"
+            ]
+
+    @pytest.mark.asyncio
+    async def test_far_dates_are_rejected_not_crashed(self, test_client, analytics_user, auth_headers):
+        """Test the last representable date and ranges too long to fill are a 400, not a 500"""
+        for query in ("date_to=9999-12-31", "date_from=2024-01-01&date_to=9999-12-31&granularity=day",
+                      "date_from=2024-05-01&date_to=2024-03-01"):
+            response = await test_client.get(f'/analytics/timeseries?email={EMAIL}&{query}', headers=auth_headers)
+            assert response.status_code == 400
+
+        response = await test_client.get(
+            f'/analytics/timeseries?email={EMAIL}&date_from=2024-03-01&date_to=2024-12-31', headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert len((await response.get_json())["series"]["RON"]) == 10
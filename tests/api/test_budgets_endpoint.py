@@ -0,0 +1,117 @@
+from datetime import datetime, timezone
+import pytest
+import pytest_asyncio
+from app.database.models.user_model import User
+from app.database.methods import get_user_id as get_user_id_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods.save_transactions import store_transactions
+from app.neutral_end_points import budgets as budgets_module
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+EMAIL = "budgets@example.com"
+TODAY = datetime.now(timezone.utc).date()
+
+
+def record(company="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date or TODAY.isoformat(),
+                             company, "", category)
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def budget_user(test_db, monkeypatch):
+    for module in (get_user_id_module, save_transactions_module, budgets_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        user = User(email=EMAIL)
+        session.add(user)
+        await session.commit()
+    return user
+
+
+async def set_budget(test_client, auth_headers, **payload):
+    return await test_client.post('/budgets', json={"email": EMAIL, **payload}, headers=auth_headers)
+
+
+class TestBudgets:
+
+    @pytest.mark.asyncio
+    async def test_create_and_update_limit(self, test_client, budget_user, auth_headers):
+        """Test posting a budget twice for the same category updates its limit"""
+        created = await set_budget(test_client, auth_headers, category="Groceries", limit="500")
+        updated = await set_budget(test_client, auth_headers, category="Groceries", limit=650.5)
+
+        response = await test_client.get(f'/budgets?email={EMAIL}', headers=auth_headers)
+        budgets = (await response.get_json())["budgets"]
+
+        assert (created.status_code, updated.status_code) == (201, 200)
+        assert [(b["category"], b["currency"], b["limit"]) for b in budgets] == [("Groceries", "RON", 650.5)]
+
+    @pytest.mark.asyncio
+    async def test_sync_raises_each_threshold_once(self, test_client, budget_user, auth_headers):
+        """Test alerts fire when a sync crosses 80% and 100% of the limit, and never repeat"""
+        await set_budget(test_client, auth_headers, category="Groceries", limit="100")
+
+        await store_transactions(budget_user.id, [record("Kaufland", "-50", category="Groceries", id="a")])
+        first = await store_transactions(budget_user.id, [record("Lidl", "-35", category="Groceries", id="b")])
+        await store_transactions(budget_user.id, [record("Mega", "-30", category="Groceries", id="c")])
+        await store_transactions(budget_user.id, [record("Mega", "-5", category="Groceries", id="d")])
+
+        response = await test_client.get(f'/budgets?email={EMAIL}', headers=auth_headers)
+        budget = (await response.get_json())["budgets"][0]
+
+        assert len(first) == 1
+        assert budget["spent"] == 120.0
+        assert budget["remaining"] == -20.0
+        assert budget["percent_used"] == 120.0
+        assert [alert["threshold"] for alert in budget["alerts"]] == [0.8, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_other_categories_and_past_months_ignored(self, test_client, budget_user, auth_headers):
+        """Test spending outside the budget's category or the current month raises no alert"""
+        await set_budget(test_client, auth_headers, category="Groceries", limit="100")
+
+        await store_transactions(budget_user.id, [
+            record("Netflix", "-200", category="Streaming", id="a"),
+            record("Kaufland", "-150", category="Groceries", date="2020-01-15", id="b")
+        ])
+
+        response = await test_client.get(f'/budgets?email={EMAIL}', headers=auth_headers)
+        budget = (await response.get_json())["budgets"][0]
+
+        assert budget["spent"] == 0.0
+        assert budget["alerts"] == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_limit(self, test_client, budget_user, auth_headers):
+        """Test zero, negative and non-numeric limits are rejected"""
+        for limit in ("0", "-10", "abc", "²", None):
+            response = await set_budget(test_client, auth_headers, category="Groceries", limit=limit)
+            assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_delete(self, test_client, budget_user, auth_headers):
+        """Test deleting a budget removes it and its alerts"""
+        created = await set_budget(test_client, auth_headers, category="Groceries", limit="10")
+        budget_id = (await created.get_json())["budget"]["id"]
+        await store_transactions(budget_user.id, [record("Kaufland", "-20", category="Groceries", id="a")])
+
+        deleted = await test_client.delete(f'/budgets/{budget_id}?email={EMAIL}', headers=auth_headers)
+        missing = await test_client.delete(f'/budgets/{budget_id}?email={EMAIL}', headers=auth_headers)
+        response = await test_client.get(f'/budgets?email={EMAIL}', headers=auth_headers)
+
+        assert deleted.status_code == 200
+        assert missing.status_code == 404
+        assert (await response.get_json())["budgets"] == []
+
+    @pytest.mark.asyncio
+    async def test_bad_month(self, test_client, budget_user, auth_headers):
+        """Test a malformed month is rejected"""
+        response = await test_client.get(f'/budgets?email={EMAIL}&month=2024-13', headers=auth_headers)
+        assert response.status_code == 400
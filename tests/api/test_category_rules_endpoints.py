@@ -0,0 +1,73 @@
+import pytest
+import pytest_asyncio
+from app.database.models.user_model import User
+from app.database.methods import get_user_id as get_user_id_module
+from app.neutral_end_points import category_rules as category_rules_module
+from app.utils.security.jwt_utils import jwt_manager
+
+EMAIL = "rules@example.com"
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def rules_db(test_db, monkeypatch):
+    monkeypatch.setattr(category_rules_module, "AsyncSessionLocal", test_db)
+    monkeypatch.setattr(get_user_id_module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        session.add(User(email=EMAIL))
+        await session.commit()
+    return test_db
+
+
+class TestCategoryRulesEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_requires_token(self, test_client):
+        """Test rules endpoints are protected by JWT"""
+        response = await test_client.get(f'/category-rules?email={EMAIL}')
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_create_list_update_delete(self, test_client, rules_db, auth_headers):
+        """Test the full rule lifecycle"""
+        response = await test_client.post('/category-rules', headers=auth_headers, json={
+            "email": EMAIL, "pattern": "Glovo", "category": "Eating Out", "priority": 5
+        })
+        assert response.status_code == 201
+        rule = (await response.get_json())["rule"]
+        assert rule["match_type"] == "keyword"
+
+        response = await test_client.get(f'/category-rules?email={EMAIL}', headers=auth_headers)
+        assert [r["pattern"] for r in (await response.get_json())["rules"]] == ["Glovo"]
+
+        response = await test_client.put(f'/category-rules/{rule["id"]}', headers=auth_headers, json={
+            "email": EMAIL, "category": "Delivery"
+        })
+        assert response.status_code == 200
+        assert (await response.get_json())["rule"]["category"] == "Delivery"
+
+        response = await test_client.delete(f'/category-rules/{rule["id"]}?email={EMAIL}', headers=auth_headers)
+        assert response.status_code == 200
+
+        response = await test_client.get(f'/category-rules?email={EMAIL}', headers=auth_headers)
+        assert (await response.get_json())["rules"] == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_match_type(self, test_client, rules_db, auth_headers):
+        """Test unknown match types are rejected"""
+        response = await test_client.post('/category-rules', headers=auth_headers, json={
+            "email": EMAIL, "pattern": "Glovo", "category": "Food", "match_type": "regex"
+        })
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_unknown_rule(self, test_client, rules_db, auth_headers):
+        """Test updating a rule that does not exist returns 404"""
+        response = await test_client.put('/category-rules/not-a-uuid', headers=auth_headers, json={
+            "email": EMAIL, "category": "Food"
+        })
+        assert response.status_code == 404
@@ -0,0 +1,129 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+import pytest_asyncio
+from app.database.models.user_model import User
+from app.database.methods import get_user_id as get_user_id_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods import stream_transactions as stream_transactions_module
+from app.database.methods.save_transactions import save_transactions, store_transactions
+from app.database.methods.stream_transactions import stream_transactions
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+EMAIL = "export@example.com"
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def export_user(test_db, monkeypatch):
+    for module in (get_user_id_module, save_transactions_module, stream_transactions_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        user = User(email=EMAIL)
+        session.add(user)
+        await session.commit()
+    await save_transactions(user.id, [
+        record("Kaufland", "Card 1234", "-120.50", category="Groceries", date="2024-03-01", id="t1"),
+        record("=HYPERLINK()", "", "-5.00", category="Shopping", date="2024-03-02", id="t2"),
+        record("Employer SRL", "Salariu", "6500.00", category="Salary", date="2024-04-05", id="t3"),
+    ])
+    return user
+
+
+class TestSaveAndStreamTransactions:
+
+    @pytest.mark.asyncio
+    async def test_save_skips_known_transactions(self, export_user):
+        """Test re-syncing the same transactions stores nothing new"""
+        added = await save_transactions(export_user.id, [
+            record("Kaufland", "Card 1234", "-120.50", category="Groceries", date="2024-03-01", id="t1"),
+            record("Bolt", "", "-18.00", category="Transport", date="2024-03-03", id="t4"),
+        ])
+        assert added == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_purchases_without_ids_are_all_stored(self, export_user):
+        """Test two id-less tickets with the same content are two rows, and stay two on re-sync"""
+        tickets = [record("STB", "Bilet", "-3.00", category="Transport", date="2024-03-04") for _ in range(2)]
+
+        assert await save_transactions(export_user.id, tickets) == 2
+        assert await save_transactions(export_user.id, tickets) == 0
+
+    @pytest.mark.asyncio
+    async def test_database_errors_are_raised(self, export_user, monkeypatch):
+        """Test a failed store surfaces to the caller instead of looking like an empty sync"""
+        def broken_session():
+            raise OSError("database unavailable")
+        monkeypatch.setattr(save_transactions_module, "AsyncSessionLocal", broken_session)
+
+        with pytest.raises(OSError):
+            await store_transactions(export_user.id, [record("Bolt", "", "-18.00", date="2024-03-03", id="t4")])
+
+    @pytest.mark.asyncio
+    async def test_stream_in_small_batches(self, export_user):
+        """Test keyset batches cover every row once in date order"""
+        batches = [batch async for batch in stream_transactions(export_user.id, batch_size=2)]
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [row.transaction_id for batch in batches for row in batch] == ["t1", "t2", "t3"]
+
+    @pytest.mark.asyncio
+    async def test_counterparties_are_encrypted(self, export_user):
+        """Test company names are not stored in clear text"""
+        batches = [batch async for batch in stream_transactions(export_user.id)]
+        row = batches[0][0]
+        assert row.company == "Kaufland"
+        assert row._company != "Kaufland"
+
+
+class TestExportEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_requires_token(self, test_client):
+        """Test the export is protected by JWT"""
+        response = await test_client.get(f'/transactions/export?email={EMAIL}')
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_ndjson_with_date_range(self, test_client, export_user, auth_headers):
+        """Test NDJSON rows are streamed and date filters apply"""
+        response = await test_client.get(
+            f'/transactions/export?email={EMAIL}&date_from=2024-03-01&date_to=2024-03-31', headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+
+        rows = [json.loads(line) for line in (await response.get_data(as_text=True)).splitlines()]
+        assert [row["id"] for row in rows] == ["t1", "t2"]
+        assert rows[0]["amount"] == "-120.50"
+
+    @pytest.mark.asyncio
+    async def test_gzip_csv(self, test_client, export_user, auth_headers):
+        """Test CSV is gzip-compressed on the fly and neutralizes formulas"""
+        response = await test_client.get(
+            f'/transactions/export?email={EMAIL}&format=csv&compression=gzip', headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert 'transactions.csv.gz' in response.headers["Content-Disposition"]
+
+        text = gzip.decompress(await response.get_data()).decode()
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert [row["id"] for row in rows] == ["t1", "t2", "t3"]
+        assert rows[1]["company"] == "'=HYPERLINK()"
+
+    @pytest.mark.asyncio
+    async def test_invalid_format(self, test_client, export_user, auth_headers):
+        """Test unsupported formats are rejected"""
+        response = await test_client.get(f'/transactions/export?email={EMAIL}&format=xlsx', headers=auth_headers)
+        assert response.status_code == 400
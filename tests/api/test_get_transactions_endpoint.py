@@ -0,0 +1,208 @@
+import pytest
+import pytest_asyncio
+from app.database.models.user_model import User
+from app.database.methods import get_category_rules as get_category_rules_module
+from app.database.methods import get_transaction_page as get_transaction_page_module
+from app.database.methods import get_transaction_totals as get_transaction_totals_module
+from app.database.methods import get_user_id as get_user_id_module
+from app.database.methods import refresh_recurring_payments as refresh_recurring_payments_module
+from app.database.methods import save_merchant_aliases as save_merchant_aliases_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods import stream_transactions as stream_transactions_module
+from app.nordingen.end_points import nordingen_get_transactions as endpoint_module
+from app.nordingen.methods.fetch_transactions_with_deadline import STATUS_OK
+from app.utils.email_encryption import email_encryption
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.merchant_aliases import merchant_aliases
+
+EMAIL = "transactions@example.com"
+
+
+def transaction(id, company, amount, date, status="booked"):
+    return {
+        "transactionId": id,
+        "bookingDate": date,
+        "transactionAmount": {"amount": amount, "currency": "RON"},
+        "creditorName": company,
+        "bookingStatus": status
+    }
+
+
+BANK_TRANSACTIONS = [
+    transaction("t1", "Kaufland Cluj", "-120.50", "2024-03-01"),
+    transaction("t2", "Netflix.com", "-45.99", "2024-03-05"),
+    transaction("t3", "Employer SRL", "6500.00", "2024-03-25"),
+    transaction("t4", "Bolt", "-18.20", "2024-04-02"),
+    transaction("t5", "Mega Image", "-75.00", "2024-04-03"),
+    # The same account linked twice, and a pending copy of a payment that has since booked
+    transaction("t1", "Kaufland Cluj", "-120.50", "2024-03-01"),
+    transaction("", "BOLT", "-18.20", "2024-04-02", status="pending"),
+]
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def bank(test_db, monkeypatch):
+    """A user with one linked Romanian bank; returns the list of Nordigen fetches made"""
+    for module in (get_user_id_module, get_category_rules_module, get_transaction_page_module,
+                   get_transaction_totals_module, refresh_recurring_payments_module, save_merchant_aliases_module,
+                   save_transactions_module, stream_transactions_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    monkeypatch.setattr(merchant_aliases, "_admin", {})
+    monkeypatch.setattr(merchant_aliases, "_auto", {})
+    fetches = []
+
+    async def requisition_institutions(email):
+        return {"req-1": "BTRL_BTRLRO22"}
+
+    async def fetch_transactions(requisition_ids):
+        fetches.append(list(requisition_ids))
+        return [{"requisition_id": "req-1", "status": STATUS_OK,
+                 "transactions": [dict(row) for row in BANK_TRANSACTIONS], "payloads": {}}]
+
+    monkeypatch.setattr(endpoint_module, "get_requisition_institutions", requisition_institutions)
+    monkeypatch.setattr(endpoint_module, "fetch_transactions_with_deadline", fetch_transactions)
+    async with test_db() as session:
+        session.add(User(email=EMAIL))
+        await session.commit()
+    return fetches
+
+
+class TestGetTransactionsPaging:
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_come_from_storage(self, test_client, bank, auth_headers):
+        """Test only the first page syncs with the bank and every row is listed exactly once across pages"""
+        url = f'/nordingen-get-transactions?email={EMAIL}&limit=2'
+        response = await test_client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        page = await response.get_json()
+        ids = [row["id"] for row in page["transactions"]]
+
+        while page["next_cursor"]:
+            response = await test_client.get(f'{url}&cursor={page["next_cursor"]}', headers=auth_headers)
+            assert response.status_code == 200
+            page = await response.get_json()
+            assert page["total_count"] == 5
+            ids.extend(row["id"] for row in page["transactions"])
+
+        assert ids == ["t3", "t1", "t5", "t2", "t4"]
+        assert len(bank) == 1
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_keeps_filters(self, test_client, bank, auth_headers):
+        """Test a stored page applies the same date filter as the first one"""
+        url = f'/nordingen-get-transactions?email={EMAIL}&limit=1&date_from=2024-04-01'
+        first = await (await test_client.get(url, headers=auth_headers)).get_json()
+        second = await (await test_client.get(f'{url}&cursor={first["next_cursor"]}', headers=auth_headers)).get_json()
+
+        assert [row["id"] for row in first["transactions"] + second["transactions"]] == ["t5", "t4"]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sort", ["date", "-amount"])
+    async def test_cursor_pages_follow_every_sort(self, test_client, bank, auth_headers, sort):
+        """Test stored pages continue the first page's order for other sorts too"""
+        url = f'/nordingen-get-transactions?email={EMAIL}&sort={sort}'
+        full = await (await test_client.get(f'{url}&limit=500', headers=auth_headers)).get_json()
+        page = await (await test_client.get(f'{url}&limit=1', headers=auth_headers)).get_json()
+        ids = [row["id"] for row in page["transactions"]]
+        while page["next_cursor"]:
+            page = await (await test_client.get(f'{url}&limit=1&cursor={page["next_cursor"]}',
+                                                headers=auth_headers)).get_json()
+            ids.extend(row["id"] for row in page["transactions"])
+
+        assert ids == [row["id"] for row in full["transactions"]]
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_summary_matches_first_page(self, test_client, bank, auth_headers):
+        """Test a stored page's totals, summed in SQL, equal the first page's for the same filters"""
+        url = f'/nordingen-get-transactions?email={EMAIL}&limit=1&min_amount=50'
+        first = await (await test_client.get(url, headers=auth_headers)).get_json()
+        second = await (await test_client.get(f'{url}&cursor={first["next_cursor"]}', headers=auth_headers)).get_json()
+
+        assert [row["id"] for row in first["transactions"] + second["transactions"]] == ["t3", "t1"]
+        for key in ("total_count", "summary", "categories", "top_categories"):
+            assert second[key] == first[key]
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_decrypts_only_its_rows(self, test_client, bank, auth_headers, monkeypatch):
+        """Test a stored page decrypts the page and its look-ahead row, not the whole history"""
+        url = f'/nordingen-get-transactions?email={EMAIL}&limit=1'
+        first = await (await test_client.get(url, headers=auth_headers)).get_json()
+        decrypt = email_encryption.decrypt
+        decrypted = []
+
+        def counting_decrypt(value):
+            decrypted.append(decrypt(value))
+            return decrypted[-1]
+
+        monkeypatch.setattr(email_encryption, "decrypt", counting_decrypt)
+        second = await (await test_client.get(f'{url}&cursor={first["next_cursor"]}', headers=auth_headers)).get_json()
+
+        assert [row["id"] for row in second["transactions"]] == ["t1"]
+        assert sorted(value for value in decrypted if value != EMAIL) == ["Kaufland Cluj", "Mega Image"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_merchant_filter(self, test_client, bank, auth_headers):
+        """Test a merchant filter, checked on the decrypted counterparty, still pages through storage"""
+        url = f'/nordingen-get-transactions?email={EMAIL}&limit=1&merchant=a'
+        first = await (await test_client.get(url, headers=auth_headers)).get_json()
+        second = await (await test_client.get(f'{url}&cursor={first["next_cursor"]}', headers=auth_headers)).get_json()
+
+        assert [row["id"] for row in first["transactions"] + second["transactions"]] == ["t1", "t5"]
+        assert second["total_count"] == 2
+        assert second["next_cursor"] is None
+
+
+class TestGetTransactionsResponse:
+
+    @pytest.mark.asyncio
+    async def test_legacy_response_is_deduplicated(self, test_client, bank, auth_headers):
+        """Test the unpaged response lists each payment once under its category and reports the duplicates"""
+        response = await test_client.get(f'/nordingen-get-transactions?email={EMAIL}', headers=auth_headers)
+        assert response.status_code == 200
+        data = await response.get_json()
+
+        assert data["total_count"] == 5
+        assert data["duplicates"] == {"removed": 2, "by_reason": {"duplicate_id": 1, "pending_booked": 1}}
+        assert data["summary"]["total_spent"] == 259.69
+        assert data["categories"]["Groceries"]["transactions"] == [
+            {"company": "Kaufland Cluj", "amount": "-120.50"}, {"company": "Mega Image", "amount": "-75.00"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_summary_view_builds_no_lists(self, test_client, bank, auth_headers):
+        """Test view=summary returns the totals without categories or transactions"""
+        response = await test_client.get(f'/nordingen-get-transactions?email={EMAIL}&view=summary', headers=auth_headers)
+        data = await response.get_json()
+
+        assert "summary" in data and "top_categories" in data
+        assert "categories" not in data and "transactions" not in data
+        assert data["summary"]["total_income"] == 6500.0
+
+    @pytest.mark.asyncio
+    async def test_paged_fields(self, test_client, bank, auth_headers):
+        """Test fields= trims a page to the requested keys and transaction attributes"""
+        response = await test_client.get(
+            f'/nordingen-get-transactions?email={EMAIL}&limit=2&sort=date'
+            f'&fields=transactions.id,transactions.amount,next_cursor', headers=auth_headers
+        )
+        data = await response.get_json()
+
+        assert set(data) == {"transactions", "next_cursor"}
+        assert data["transactions"] == [{"id": "t1", "amount": "-120.50"}, {"id": "t2", "amount": "-45.99"}]
+
+    @pytest.mark.asyncio
+    async def test_transaction_fields_need_paging(self, test_client, bank, auth_headers):
+        """Test asking for the flat transaction list without paging is refused instead of answered with nothing"""
+        response = await test_client.get(
+            f'/nordingen-get-transactions?email={EMAIL}&fields=transactions.id', headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert bank == []
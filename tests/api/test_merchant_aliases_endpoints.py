@@ -0,0 +1,121 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from app.database.models.merchant_alias_model import MerchantAlias
+from app.database.methods import load_merchant_aliases as load_module
+from app.database.methods import save_merchant_aliases as save_module
+from app.database.methods.load_merchant_aliases import load_merchant_aliases
+from app.database.methods.save_merchant_aliases import save_merchant_aliases
+from app.neutral_end_points import merchant_aliases as aliases_endpoint_module
+from app.utils.security import jwt_utils
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.categorizer import categorizer
+from app.utils.transactions.merchant_aliases import alias_key, merchant_aliases
+
+ADMIN = "admin@example.com"
+
+
+def headers(email):
+    return {"Authorization": f"Bearer {jwt_manager.create_token(email)}"}
+
+
+@pytest_asyncio.fixture
+async def aliases_db(test_db, monkeypatch):
+    for module in (load_module, save_module, aliases_endpoint_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    monkeypatch.setattr(jwt_utils, "ADMIN_EMAILS", {ADMIN})
+    # Work on an empty shared table and restore the real one afterwards
+    monkeypatch.setattr(merchant_aliases, "_admin", {})
+    monkeypatch.setattr(merchant_aliases, "_auto", {})
+    return test_db
+
+
+class TestMerchantAliasEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_requires_admin(self, test_client, aliases_db):
+        """Test alias endpoints need a token whose email is in ADMIN_EMAILS"""
+        assert (await test_client.get('/admin/merchant-aliases')).status_code == 401
+        response = await test_client.get('/admin/merchant-aliases', headers=headers("user@example.com"))
+        assert response.status_code == 403
+        response = await test_client.get('/admin/merchant-aliases', headers=headers(ADMIN.upper()))
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_correction_applies_to_everyone(self, test_client, aliases_db):
+        """Test an admin correction is used by the shared categorizer right away"""
+        assert categorizer.categorize("KAUFLAND 1234 CLUJ", "", "-50") == "Groceries"
+
+        response = await test_client.put('/admin/merchant-aliases', headers=headers(ADMIN), json={
+            "company": "KAUFLAND 1234 CLUJ", "merchant": "Kaufland Cluj", "category": "Household"
+        })
+        alias = (await response.get_json())["alias"]
+
+        assert response.status_code == 201
+        assert alias["counterparty"] == "kaufland cluj"
+        assert alias["source"] == "admin"
+        assert categorizer.categorize("Kaufland 9999 Cluj", "", "-50") == "Household"
+        assert categorizer.categorize("Kaufland Iasi", "", "-50") == "Groceries"
+
+    @pytest.mark.asyncio
+    async def test_delete_and_reload(self, test_client, aliases_db):
+        """Test deleting an alias removes it from memory and a reload restores the table from the database"""
+        await test_client.put('/admin/merchant-aliases', headers=headers(ADMIN), json={
+            "company": "Shop 24", "merchant": "Shop 24", "category": "Groceries"
+        })
+        created = await test_client.put('/admin/merchant-aliases', headers=headers(ADMIN), json={
+            "company": "Corner", "merchant": "Corner", "category": "Groceries"
+        })
+        alias_id = (await created.get_json())["alias"]["id"]
+
+        deleted = await test_client.delete(f'/admin/merchant-aliases/{alias_id}', headers=headers(ADMIN))
+        merchant_aliases.replace({})
+        reloaded = await test_client.post('/admin/merchant-aliases/reload', headers=headers(ADMIN))
+
+        assert deleted.status_code == 200
+        assert (await reloaded.get_json())["loaded"] == 1
+        assert merchant_aliases.get("Shop 24", "") == ("Shop 24", "Groceries")
+        assert merchant_aliases.get("Corner", "") is None
+
+    @pytest.mark.asyncio
+    async def test_validation(self, test_client, aliases_db):
+        """Test missing fields and unknown ids are rejected"""
+        response = await test_client.put('/admin/merchant-aliases', headers=headers(ADMIN), json={
+            "company": "Shop", "merchant": "Shop"
+        })
+        assert response.status_code == 400
+        response = await test_client.put('/admin/merchant-aliases', headers=headers(ADMIN), json={
+            "company": "1234", "merchant": "Shop", "category": "Groceries"
+        })
+        assert response.status_code == 400
+        response = await test_client.delete('/admin/merchant-aliases/not-a-uuid', headers=headers(ADMIN))
+        assert response.status_code == 404
+
+
+class TestSaveMerchantAliases:
+
+    @pytest.mark.asyncio
+    async def test_auto_aliases_never_overwrite_admin(self, test_client, aliases_db):
+        """Test the categorizer's aliases are stored but an admin correction for the same key wins"""
+        await test_client.put('/admin/merchant-aliases', headers=headers(ADMIN), json={
+            "company": "Glovo", "merchant": "Glovo", "category": "Eating Out"
+        })
+        glovo, kaufland = alias_key("glovo"), alias_key("kaufland")
+
+        saved = await save_merchant_aliases({
+            glovo: ("glovo", "glovo", "Food Delivery"),
+            kaufland: ("kaufland", "kaufland", "Groceries"),
+        }, "v1")
+
+        async with aliases_db() as session:
+            rows = {a.alias_key: a for a in (await session.execute(select(MerchantAlias))).scalars()}
+
+        assert saved == 1
+        assert (rows[glovo].source, rows[glovo].category) == ("admin", "Eating Out")
+        assert (rows[kaufland].source, rows[kaufland].dictionary_version) == ("auto", "v1")
+        assert rows[kaufland]._counterparty != "kaufland"
+
+        merchant_aliases.replace({})
+        assert await load_merchant_aliases() == 2
+        assert merchant_aliases.lookup(kaufland, "v1") == ("kaufland", "Groceries")
+        assert merchant_aliases.lookup(kaufland, "v2") is None
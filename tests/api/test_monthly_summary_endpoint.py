@@ -0,0 +1,135 @@
+from datetime import date
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from app.database.models.bank_transaction_model import BankTransaction
+from app.database.models.category_rollup_model import CategoryRollup
+from app.database.models.user_model import User
+from app.database.methods import get_category_rollups as get_category_rollups_module
+from app.database.methods import get_user_id as get_user_id_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods.get_category_rollups import get_category_rollups
+from app.database.methods.save_transactions import save_transactions
+from app.database.methods.update_category_rollups import add_rollup_delta, apply_rollup_deltas
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+EMAIL = "rollups@example.com"
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+def march_records():
+    return [
+        record("Kaufland", amount="-120.50", category="Groceries", date="2024-03-01", id="t1"),
+        record("Lidl", amount="-30.00", category="Groceries", date="2024-03-15", id="t2"),
+        record("Employer SRL", amount="6500.00", category="Salary", date="2024-03-25", id="t3"),
+        record("Bolt", amount="-18.20", category="Transport", date="2024-04-02", id="t4"),
+    ]
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def rollup_user(test_db, monkeypatch):
+    for module in (get_user_id_module, save_transactions_module, get_category_rollups_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        user = User(email=EMAIL)
+        session.add(user)
+        await session.commit()
+    await save_transactions(user.id, march_records())
+    return user
+
+
+def buckets(rollups):
+    return {(r.month.isoformat(), r.category): (r.income_minor, r.spent_minor, r.count) for r in rollups}
+
+
+class TestCategoryRollups:
+
+    @pytest.mark.asyncio
+    async def test_rollups_built_on_save(self, rollup_user):
+        """Test storing transactions fills the month/category buckets"""
+        assert buckets(await get_category_rollups(rollup_user.id)) == {
+            ("2024-03-01", "Groceries"): (0, 15050, 2),
+            ("2024-03-01", "Salary"): (650000, 0, 1),
+            ("2024-04-01", "Transport"): (0, 1820, 1),
+        }
+
+    @pytest.mark.asyncio
+    async def test_resync_is_incremental(self, rollup_user):
+        """Test re-syncing the same rows changes nothing and new rows are added on top"""
+        await save_transactions(rollup_user.id, march_records() + [
+            record("Penny", amount="-9.50", category="Groceries", date="2024-03-20", id="t5")
+        ])
+        assert buckets(await get_category_rollups(rollup_user.id))[("2024-03-01", "Groceries")] == (0, 16000, 3)
+
+    @pytest.mark.asyncio
+    async def test_recategorized_rows_move_between_buckets(self, rollup_user):
+        """Test a changed category moves the amount from the old bucket to the new one"""
+        changed = march_records()
+        changed[1].category = "Household"
+        await save_transactions(rollup_user.id, changed)
+
+        result = buckets(await get_category_rollups(rollup_user.id))
+        assert result[("2024-03-01", "Groceries")] == (0, 12050, 1)
+        assert result[("2024-03-01", "Household")] == (0, 3000, 1)
+
+    @pytest.mark.asyncio
+    async def test_increments_survive_a_stale_read(self, test_db, rollup_user):
+        """Test a writer holding an old copy of a bucket adds to it instead of overwriting another's increment"""
+        deltas = {}
+        add_rollup_delta(deltas, BankTransaction.from_record(
+            rollup_user.id, record("Penny", amount="-10.00", category="Groceries", date="2024-03-05")
+        ))
+        deltas[(date(2024, 3, 1), "Pets", "RON")] = [0, 700, 1]
+
+        async with test_db() as stale:
+            held = (await stale.execute(select(CategoryRollup).where(CategoryRollup.user_id == rollup_user.id))).all()
+            async with test_db() as other:
+                await apply_rollup_deltas(other, rollup_user.id, {(date(2024, 3, 1), "Groceries", "RON"): [0, 500, 1]})
+                await other.commit()
+            await apply_rollup_deltas(stale, rollup_user.id, deltas)
+            await stale.commit()
+
+        assert held
+        result = buckets(await get_category_rollups(rollup_user.id))
+        assert result[("2024-03-01", "Groceries")] == (0, 16550, 4)
+        assert result[("2024-03-01", "Pets")] == (0, 700, 1)
+
+
+class TestMonthlySummaryEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_monthly_summary(self, test_client, rollup_user, auth_headers):
+        """Test the endpoint returns per-month totals from the rollups"""
+        response = await test_client.get(f'/transactions/summary/monthly?email={EMAIL}', headers=auth_headers)
+        assert response.status_code == 200
+        months = (await response.get_json())["months"]
+
+        assert [m["month"] for m in months] == ["2024-03", "2024-04"]
+        assert months[0]["total_income"] == 6500.0
+        assert months[0]["total_spent"] == 150.5
+        assert months[0]["net_amount"] == 6349.5
+        assert months[0]["categories"]["Groceries"] == {"income": 0.0, "spent": 150.5, "count": 2}
+
+    @pytest.mark.asyncio
+    async def test_month_range(self, test_client, rollup_user, auth_headers):
+        """Test month_from/month_to restrict the months returned"""
+        response = await test_client.get(
+            f'/transactions/summary/monthly?email={EMAIL}&month_from=2024-04&month_to=2024-04', headers=auth_headers
+        )
+        assert [m["month"] for m in (await response.get_json())["months"]] == ["2024-04"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_month(self, test_client, rollup_user, auth_headers):
+        """Test malformed months are rejected"""
+        response = await test_client.get(f'/transactions/summary/monthly?email={EMAIL}&month_from=March', headers=auth_headers)
+        assert response.status_code == 400
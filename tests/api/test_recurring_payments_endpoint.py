@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+import pytest
+import pytest_asyncio
+from app.database.models.user_model import User
+from app.database.methods import get_user_id as get_user_id_module
+from app.database.methods import refresh_recurring_payments as refresh_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods.refresh_recurring_payments import refresh_recurring_payments
+from app.database.methods.save_transactions import store_transactions
+from app.neutral_end_points import recurring_payments as recurring_payments_module
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+EMAIL = "recurring@example.com"
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+def monthly(company, amount, count, start=date(2024, 1, 3), category="Streaming"):
+    return [
+        record(company, amount=amount, category=category,
+               date=(start + timedelta(days=30 * i)).isoformat(), id=f"{company}-{i}")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def recurring_user(test_db, monkeypatch):
+    for module in (get_user_id_module, save_transactions_module, refresh_module, recurring_payments_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        user = User(email=EMAIL)
+        session.add(user)
+        await session.commit()
+    return user
+
+
+class TestRecurringPayments:
+
+    @pytest.mark.asyncio
+    async def test_detected_after_sync_and_listed(self, test_client, recurring_user, auth_headers):
+        """Test a sync stores detected subscriptions and the endpoint lists them"""
+        new_rows = await store_transactions(recurring_user.id, monthly("Netflix.com", "-45.99", 3) + [
+            record("Kaufland", amount="-80", category="Groceries", date="2024-02-11", id="k1")
+        ])
+        assert await refresh_recurring_payments(recurring_user.id, new_rows) == 1
+
+        response = await test_client.get(f'/recurring-payments?email={EMAIL}', headers=auth_headers)
+        payments = (await response.get_json())["recurring_payments"]
+
+        assert response.status_code == 200
+        assert [(p["merchant"], p["period"], p["amount"]) for p in payments] == [("Netflix.com", "monthly", 45.99)]
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_only_touches_new_merchants(self, recurring_user):
+        """Test a later sync re-checks only merchants with new payments and keeps the rest"""
+        await refresh_recurring_payments(
+            recurring_user.id, await store_transactions(recurring_user.id, monthly("Netflix.com", "-45.99", 3))
+        )
+        later = monthly("Spotify", "-23.99", 3, start=date(2024, 1, 9))
+        await refresh_recurring_payments(recurring_user.id, await store_transactions(recurring_user.id, later))
+
+        async with save_transactions_module.AsyncSessionLocal() as session:
+            from sqlalchemy import select
+            from app.database.models.recurring_payment_model import RecurringPayment
+            payments = (await session.execute(select(RecurringPayment))).scalars().all()
+
+        assert sorted(p.merchant for p in payments) == ["Netflix.com", "Spotify"]
+        assert all(p._merchant != p.merchant for p in payments)
+
+    @pytest.mark.asyncio
+    async def test_nothing_new(self, recurring_user):
+        """Test a sync without new rows does no detection work"""
+        assert await refresh_recurring_payments(recurring_user.id, []) == 0
@@ -0,0 +1,85 @@
+import pytest
+import pytest_asyncio
+from app.database.models.user_model import User
+from app.database.methods import get_user_id as get_user_id_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods import stream_transactions as stream_transactions_module
+from app.database.methods.save_transactions import store_transactions
+from app.utils.security.jwt_utils import jwt_manager
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.search_index import index_new_transactions, search_indexes
+from app.utils.transactions.transaction_record import TransactionRecord
+
+EMAIL = "search@example.com"
+
+
+def record(company="", description="", date="2024-05-01", id=""):
+    return TransactionRecord(id, parse_minor_units("-10"), "RON", date, company, description, "Shopping")
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {jwt_manager.create_token(EMAIL)}"}
+
+
+@pytest_asyncio.fixture
+async def search_user(test_db, monkeypatch):
+    for module in (get_user_id_module, save_transactions_module, stream_transactions_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    search_indexes.invalidate()
+    async with test_db() as session:
+        user = User(email=EMAIL)
+        session.add(user)
+        await session.commit()
+    yield user
+    search_indexes.invalidate()
+
+
+class TestSearchTransactions:
+
+    @pytest.mark.asyncio
+    async def test_builds_lazily_and_finds_matches(self, test_client, search_user, auth_headers):
+        """Test the first search builds the index from stored transactions"""
+        await store_transactions(search_user.id, [
+            record("Kaufland", "Plata card Bucuresti", "2024-01-10", "a"),
+            record("Netflix.com", "Abonament", "2024-02-10", "b"),
+            record("Kaufland", "Plata card Cluj", "2024-03-10", "c"),
+        ])
+        assert search_indexes.get(search_user.id) is None
+
+        response = await test_client.get(f'/transactions/search?email={EMAIL}&q=kaufland', headers=auth_headers)
+        data = await response.get_json()
+
+        assert response.status_code == 200
+        assert data["total"] == 2
+        assert [(t["transaction_id"], t["date"]) for t in data["transactions"]] == [
+            ("c", "2024-03-10"), ("a", "2024-01-10")
+        ]
+        assert search_indexes.get(search_user.id) is not None
+
+    @pytest.mark.asyncio
+    async def test_sync_updates_loaded_index(self, test_client, search_user, auth_headers):
+        """Test rows stored by a later sync are searchable without rebuilding"""
+        await store_transactions(search_user.id, [record("Kaufland", id="a")])
+        await test_client.get(f'/transactions/search?email={EMAIL}&q=kaufland', headers=auth_headers)
+        index = search_indexes.get(search_user.id)
+
+        new_rows = await store_transactions(search_user.id, [record("Kaufland", "Cluj", "2024-06-01", id="b")])
+        index_new_transactions(search_user.id, new_rows)
+        response = await test_client.get(f'/transactions/search?email={EMAIL}&q=kaufland', headers=auth_headers)
+
+        assert search_indexes.get(search_user.id) is index
+        assert [t["transaction_id"] for t in (await response.get_json())["transactions"]] == ["b", "a"]
+
+    @pytest.mark.asyncio
+    async def test_validation(self, test_client, search_user, auth_headers):
+        """Test a missing query and out-of-range limits are rejected"""
+        for params in ("", "&q=%20", "&q=glovo&limit=0", "&q=glovo&limit=abc"):
+            response = await test_client.get(f'/transactions/search?email={EMAIL}{params}', headers=auth_headers)
+            assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_unknown_user(self, test_client, search_user, auth_headers):
+        """Test searching for an unknown user returns 404"""
+        response = await test_client.get('/transactions/search?email=nobody@example.com&q=glovo', headers=auth_headers)
+        assert response.status_code == 404
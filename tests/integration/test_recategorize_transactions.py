@@ -0,0 +1,123 @@
+import threading
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from app.database.models.bank_transaction_model import BankTransaction
+from app.database.models.category_rollup_model import CategoryRollup
+from app.database.models.category_rule_model import CategoryRule
+from app.database.models.user_model import User
+from app.database.methods import get_category_rules as get_category_rules_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods import stream_transactions as stream_transactions_module
+from app.database.methods.save_transactions import store_transactions
+from app.jobs import recategorize_transactions as recategorize_module
+from app.jobs.recategorize_transactions import RecategorizationJob, recategorize_batch
+from app.utils.email_encryption import email_encryption
+from app.utils.transactions.merchant_registry import categorizer_registry
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+def record(company, category, id, amount="-50", version="RO:stale"):
+    return TransactionRecord(id, parse_minor_units(amount), "RON", "2024-05-03", company, "", category,
+                             category_version=version)
+
+
+@pytest_asyncio.fixture
+async def stored_user(test_db, monkeypatch):
+    for module in (save_transactions_module, stream_transactions_module, recategorize_module,
+                   get_category_rules_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        user = User(email="recategorize@example.com")
+        session.add(user)
+        await session.commit()
+    return user
+
+
+async def stored_rows(test_db):
+    async with test_db() as session:
+        result = await session.execute(select(BankTransaction))
+        return {row.transaction_id: row for row in result.scalars()}
+
+
+async def rollup_counts(test_db):
+    async with test_db() as session:
+        result = await session.execute(select(CategoryRollup))
+        return {rollup.category: rollup.count for rollup in result.scalars() if rollup.count}
+
+
+class TestRecategorizeTransactions:
+
+    @pytest.mark.asyncio
+    async def test_outdated_rows_are_recategorized(self, test_db, stored_user):
+        """Test stale and untagged rows get the current category and version, and rollups follow"""
+        current = categorizer_registry.version_tag("RO")
+        await store_transactions(stored_user.id, [
+            record("Kaufland Cluj", "Shopping", "stale"),
+            record("Mega Image", "Groceries", "untagged", version=None),
+            record("Kaufland Iasi", "Shopping", "current", version=current),
+        ])
+
+        progress = await RecategorizationJob(batch_size=2, pause_seconds=0).run()
+
+        rows = await stored_rows(test_db)
+        assert progress["total"] == 2
+        assert progress["processed"] == 2
+        assert progress["updated"] == 2
+        assert progress["changed"] == 1
+        assert progress["error"] is None
+        assert rows["stale"].category == "Groceries"
+        assert rows["untagged"].category == "Groceries"
+        assert rows["current"].category == "Shopping"
+        assert {row.categorizer_version for row in rows.values()} == {current}
+        assert await rollup_counts(test_db) == {"Groceries": 2, "Shopping": 1}
+
+        again = await RecategorizationJob(pause_seconds=0).run()
+        assert again["total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_user_rules_still_win(self, test_db, stored_user):
+        """Test a user's own rule overrides the recategorized dictionary match"""
+        async with test_db() as session:
+            session.add(CategoryRule(user_id=stored_user.id, pattern="kaufland", category="Household"))
+            await session.commit()
+        await store_transactions(stored_user.id, [record("Kaufland Cluj", "Shopping", "ruled")])
+
+        await RecategorizationJob(pause_seconds=0).run()
+
+        assert (await stored_rows(test_db))["ruled"].category == "Household"
+
+    @pytest.mark.asyncio
+    async def test_counterparties_are_decrypted_once_off_the_loop(self, test_db, stored_user, monkeypatch):
+        """Test each counterparty is decrypted once, in the worker thread, for both the dictionary and user rules"""
+        async with test_db() as session:
+            session.add(CategoryRule(user_id=stored_user.id, pattern="kaufland", category="Household"))
+            await session.commit()
+        await store_transactions(stored_user.id, [record("Kaufland Cluj", "Shopping", "ruled")])
+        read = (await stored_rows(test_db))["ruled"]
+        decrypt = email_encryption.decrypt
+        threads = []
+
+        def counting_decrypt(value):
+            threads.append(threading.current_thread())
+            return decrypt(value)
+
+        monkeypatch.setattr(email_encryption, "decrypt", counting_decrypt)
+        assert await recategorize_batch([read]) == (1, 1)
+
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_rows_changed_meanwhile_are_left_alone(self, test_db, stored_user):
+        """Test a row a sync recategorized after the job read it keeps the sync's category and rollups"""
+        await store_transactions(stored_user.id, [record("Kaufland Cluj", "Shopping", "raced")])
+        read = (await stored_rows(test_db))["raced"]
+        await store_transactions(stored_user.id, [record("Kaufland Cluj", "Household", "raced", version="RO:sync")])
+
+        assert await recategorize_batch([read]) == (0, 0)
+        rows = await stored_rows(test_db)
+        assert rows["raced"].category == "Household"
+        assert rows["raced"].categorizer_version == "RO:sync"
+        assert await rollup_counts(test_db) == {"Household": 1}
@@ -0,0 +1,127 @@
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from app.database.models.bank_transaction_model import BankTransaction
+from app.database.models.raw_payload_model import RawPayload
+from app.database.models.user_model import User
+from app.database.methods import get_category_rules as get_category_rules_module
+from app.database.methods import prune_raw_payloads as prune_raw_payloads_module
+from app.database.methods import save_raw_payloads as save_raw_payloads_module
+from app.database.methods import save_transactions as save_transactions_module
+from app.database.methods import stream_raw_payloads as stream_raw_payloads_module
+from app.database.methods.prune_raw_payloads import prune_raw_payloads
+from app.database.methods.save_raw_payloads import archive_raw_payloads, save_raw_payloads
+from app.jobs.replay_raw_payloads import replay_raw_payloads
+
+
+def response_body(*transactions, pending=()):
+    return json.dumps({"transactions": {"booked": list(transactions), "pending": list(pending)}}).encode()
+
+
+def transaction(id, company, amount="-50.00", date="2024-05-03"):
+    return {
+        "transactionId": id,
+        "bookingDate": date,
+        "transactionAmount": {"amount": amount, "currency": "RON"},
+        "creditorName": company
+    }
+
+
+@pytest_asyncio.fixture
+async def archive_user(test_db, monkeypatch):
+    for module in (save_raw_payloads_module, stream_raw_payloads_module, save_transactions_module,
+                   get_category_rules_module, prune_raw_payloads_module):
+        monkeypatch.setattr(module, "AsyncSessionLocal", test_db)
+    async with test_db() as session:
+        user = User(email="replay@example.com")
+        session.add(user)
+        await session.commit()
+    return user
+
+
+class TestRawPayloadArchive:
+
+    @pytest.mark.asyncio
+    async def test_archived_encrypted_and_deduplicated(self, test_db, archive_user):
+        """Test payloads are stored compressed and encrypted, and an identical one only once"""
+        body = response_body(transaction("t1", "Kaufland Cluj", date="2024-04-01"), transaction("t2", "Glovo"))
+
+        assert await save_raw_payloads(archive_user.id, [("req-1", "acc-1", "RO", body)]) == 1
+        assert await save_raw_payloads(archive_user.id, [("req-1", "acc-1", "RO", body)]) == 0
+
+        async with test_db() as session:
+            archives = (await session.execute(select(RawPayload))).scalars().all()
+        assert len(archives) == 1
+        archive = archives[0]
+        assert archive.raw == body
+        assert b"Kaufland" not in archive._payload
+        assert archive.account_id == "acc-1"
+        assert archive.transaction_count == 2
+        assert archive.to_dict()["window_from"] == "2024-04-01"
+        assert archive.to_dict()["window_to"] == "2024-05-03"
+
+    @pytest.mark.asyncio
+    async def test_later_syncs_archive_only_the_new_window(self, test_db, archive_user):
+        """Test a re-fetched history is archived from the account's last archived day on, per account"""
+        old = transaction("t1", "Kaufland Cluj", date="2024-04-01")
+        await save_raw_payloads(archive_user.id, [("req-1", "acc-1", "RO", response_body(old))])
+
+        newer = [old, transaction("t2", "Glovo", date="2024-04-01"), transaction("t3", "Bolt", date="2024-04-09")]
+        assert await save_raw_payloads(archive_user.id, [
+            ("req-1", "acc-1", "RO", response_body(*newer)),
+            ("req-1", "acc-2", "RO", response_body(transaction("t9", "Lidl", date="2024-03-01"))),
+        ]) == 2
+
+        async with test_db() as session:
+            archives = (await session.execute(select(RawPayload).order_by(RawPayload.transaction_count))).scalars().all()
+        windows = {(a.account_id, a.transaction_count): (a.window_from.isoformat(), a.window_to.isoformat())
+                   for a in archives}
+        assert windows == {
+            ("acc-1", 1): ("2024-04-01", "2024-04-01"),
+            ("acc-2", 1): ("2024-03-01", "2024-03-01"),
+            ("acc-1", 3): ("2024-04-01", "2024-04-09"),
+        }
+        # Nothing newer than the last window: nothing archived
+        assert await save_raw_payloads(archive_user.id, [("req-1", "acc-1", "RO", response_body(newer[2]))]) == 0
+
+    @pytest.mark.asyncio
+    async def test_background_archive_prunes_expired_payloads(self, test_db, archive_user):
+        """Test archiving runs as a task and drops the user's payloads older than the retention"""
+        await save_raw_payloads(archive_user.id, [("req-1", "acc-1", "RO", response_body(transaction("t1", "Glovo")))])
+        async with test_db() as session:
+            archive = (await session.execute(select(RawPayload))).scalar_one()
+            archive.fetched_at = datetime.now(timezone.utc) - timedelta(days=400)
+            await session.commit()
+
+        await archive_raw_payloads(archive_user.id, [
+            ("req-1", "acc-2", "RO", response_body(transaction("t2", "Bolt")))
+        ])
+
+        async with test_db() as session:
+            archives = (await session.execute(select(RawPayload))).scalars().all()
+        assert [archive.account_id for archive in archives] == ["acc-2"]
+        assert await prune_raw_payloads(retention_days=0) == 0
+
+    @pytest.mark.asyncio
+    async def test_replay_reports_then_stores(self, test_db, archive_user):
+        """Test a replay categorizes archived payloads, and only stores them when asked"""
+        await save_raw_payloads(archive_user.id, [
+            ("req-1", "acc-1", "RO", response_body(transaction("t1", "Kaufland Cluj"))),
+            ("req-1", "acc-2", "RO", response_body(transaction("t2", "Netflix.com", "-45.99"))),
+        ])
+
+        report = await replay_raw_payloads(archive_user.id)
+
+        assert report["payloads"] == 2
+        assert report["categories"] == {"Groceries": 1, "Streaming": 1}
+        assert report["stored"] == 0
+
+        stored = await replay_raw_payloads(archive_user.id, store=True)
+
+        assert stored["stored"] == 2
+        async with test_db() as session:
+            rows = (await session.execute(select(BankTransaction))).scalars().all()
+        assert sorted(row.transaction_id for row in rows) == ["t1", "t2"]
+        assert (await replay_raw_payloads(archive_user.id, store=True))["stored"] == 0
@@ -0,0 +1,65 @@
+import uuid
+import pytest
+from app.database.models.bank_transaction_model import BankTransaction
+from app.database.models.user_model import User
+from app.database.methods import stream_transactions as stream_transactions_module
+from app.jobs.train_category_classifier import train_category_classifier, training_examples
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.ngram_classifier import NgramClassifier
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+def stored(user_id, company, category, amount="-50", id=None):
+    record = TransactionRecord(id or uuid.uuid4().hex, parse_minor_units(amount), "RON", "2024-05-01",
+                               company, "", category)
+    return BankTransaction.from_record(user_id, record)
+
+
+class TestTrainCategoryClassifier:
+
+    def test_amount_band_labels_are_skipped(self):
+        """Test rows labelled only by their amount are not used for training"""
+        user_id = uuid.uuid4()
+        rows = [
+            stored(user_id, "Pizzeria Roma", "Restaurants"),
+            stored(user_id, "Ion Popescu", "Small Purchase"),
+            stored(user_id, "Kaufland", "Groceries"),
+            stored(user_id, "Minimarket Vecinul SA", "Groceries"),
+        ]
+
+        texts, labels = training_examples(rows)
+
+        assert labels == ["Restaurants", "Groceries", "Groceries"]
+        assert texts[0] == "pizzeria roma"
+
+    @pytest.mark.asyncio
+    async def test_trains_from_stored_transactions(self, test_db, monkeypatch, tmp_path):
+        """Test the job streams every user's transactions and saves a usable model"""
+        monkeypatch.setattr(stream_transactions_module, "AsyncSessionLocal", test_db)
+        async with test_db() as session:
+            users = [User(email=f"train{i}@example.com") for i in range(2)]
+            session.add_all(users)
+            await session.flush()
+            session.add_all([
+                stored(users[0].id, "Pizzeria Roma", "Restaurants"),
+                stored(users[1].id, "Pizzeria Napoli", "Restaurants"),
+                stored(users[0].id, "Benzinaria Nord", "Fuel"),
+                stored(users[1].id, "Benzinaria Sud", "Fuel"),
+                stored(users[1].id, "Ion Popescu", "Small Purchase"),
+            ])
+            await session.commit()
+
+        path = str(tmp_path / "classifier.npz")
+        trained = await train_category_classifier(path)
+
+        assert sorted(trained.categories) == ["Fuel", "Restaurants"]
+        assert NgramClassifier.load(path).predict(["pizzeria mario", "benzinaria vest"]) == ["Restaurants", "Fuel"]
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_train_on(self, test_db, monkeypatch, tmp_path):
+        """Test an empty database saves nothing"""
+        monkeypatch.setattr(stream_transactions_module, "AsyncSessionLocal", test_db)
+        path = tmp_path / "classifier.npz"
+
+        assert await train_category_classifier(str(path)) is None
+        assert not path.exists()
@@ -0,0 +1,27 @@
+"""
+Synthetic Nordigen transaction payloads for the transaction pipeline benchmarks.
+"""
+import random
+
+MERCHANTS = [
+    "KAUFLAND 1234 BUCURESTI RO", "Glovo", "BOLT.EU/O/2301", "Mega Image 0456",
+    "OMV PETROM", "Netflix.com", "Farmacia Catena", "Salariu SC EXEMPLU SRL",
+    "Enel Energie", "Cinema City", "Starbucks Victoriei", "Unknown Shop 99",
+]
+
+
+def make_raw_transactions(count, seed=42):
+    """Build `count` raw transactions shaped like the Nordigen booked list"""
+    rng = random.Random(seed)
+    transactions = []
+    for i in range(count):
+        merchant = rng.choice(MERCHANTS)
+        amount = rng.uniform(-2500, 6000) if "Salariu" in merchant else rng.uniform(-400, -1)
+        transactions.append({
+            "transactionId": f"tx-{i}",
+            "bookingDate": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "transactionAmount": {"amount": f"{amount:.2f}", "currency": "RON"},
+            "creditorName": merchant,
+            "remittanceInformationUnstructured": f"Card payment {rng.randint(1000, 9999)} {merchant}",
+        })
+    return transactions
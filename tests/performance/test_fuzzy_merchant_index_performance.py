@@ -0,0 +1,59 @@
+"""
+Performance tests for fuzzy merchant matching.
+Compares the n-gram index with scoring every merchant for every transaction.
+"""
+import random
+import string
+import time
+from app.utils.transactions.fuzzy_merchant_index import FuzzyMerchantIndex, WORD_PATTERN, ngrams, similarity
+from tests.performance.test_merchant_matcher_performance import make_merchants
+
+
+def misspell(name, rng):
+    position = rng.randrange(len(name))
+    return name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:]
+
+
+def linear_match(merchant_grams, text, threshold):
+    """Score every merchant against every word of the text"""
+    best, best_score = None, threshold
+    words = [ngrams(word) for word in WORD_PATTERN.findall(text)]
+    for grams, category in merchant_grams:
+        for word in words:
+            score = similarity(grams, word)
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = category, score
+    return best
+
+
+class TestFuzzyMerchantIndexPerformance:
+
+    def test_index_beats_linear_scan_with_thousands_of_merchants(self):
+        """Benchmark 3000 merchants over 500 misspelled transaction texts"""
+        rng = random.Random(3)
+        merchants = make_merchants(3000, rng)
+        names = list(merchants)
+        texts = [f"plata card {misspell(rng.choice(names), rng)} bucuresti" for _ in range(500)]
+
+        start_time = time.perf_counter()
+        index = FuzzyMerchantIndex(merchants, threshold=0.7)
+        build_time = time.perf_counter() - start_time
+
+        merchant_grams = [(ngrams(merchant), category) for merchant, category in merchants.items()]
+        start_time = time.perf_counter()
+        linear_results = [linear_match(merchant_grams, text, 0.7) for text in texts]
+        linear_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        index_results = [index.match(text) for text in texts]
+        index_time = time.perf_counter() - start_time
+
+        found = sum(result is not None for result in index_results)
+        agree = sum(a == b for a, b in zip(index_results, linear_results))
+        print(f"\nbuild: {build_time * 1000:.1f}ms, found {found}/{len(texts)}, agree with scan {agree}/{len(texts)}")
+        print(f"linear scan: {linear_time:.3f}s")
+        print(f"n-gram index: {index_time:.3f}s")
+
+        assert found > len(texts) / 2
+        assert agree == len(texts)
+        assert index_time * 5 < linear_time
@@ -0,0 +1,56 @@
+"""
+Performance tests for the Aho-Corasick merchant matcher.
+Compares a single pass over each string with the per-merchant substring loop.
+"""
+import random
+import string
+import time
+from app.utils.transactions.merchant_matcher import MerchantMatcher
+
+
+def make_merchants(count, rng):
+    merchants = {}
+    while len(merchants) < count:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 12)))
+        merchants[name] = f"Category {len(merchants) % 25}"
+    return merchants
+
+
+def naive_match(merchants, text):
+    """The substring loop get_category_romanian used before the matcher"""
+    for merchant, category in merchants.items():
+        if merchant in text:
+            return category
+    return None
+
+
+class TestMerchantMatcherPerformance:
+
+    def test_matcher_beats_substring_loop_with_thousands_of_merchants(self):
+        """Benchmark 3000 merchants over 3000 transaction texts"""
+        rng = random.Random(7)
+        merchants = make_merchants(3000, rng)
+        names = list(merchants)
+        texts = [
+            f"plata card {rng.randint(1000, 9999)} {rng.choice(names)} bucuresti ro"
+            if i % 2 else f"transfer {rng.randint(1000, 9999)} catre cont economii"
+            for i in range(3000)
+        ]
+
+        start_time = time.perf_counter()
+        matcher = MerchantMatcher(merchants)
+        compile_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        naive_results = [naive_match(merchants, text) for text in texts]
+        naive_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        matcher_results = [matcher.match(text) for text in texts]
+        matcher_time = time.perf_counter() - start_time
+
+        print(f"3000 merchants x 3000 texts: compile {compile_time:.3f}s, "
+              f"substring loop {naive_time:.3f}s, automaton {matcher_time:.3f}s")
+
+        assert matcher_results == naive_results
+        assert matcher_time < naive_time, "A single pass should beat scanning every merchant"
@@ -0,0 +1,47 @@
+"""
+Performance tests for the fallback n-gram classifier.
+Compares batched matrix inference with classifying one row at a time.
+"""
+import time
+from app.utils.transactions.categorizer import AMOUNT_CATEGORIES, Categorizer
+from app.utils.transactions.ngram_classifier import NgramClassifier, classifier_text
+from app.utils.transactions.transaction_record import TransactionRecord
+from tests.performance.synthetic_transactions import make_raw_transactions
+
+
+def make_training_set(count):
+    records = [TransactionRecord.from_nordigen(t) for t in make_raw_transactions(count, seed=8)]
+    labels = Categorizer(process_threshold=0).categorize_batch(records)
+    examples = [(classifier_text(r.company, r.description), label)
+                for r, label in zip(records, labels) if label not in AMOUNT_CATEGORIES]
+    return [text for text, _ in examples], [label for _, label in examples]
+
+
+class TestNgramClassifierPerformance:
+
+    def test_batched_inference_is_microseconds_per_row(self):
+        """Benchmark training on 50k rows and classifying 50k rows in one batch vs row by row"""
+        texts, labels = make_training_set(50_000)
+
+        start_time = time.perf_counter()
+        classifier = NgramClassifier().fit(texts, labels)
+        train_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        batched = classifier.predict(texts)
+        batch_time = time.perf_counter() - start_time
+
+        sample = texts[:2000]
+        start_time = time.perf_counter()
+        single = [classifier.predict([text])[0] for text in sample]
+        single_time = (time.perf_counter() - start_time) / len(sample) * len(texts)
+
+        accuracy = sum(p == label for p, label in zip(batched, labels)) / len(labels)
+        print(f"\ntrain: {train_time:.3f}s on {len(texts)} rows, accuracy {accuracy:.1%}")
+        print(f"batched: {batch_time / len(texts) * 1e6:.1f}µs per row")
+        print(f"row by row: {single_time / len(texts) * 1e6:.1f}µs per row (extrapolated)")
+
+        assert single == batched[:len(sample)]
+        assert accuracy > 0.95
+        assert batch_time / len(texts) < 50e-6
+        assert batch_time * 5 < single_time
@@ -0,0 +1,88 @@
+"""
+Performance tests for process-pool categorization of very large batches.
+Compares inline categorization with sharding across worker processes.
+"""
+import asyncio
+import itertools
+import os
+import time
+from app.utils.transactions.categorization_pool import CategorizationPool
+from app.utils.transactions.categorizer import Categorizer
+from app.utils.transactions.transaction_record import TransactionRecord
+from tests.performance.synthetic_transactions import make_raw_transactions
+
+
+def timed(run, records):
+    start_time = time.perf_counter()
+    run(records)
+    return time.perf_counter() - start_time
+
+
+# Shared by every batch, so no row repeats one the worker caches have already seen
+references = itertools.count()
+
+
+def make_records(count):
+    records = [TransactionRecord.from_nordigen(t) for t in make_raw_transactions(count, seed=11)]
+    # Unique references so every row misses the categorization cache
+    for r in records:
+        r.description = f"{r.description} ref {next(references)}"
+    return records
+
+
+class TestProcessPoolCategorizationPerformance:
+
+    def test_process_pool_matches_inline_across_batch_sizes(self):
+        """Benchmark inline vs process-pool categorization at 10k, 50k and 100k rows"""
+        workers = max(2, os.cpu_count() or 1)
+        pool = CategorizationPool(workers=workers)
+        try:
+            for count in (10_000, 50_000, 100_000):
+                records = make_records(count)
+
+                inline = Categorizer(process_threshold=0, thread_threshold=count + 1)
+                start_time = time.perf_counter()
+                expected = inline.categorize_batch(records)
+                inline_time = time.perf_counter() - start_time
+
+                pooled = Categorizer(process_threshold=1, cache_size=1, pool=pool)
+                # Warm the workers so start-up cost is not counted
+                asyncio.run(pooled.categorize_batch_async(records[:workers]))
+                start_time = time.perf_counter()
+                result = asyncio.run(pooled.categorize_batch_async(records))
+                pooled_time = time.perf_counter() - start_time
+
+                print(f"\n{count} rows on {workers} workers: inline {inline_time:.3f}s, "
+                      f"process pool {pooled_time:.3f}s ({inline_time / pooled_time:.1f}x)")
+                assert result == expected
+        finally:
+            pool.shutdown()
+
+    def test_process_pool_crossover_sweep(self):
+        """Sweep batch sizes to find where the process pool starts beating inline categorization
+
+        The printed crossover is what CATEGORIZATION_PROCESS_THRESHOLD should
+        be set from on the deployment hardware.
+        """
+        workers = max(2, os.cpu_count() or 1)
+        pool = CategorizationPool(workers=workers)
+        crossover = None
+        try:
+            pooled = Categorizer(process_threshold=1, cache_size=1, pool=pool)
+            asyncio.run(pooled.categorize_batch_async(make_records(workers)))
+            for count in (1_000, 2_500, 5_000, 10_000, 20_000, 40_000, 80_000):
+                inline = Categorizer(process_threshold=0, thread_threshold=count + 1)
+                inline_time = min(timed(inline.categorize_batch, make_records(count)) for _ in range(3))
+                pooled_time = min(
+                    timed(lambda records: asyncio.run(pooled.categorize_batch_async(records)), make_records(count))
+                    for _ in range(3)
+                )
+
+                print(f"\n{count} rows on {workers} workers: inline {inline_time:.3f}s, process pool {pooled_time:.3f}s")
+                if crossover is None and pooled_time < inline_time:
+                    crossover = count
+        finally:
+            pool.shutdown()
+
+        print(f"crossover: {crossover if crossover is not None else 'none up to 80000'} rows "
+              f"({os.cpu_count()} CPUs)")
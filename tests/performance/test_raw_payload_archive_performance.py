@@ -0,0 +1,61 @@
+"""
+Performance tests for the raw Nordigen payload archive.
+Measures how much smaller archived payloads are and how fast they decompress for replay.
+"""
+import json
+import time
+import uuid
+from app.database.models.raw_payload_model import RawPayload
+from app.utils.transactions.payload_archive import available_codecs, compress_payload, decompress_payload
+from tests.performance.synthetic_transactions import make_raw_transactions
+
+
+def account_payload(count):
+    return json.dumps({"transactions": {"booked": make_raw_transactions(count, seed=11), "pending": []}}).encode()
+
+
+class TestRawPayloadArchivePerformance:
+
+    def test_storage_size_and_decompress_throughput(self):
+        """Benchmark compression ratio and decompression speed of a 20k-transaction account payload"""
+        raw = account_payload(20_000)
+
+        for codec in available_codecs():
+            start_time = time.perf_counter()
+            blob = compress_payload(raw, codec)
+            compress_time = time.perf_counter() - start_time
+
+            rounds = 5
+            start_time = time.perf_counter()
+            for _ in range(rounds):
+                restored = decompress_payload(blob, codec)
+            decompress_time = (time.perf_counter() - start_time) / rounds
+            throughput = len(raw) / decompress_time / 1e6
+
+            print(f"\n{codec}: {len(raw) / 1e6:.1f} MB → {len(blob) / 1e6:.2f} MB "
+                  f"({len(blob) / len(raw):.1%}), compress {compress_time:.3f}s, "
+                  f"decompress {throughput:.0f} MB/s")
+
+            assert restored == raw
+            assert len(blob) < len(raw) / 5
+            assert throughput > 50
+
+    def test_archived_row_size(self):
+        """Benchmark the stored size of a whole archive row, encryption overhead included"""
+        raw = account_payload(20_000)
+
+        start_time = time.perf_counter()
+        archive = RawPayload.from_raw(uuid.uuid4(), "req", "acc", "RO", raw)
+        archive_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        restored = archive.raw
+        restore_time = time.perf_counter() - start_time
+
+        print(f"\nstored {archive.stored_size / 1e6:.2f} MB of {archive.raw_size / 1e6:.1f} MB "
+              f"({archive.stored_size / archive.raw_size:.1%}), archive {archive_time:.3f}s, "
+              f"restore {restore_time:.3f}s")
+
+        assert restored == raw
+        assert archive.transaction_count == 20_000
+        assert archive.stored_size < archive.raw_size / 4
@@ -0,0 +1,79 @@
+"""
+Performance tests for per-user transaction search.
+Compares indexed queries with scanning every stored row's text.
+"""
+import time
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from app.utils.transactions.search_index import TransactionSearchIndex, fold
+from tests.performance.synthetic_transactions import make_raw_transactions
+
+QUERIES = ["kaufland", "bolt", "netflix card", "mega image", "victoriei", "ene"]
+
+
+def make_rows(count):
+    """Stored-row stand-ins carrying already decrypted text, so only indexing is measured"""
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            transaction_id=t["transactionId"],
+            booking_date=date.fromisoformat(t["bookingDate"]),
+            company=t["creditorName"],
+            description=t["remittanceInformationUnstructured"]
+        )
+        for t in make_raw_transactions(count, seed=11)
+    ]
+
+
+def scan(rows, query):
+    words = fold(query).split()
+    return [row for row in rows if all(word in fold(f"{row.company} {row.description}") for word in words)]
+
+
+class TestSearchIndexPerformance:
+
+    def test_indexed_queries_are_milliseconds(self):
+        """Benchmark queries against a 100k transaction history, indexed vs scanned"""
+        rows = make_rows(100_000)
+
+        start_time = time.perf_counter()
+        index = TransactionSearchIndex()
+        index.add(rows)
+        build_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        results = {query: index.search(query, 50) for query in QUERIES}
+        query_time = (time.perf_counter() - start_time) / len(QUERIES)
+
+        start_time = time.perf_counter()
+        scanned = scan(rows, QUERIES[0])
+        scan_time = time.perf_counter() - start_time
+
+        print(f"\nbuild:        {build_time:.3f}s, {index.size_bytes / 1024 / 1024:.1f} MiB estimated")
+        print(f"indexed query: {query_time * 1000:.2f}ms average")
+        print(f"full scan:     {scan_time * 1000:.2f}ms")
+
+        assert results["kaufland"][0] == len(scanned)
+        assert results["netflix card"][0] == len(scan(rows, "netflix card"))
+        assert query_time * 10 < scan_time
+
+    def test_incremental_add_is_cheaper_than_rebuild(self):
+        """Benchmark adding one sync's rows to a loaded index against rebuilding it"""
+        rows = make_rows(100_000)
+        index = TransactionSearchIndex()
+        index.add(rows[:99_000])
+
+        start_time = time.perf_counter()
+        index.add(rows[99_000:])
+        add_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        TransactionSearchIndex().add(rows)
+        rebuild_time = time.perf_counter() - start_time
+
+        print(f"\nincremental add (1k rows): {add_time * 1000:.2f}ms")
+        print(f"full rebuild (100k rows):  {rebuild_time * 1000:.2f}ms")
+
+        assert len(index) == len(rows)
+        assert add_time * 10 < rebuild_time
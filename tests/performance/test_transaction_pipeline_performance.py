@@ -0,0 +1,51 @@
+"""
+Performance tests for the transaction extraction pipeline.
+Compares the old JSON round-trip flow with the object-native pipeline.
+"""
+import json
+import time
+import pytest
+from app.utils.transactions.extract_essentials_transactions import extract_essentials_transactions
+from tests.performance.synthetic_transactions import make_raw_transactions
+
+
+class TestTransactionPipelinePerformance:
+
+    @pytest.mark.asyncio
+    async def test_object_pipeline_matches_json_round_trip(self):
+        """Test the object pipeline returns the same essentials as the string flow"""
+        raw = make_raw_transactions(200)
+
+        from_objects = await extract_essentials_transactions(raw)
+        from_string = await extract_essentials_transactions(json.dumps(raw))
+
+        assert from_objects == from_string
+        assert len(from_objects) == 200
+
+    @pytest.mark.asyncio
+    async def test_object_pipeline_skips_serialization_overhead(self):
+        """Benchmark 10k transactions: JSON serialized once instead of three times
+
+        Categorizing is the same work in both flows (and the second run would
+        find the categorizer cache warm), so it runs once, untimed, and only
+        the serialization each flow adds around it is timed.
+        """
+        raw = make_raw_transactions(10_000)
+        essentials = await extract_essentials_transactions(raw)
+
+        # Old flow: dumps -> loads -> dumps(indent=2) -> loads -> response dumps
+        start_time = time.perf_counter()
+        json.loads(json.dumps(raw))
+        round_trip = json.loads(json.dumps([e.to_dict() for e in essentials], indent=2))
+        json.dumps(round_trip)
+        round_trip_time = time.perf_counter() - start_time
+
+        # New flow: objects end to end, one dumps at the response boundary
+        start_time = time.perf_counter()
+        json.dumps([e.to_dict() for e in essentials])
+        object_time = time.perf_counter() - start_time
+
+        print(f"10k transactions: JSON round-trip {round_trip_time:.3f}s, object pipeline {object_time:.3f}s")
+
+        assert len(essentials) == 10_000
+        assert object_time < round_trip_time, "Object pipeline should avoid the serialization overhead"
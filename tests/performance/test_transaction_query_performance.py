@@ -0,0 +1,73 @@
+"""
+Performance tests for paged transaction responses.
+Compares one keyset page and the summary view with the legacy full response.
+"""
+import json
+import time
+from app.utils.transactions.categorizer import Categorizer
+from app.utils.transactions.summarize_transactions import (
+    TransactionColumns, sort_by_absolute_amount, summarize_transactions
+)
+from app.utils.transactions.transaction_query import TransactionQuery
+from app.utils.transactions.transaction_record import TransactionRecord
+from tests.performance.synthetic_transactions import make_raw_transactions
+
+
+def make_records(count):
+    records = [TransactionRecord.from_nordigen(t) for t in make_raw_transactions(count, seed=5)]
+    for r, category in zip(records, Categorizer(process_threshold=0).categorize_batch(records)):
+        r.category = category
+    return records
+
+
+class TestTransactionQueryPerformance:
+
+    def test_page_is_smaller_and_faster_than_full_response(self):
+        """Benchmark a 50-row page against the full response at 100k transactions"""
+        records = make_records(100_000)
+
+        start_time = time.perf_counter()
+        ordered, columns = sort_by_absolute_amount(records)
+        full = summarize_transactions(ordered, columns)
+        full_payload = json.dumps(full)
+        full_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        query = TransactionQuery.from_args({"limit": "50"})
+        columns = TransactionColumns(records)
+        rows = query.matching_rows(records, columns)
+        page_rows, next_cursor = query.page(records, columns, rows)
+        summary = summarize_transactions(records, columns, include_transactions=False)
+        page_payload = json.dumps({
+            **summary,
+            "transactions": [records[row].to_dict() for row in page_rows.tolist()],
+            "next_cursor": next_cursor
+        })
+        page_time = time.perf_counter() - start_time
+
+        print(f"\nfull response: {full_time:.3f}s, {len(full_payload) / 1024:.0f} KiB")
+        print(f"50-row page:   {page_time:.3f}s, {len(page_payload) / 1024:.0f} KiB")
+
+        assert [r.id for r in ordered[:50]] == [records[row].id for row in page_rows.tolist()]
+        assert len(page_payload) * 50 < len(full_payload)
+        assert page_time < full_time
+
+    def test_summary_view_is_a_fraction_of_full_response(self):
+        """Benchmark the summary view (no sort, no per-category lists) at 100k transactions"""
+        records = make_records(100_000)
+
+        start_time = time.perf_counter()
+        ordered, columns = sort_by_absolute_amount(records)
+        full_payload = json.dumps(summarize_transactions(ordered, columns))
+        full_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        summary = summarize_transactions(records, TransactionColumns(records), include_transactions=False)
+        summary_payload = json.dumps({"summary": summary["summary"], "top_categories": summary["top_categories"]})
+        summary_time = time.perf_counter() - start_time
+
+        print(f"\nfull response: {full_time:.3f}s, {len(full_payload) / 1024:.0f} KiB")
+        print(f"summary view:  {summary_time:.3f}s, {len(summary_payload) / 1024:.1f} KiB")
+
+        assert len(summary_payload) * 100 < len(full_payload)
+        assert summary_time < full_time
@@ -0,0 +1,68 @@
+"""
+Performance tests for the slotted TransactionRecord.
+Compares memory per transaction and parse throughput with the old per-row dicts.
+"""
+import gc
+import time
+import tracemalloc
+from app.utils.transactions.transaction_record import TransactionRecord
+from tests.performance.synthetic_transactions import make_raw_transactions
+
+
+def legacy_essential(t):
+    """The dict extract_essentials_transactions used to build per transaction"""
+    company = t.get("creditorName", '') or t.get("debtorName", '')
+    description = t.get("remittanceInformationUnstructured", '') or t.get("remittanceInformationStructured", '')
+    amount = t.get("transactionAmount", {}).get("amount", '') or t.get("transactionAmount", '')
+    return {
+        "id": t.get("transactionId", ''),
+        "amount": amount,
+        "description": description,
+        "company": company,
+        "category": None
+    }
+
+
+def measure_memory(build, raw):
+    """Bytes allocated by `build` per transaction, excluding the shared raw strings"""
+    gc.collect()
+    tracemalloc.start()
+    rows = [build(t) for t in raw]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / len(rows), rows
+
+
+class TestTransactionRecordPerformance:
+
+    def test_memory_per_transaction(self):
+        """Test a slotted record is smaller than the old per-row dict"""
+        raw = make_raw_transactions(20_000)
+
+        dict_bytes, _ = measure_memory(legacy_essential, raw)
+        record_bytes, records = measure_memory(TransactionRecord.from_nordigen, raw)
+
+        print(f"Memory per transaction: dict {dict_bytes:.0f} B, slotted record {record_bytes:.0f} B")
+
+        assert len(records) == 20_000
+        assert record_bytes < dict_bytes, "Slotted records should use less memory than dicts"
+
+    def test_field_access_throughput(self):
+        """Benchmark the hot-path reads of amount/company/category over 100k rows"""
+        raw = make_raw_transactions(100_000)
+        dicts = [legacy_essential(t) for t in raw]
+        records = [TransactionRecord.from_nordigen(t) for t in raw]
+
+        start_time = time.perf_counter()
+        for row in dicts:
+            row.get("amount"), row.get("company"), row.get("category")
+        dict_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for row in records:
+            row.amount_minor, row.company, row.category
+        record_time = time.perf_counter() - start_time
+
+        print(f"100k field reads: dict .get {dict_time:.4f}s, slotted attributes {record_time:.4f}s")
+
+        assert record_time < dict_time, "Attribute access should beat dict .get()"
@@ -0,0 +1,110 @@
+"""
+Performance tests for the transactions category summary.
+Compares the per-row Python loop with the NumPy columnar aggregation.
+"""
+import random
+import time
+import pytest
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+from app.utils.transactions.summarize_transactions import sort_by_absolute_amount, summarize_transactions
+
+CATEGORIES = ["Groceries", "Transport", "Food Delivery", "Fuel", "Bills", "Streaming", "Salary", "Shopping"]
+
+
+def make_essentials(count, seed=11):
+    """Rows shaped like the old dict-based essentials"""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"tx-{i}",
+            "amount": f"{rng.uniform(-500, 500):.2f}",
+            "company": f"Merchant {rng.randint(1, 300)}",
+            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "category": rng.choice(CATEGORIES),
+        }
+        for i in range(count)
+    ]
+
+
+def to_records(essentials):
+    """The same rows as extract_essentials_transactions now returns them (amount parsed once)"""
+    return [
+        TransactionRecord(e["id"], parse_minor_units(e["amount"], "RON"), "RON", e["date"], e["company"], "", e["category"])
+        for e in essentials
+    ]
+
+
+def legacy_summary(essentials, include_transactions=True):
+    """The per-row loop the endpoint used before the vectorized summary"""
+    essentials.sort(key=lambda x: abs(float(x.get('amount', 0)) if x.get('amount') else 0), reverse=True)
+    category_summary = {}
+    total_spent = 0
+    total_income = 0
+    for transaction in essentials:
+        category = transaction.get('category', 'Unknown')
+        amount = float(transaction.get('amount', 0)) if transaction.get('amount') else 0
+        if category not in category_summary:
+            category_summary[category] = {"count": 0, "total_amount": 0, "transactions": []}
+        category_summary[category]["count"] += 1
+        category_summary[category]["total_amount"] += abs(amount)
+        if include_transactions:
+            category_summary[category]["transactions"].append({
+                "company": transaction.get("company"),
+                "amount": transaction.get("amount")
+            })
+        if amount > 0:
+            total_income += amount
+        else:
+            total_spent += abs(amount)
+    top = sorted(
+        [{"category": cat, "amount": data["total_amount"], "count": data["count"]} for cat, data in category_summary.items()],
+        key=lambda x: x["amount"], reverse=True
+    )[:5]
+    return total_income, total_spent, category_summary, top
+
+
+class TestTransactionSummaryPerformance:
+
+    @pytest.mark.parametrize("count", [1_000, 10_000, 100_000])
+    def test_vectorized_aggregation(self, count):
+        """Benchmark totals, category sums/counts and top-K at 1k/10k/100k transactions"""
+        essentials = make_essentials(count)
+        records = to_records(essentials)
+
+        start_time = time.perf_counter()
+        income, spent, _, _ = legacy_summary(list(essentials), include_transactions=False)
+        loop_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        sorted_essentials, columns = sort_by_absolute_amount(records)
+        result = summarize_transactions(sorted_essentials, columns, include_transactions=False)
+        numpy_time = time.perf_counter() - start_time
+
+        print(f"{count} transactions (aggregates): Python loop {loop_time:.4f}s, NumPy {numpy_time:.4f}s "
+              f"({loop_time / numpy_time:.1f}x)")
+
+        assert result["summary"]["total_income"] == pytest.approx(round(income, 2))
+        assert result["summary"]["total_spent"] == pytest.approx(round(spent, 2))
+        if count >= 100_000:
+            assert numpy_time < loop_time, "Vectorized aggregation should beat the per-row loop"
+
+    @pytest.mark.parametrize("count", [10_000, 100_000])
+    def test_full_summary_with_transaction_lists(self, count):
+        """Benchmark the full response shape, including per-category transaction lists"""
+        essentials = make_essentials(count)
+        records = to_records(essentials)
+
+        start_time = time.perf_counter()
+        legacy_summary(list(essentials))
+        loop_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        sorted_essentials, columns = sort_by_absolute_amount(records)
+        result = summarize_transactions(sorted_essentials, columns)
+        numpy_time = time.perf_counter() - start_time
+
+        print(f"{count} transactions (full): Python loop {loop_time:.4f}s, NumPy {numpy_time:.4f}s "
+              f"({loop_time / numpy_time:.1f}x)")
+
+        assert sum(len(c["transactions"]) for c in result["categories"].values()) == count
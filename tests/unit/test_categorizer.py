@@ -0,0 +1,173 @@
+import threading
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from app.utils.transactions.categorization_pool import CategorizationPool
+from app.utils.transactions.categorizer import Categorizer, categorizer
+from app.utils.transactions.get_category_romania import get_category_romanian
+from app.utils.transactions.merchant_aliases import MerchantAliasTable, alias_key, merchant_aliases
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.ngram_classifier import NgramClassifier
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+class TestCategorizer:
+
+    def test_known_merchant(self):
+        """Test a dictionary merchant is matched in the company name"""
+        assert categorizer.categorize("Kaufland Romania", "", "-54.20") == "Groceries"
+
+    def test_merchant_in_description(self):
+        """Test merchants are also found in the description"""
+        assert categorizer.categorize("", "Plata card Netflix.com", "-45.99") == "Streaming"
+
+    def test_amount_fallback(self):
+        """Test unknown merchants fall back to amount bands"""
+        assert categorizer.categorize("Xyz", "", "6500") == "Salary"
+        assert categorizer.categorize("Xyz", "", "-2500") == "Housing"
+        assert categorizer.categorize("Xyz", "", "-15") == "Small Purchase"
+
+    def test_invalid_amount(self):
+        """Test an unparseable amount yields Unknown"""
+        assert categorizer.categorize("Xyz", "", "not-a-number") == "Unknown"
+
+    def test_batch_matches_single(self):
+        """Test categorize_batch gives the same answers as categorize"""
+        records = [
+            record("Glovo", "", "-30"),
+            record("", "OMV station", "-200"),
+            record(None, None, "100"),
+        ]
+        expected = [categorizer.categorize(r.company or "", r.description or "", r.amount) for r in records]
+
+        assert categorizer.categorize_batch(records) == expected
+
+    def test_custom_dictionary(self):
+        """Test a categorizer can be built over another merchant dictionary"""
+        custom = Categorizer(merchants={"acme": "Tools"})
+        assert custom.categorize("ACME Corp", "", "-10") == "Tools"
+
+    def test_fuzzy_fallback(self):
+        """Test a misspelled merchant is found once exact matching fails, when fuzzy matching is on"""
+        assert Categorizer(fuzzy_threshold=0.7).categorize("CARREFUR EXPRES 123", "", "-54.20") == "Groceries"
+        assert categorizer.categorize("CARREFUR EXPRES 123", "", "-54.20") == "Food"
+
+    @pytest.mark.parametrize("fuzzy_threshold", [0, 0.7])
+    @pytest.mark.parametrize("description", [
+        "Alimentare cont", "Alimentare card", "Alimentare cont economii", "Alimentare Revolut"
+    ])
+    def test_top_ups_are_not_groceries(self, description, fuzzy_threshold):
+        """Test account top-ups ("alimentare") are not taken for a grocery shop ("alimentara")"""
+        custom = Categorizer(fuzzy_threshold=fuzzy_threshold)
+        assert custom.categorize("", description, "-500") != "Groceries"
+        assert custom.categorize(None, description, "500") != "Groceries"
+
+    def test_categorization_version(self):
+        """Test the categorization version changes with anything that can change a category"""
+        def version(merchants={"acme": "Tools"}, **kwargs):
+            return Categorizer(merchants=merchants, **kwargs).categorization_version
+
+        classifier = NgramClassifier().fit(["acme corp"], ["Tools"])
+
+        assert version() == version()
+        assert version({"acme": "Hardware"}) != version()
+        assert version(fuzzy_threshold=0.9) != version()
+        assert version(classifier=classifier) != version()
+
+    def test_legal_forms_match_whole_words(self):
+        """Test "sa" and "ii" only count as legal forms when they are separate words"""
+        assert categorizer.categorize("Minimarket Vecinul SA", "", "-150") == "Groceries"
+        assert categorizer.categorize("Salariu minimarket", "", "-150") == "Shopping"
+        assert categorizer.categorize("Minimarket Vecinul II", "", "-150") == "Groceries"
+        assert categorizer.categorize("Minimarket Taxii", "", "-150") == "Shopping"
+
+    @pytest.mark.asyncio
+    async def test_small_batch_runs_inline(self):
+        """Test batches under the threshold stay on the event loop thread"""
+        calls = []
+        custom = Categorizer(thread_threshold=10)
+        original = custom.categorize_batch
+        custom.categorize_batch = lambda records: calls.append(threading.current_thread()) or original(records)
+
+        await custom.categorize_batch_async([record("Lidl", "", "-5")])
+
+        assert calls == [threading.main_thread()]
+
+    @pytest.mark.asyncio
+    async def test_large_batch_runs_in_thread(self):
+        """Test batches over the threshold are moved off the event loop thread"""
+        calls = []
+        custom = Categorizer(thread_threshold=1)
+        original = custom.categorize_batch
+        custom.categorize_batch = lambda records: calls.append(threading.current_thread()) or original(records)
+
+        result = await custom.categorize_batch_async([record("Lidl", "", "-5")])
+
+        assert result == ["Groceries"]
+        assert calls and calls[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_very_large_batch_uses_process_pool(self):
+        """Test batches over the process threshold are sharded and keep input order"""
+        pool = CategorizationPool(workers=2)
+        custom = Categorizer(process_threshold=3, pool=pool)
+        records = [
+            record("Lidl", "", "-5"),
+            record("", "Plata card Netflix.com", "-45.99"),
+            record("Xyz", "", "6500"),
+            record("Bolt", "", "-12"),
+            record(None, None, "bad"),
+        ]
+        try:
+            result = await custom.categorize_batch_async(records)
+        finally:
+            pool.shutdown()
+
+        assert result == custom.categorize_batch(records)
+
+    @pytest.mark.asyncio
+    async def test_process_pools_per_dictionary_run_side_by_side(self):
+        """Test categorizers with different dictionaries share the pool without cancelling each other"""
+        pool = CategorizationPool(workers=1, max_versions=2)
+        tools = Categorizer(merchants={"acme": "Tools"}, process_threshold=1, pool=pool)
+        food = Categorizer(merchants={"acme": "Groceries"}, process_threshold=1, pool=pool)
+        try:
+            assert await tools.categorize_batch_async([record("Acme", "", "-5")]) == ["Tools"]
+            assert await food.categorize_batch_async([record("Acme", "", "-5")]) == ["Groceries"]
+            assert list(pool._executors) == [tools.version, food.version]
+
+            other = Categorizer(merchants={"acme": "Shopping"}, process_threshold=1, pool=pool)
+            assert await other.categorize_batch_async([record("Acme", "", "-5")]) == ["Shopping"]
+            assert list(pool._executors) == [food.version, other.version]
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_workers_ignore_inherited_aliases(self, monkeypatch):
+        """Test forked workers do not apply the parent's alias table, only the categorizer's own"""
+        monkeypatch.setattr(merchant_aliases, "_admin", {alias_key("lidl"): ("Lidl", "Shopping", None)})
+        pool = CategorizationPool(workers=1)
+        custom = Categorizer(process_threshold=1, pool=pool, aliases=MerchantAliasTable())
+        try:
+            assert await custom.categorize_batch_async([record("Lidl", "", "-5")]) == ["Groceries"]
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_broken_process_pool_falls_back(self):
+        """Test a crashed worker pool still categorizes the batch in a thread"""
+        class BrokenPool:
+            async def categorize_rows(self, rows, merchants, version):
+                raise BrokenProcessPool("worker died")
+
+        custom = Categorizer(process_threshold=1, pool=BrokenPool())
+
+        assert await custom.categorize_batch_async([record("Lidl", "", "-5")]) == ["Groceries"]
+
+    @pytest.mark.asyncio
+    async def test_async_wrapper(self):
+        """Test the legacy async helper delegates to the categorizer"""
+        assert await get_category_romanian("Bolt", "", "-12") == "Transport"
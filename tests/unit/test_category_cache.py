@@ -0,0 +1,161 @@
+import pytest
+from app.utils.transactions.categorizer import Categorizer
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+from app.utils.transactions.category_cache import (
+    MISSING, CategoryCache, cache_key, merchants_fingerprint, normalize_counterparty
+)
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+class TestNormalizeCounterparty:
+
+    def test_strips_store_ids(self):
+        """Test store and terminal ids do not split the cache key"""
+        assert normalize_counterparty("KAUFLAND 1234 BUCURESTI") == normalize_counterparty("Kaufland 0987 Bucuresti")
+
+    def test_strips_card_numbers_and_dates(self):
+        """Test masked card numbers and dates are removed"""
+        assert normalize_counterparty("Plata card ****1234 din 12.10.2024 Glovo") == "plata card din glovo"
+        assert normalize_counterparty("4111 1111 1111 1111 Bolt 2024-01-05") == "bolt"
+
+    def test_keeps_short_digits(self):
+        """Test digits that are part of a merchant name survive"""
+        assert normalize_counterparty("7card fitness") == "7card fitness"
+
+    def test_handles_none(self):
+        """Test missing fields normalize to an empty string"""
+        assert cache_key(None, None) == ("", "")
+
+
+class TestCategoryCache:
+
+    def test_hit_and_miss_statistics(self):
+        """Test hits, misses and hit rate are tracked"""
+        cache = CategoryCache(10)
+        assert cache.get("a") is MISSING
+        cache.put("a", "Groceries")
+        assert cache.get("a") == "Groceries"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_none_is_a_cacheable_result(self):
+        """Test a cached 'no merchant found' is distinguishable from a miss"""
+        cache = CategoryCache(10)
+        cache.put("a", None)
+        assert cache.get("a") is None
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = CategoryCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+
+class TestCategorizerCache:
+
+    def test_repeat_merchants_hit_the_cache(self):
+        """Test the same merchant with different store ids is computed once"""
+        custom = Categorizer()
+        records = [record(f"KAUFLAND {i:04d}", "", "-10") for i in range(100)]
+
+        categories = custom.categorize_batch(records)
+
+        assert set(categories) == {"Groceries"}
+        assert custom.cache.stats()["misses"] == 1
+        assert custom.cache.stats()["hits"] == 99
+
+    def test_amount_fallback_is_not_cached(self):
+        """Test unknown merchants still get amount-based categories per transaction"""
+        custom = Categorizer()
+        categories = custom.categorize_batch([
+            record("Xyz", "", "-2500"),
+            record("Xyz", "", "-15"),
+        ])
+        assert categories == ["Housing", "Small Purchase"]
+
+    def test_dictionary_change_invalidates(self):
+        """Test editing the merchant dictionary clears the cache and recompiles"""
+        merchants = {"acme": "Tools"}
+        custom = Categorizer(merchants=merchants)
+        assert custom.categorize("Acme", "", "-1") == "Tools"
+        old_version = custom.version
+
+        merchants["acme"] = "Hardware"
+
+        assert custom.categorize("Acme", "", "-1") == "Hardware"
+        assert custom.version != old_version
+        assert custom.version == merchants_fingerprint(merchants)
+
+    def test_snapshot_round_trip(self):
+        """Test cached entries exported for a user can warm another categorizer"""
+        records = [record("Glovo 123", "", "-30")]
+        source = Categorizer()
+        source.categorize_batch(records)
+        entries = source.cached_entries(records)
+
+        target = Categorizer()
+        assert target.warm_cache(entries, source.version) == 1
+        assert target.warm_cache(entries, "other-version") == 0
+        target.categorize_batch(records)
+        assert target.cache.stats()["hits"] == 1
+
+
+class TestUserCategoryCache:
+
+    @pytest.mark.asyncio
+    async def test_persist_and_warm(self, tmp_path, monkeypatch):
+        """Test per-user snapshots are written encrypted and loaded back"""
+        import app.utils.transactions.user_category_cache as user_cache
+        monkeypatch.setattr(user_cache, "CATEGORY_CACHE_DIR", str(tmp_path))
+        records = [record("Lidl 55", "", "-30")]
+        user_cache.categorizer_registry.get("RO").categorize_batch(records)
+
+        await user_cache.persist_user_category_cache("user-1", records)
+
+        raw = (tmp_path / "user-1.cache").read_text()
+        assert "lidl" not in raw
+        assert await user_cache.warm_user_category_cache("user-1") == 1
+
+    @pytest.mark.asyncio
+    async def test_each_country_uses_its_own_categorizer(self, tmp_path, monkeypatch):
+        """Test results are saved from and loaded into the categorizer of each record's country"""
+        import app.utils.transactions.user_category_cache as user_cache
+        from app.utils.transactions.merchant_registry import CategorizerRegistry
+        registry = CategorizerRegistry(dictionaries={"RO": "ro", "DE": "de"}, preloaded={
+            "RO": Categorizer(merchants={"lidl": "Groceries"}), "DE": Categorizer(merchants={"lidl": "Shopping"})
+        })
+        monkeypatch.setattr(user_cache, "CATEGORY_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(user_cache, "categorizer_registry", registry)
+        romanian, german = record("Lidl 55", "", "-30"), record("Lidl Berlin", "", "-30")
+        registry.get("RO").categorize_batch([romanian])
+        registry.get("DE").categorize_batch([german])
+        romanian.category_version, german.category_version = registry.version_tag("RO"), registry.version_tag("DE")
+
+        await user_cache.persist_user_category_cache("user-1", [romanian, german])
+        for country in ("RO", "DE"):
+            registry.get(country).cache.invalidate(registry.get(country).version)
+
+        assert await user_cache.warm_user_category_cache("user-1") == 2
+        assert registry.get("DE").cache.peek(cache_key("Lidl Berlin", ""), MISSING) == "Shopping"
+        assert registry.get("RO").cache.peek(cache_key("Lidl Berlin", ""), MISSING) is MISSING
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_directory(self, monkeypatch):
+        """Test snapshots are skipped when CATEGORY_CACHE_DIR is not configured"""
+        import app.utils.transactions.user_category_cache as user_cache
+        monkeypatch.setattr(user_cache, "CATEGORY_CACHE_DIR", None)
+
+        assert await user_cache.warm_user_category_cache("user-1") == 0
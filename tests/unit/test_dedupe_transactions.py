@@ -0,0 +1,83 @@
+from app.utils.transactions.dedupe_transactions import dedupe_transactions
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id="", pending=False,
+           source=None):
+    return TransactionRecord(
+        id, parse_minor_units(amount, currency), currency, date, company, description, category, pending, source=source
+    )
+
+
+class TestDedupeTransactions:
+
+    def test_same_bank_linked_twice(self):
+        """Test rows repeated with the same bank id are kept once"""
+        first = record("Kaufland", amount="-50", date="2024-03-01", id="t1")
+        again = record("Kaufland", amount="-50", date="2024-03-01", id="t1")
+
+        kept, dropped = dedupe_transactions([first, again, record("Bolt", amount="-10", id="t2")])
+
+        assert [r.id for r in kept] == ["t1", "t2"]
+        assert dropped == [(again, "duplicate_id")]
+
+    def test_pending_that_booked(self):
+        """Test a pending row is dropped once its booked counterpart arrives, whatever the order"""
+        pending = record("KAUFLAND 1234", amount="-50", date="2024-03-01", pending=True)
+        booked = record("Kaufland 0987", amount="-50", date="2024-03-01", id="b1")
+
+        kept, dropped = dedupe_transactions([pending, booked])
+
+        assert kept == [booked]
+        assert dropped == [(pending, "pending_booked")]
+
+    def test_identical_purchases_are_kept(self):
+        """Test two real purchases with the same content but different ids both count"""
+        coffees = [record("Starbucks", amount="-15", date="2024-03-01", id=f"c{i}") for i in range(2)]
+        pending = record("Starbucks", amount="-15", date="2024-03-01", pending=True)
+
+        kept, dropped = dedupe_transactions(coffees + [pending])
+
+        assert kept == coffees
+        assert [reason for _, reason in dropped] == ["pending_booked"]
+
+    def test_rows_without_ids_use_content(self):
+        """Test id-less rows repeated from another account fall back to the date/amount/counterparty key"""
+        rows = [record("Glovo", amount="-30", date="2024-03-02", source=account) for account in ("a1", "a2")]
+
+        kept, dropped = dedupe_transactions(rows)
+
+        assert kept == rows[:1]
+        assert [reason for _, reason in dropped] == ["duplicate_content"]
+
+    def test_identical_purchases_without_ids_are_kept(self):
+        """Test id-less repeats on one account are genuine purchases, and a second link of it adds nothing"""
+        tickets = [record("STB", amount="-3", date="2024-03-02", source="a1") for _ in range(2)]
+        linked_again = [record("STB", amount="-3", date="2024-03-02", source="a2") for _ in range(3)]
+
+        kept, dropped = dedupe_transactions(tickets + linked_again)
+
+        assert kept == tickets + linked_again[2:]
+        assert [reason for _, reason in dropped] == ["duplicate_content", "duplicate_content"]
+
+    def test_unrelated_pending_is_kept(self):
+        """Test pending rows with no booked match stay"""
+        pending = record("Netflix", amount="-45.99", date="2024-03-05", pending=True)
+        kept, dropped = dedupe_transactions([record("Bolt", amount="-10", id="t2"), pending])
+
+        assert pending in kept
+        assert dropped == []
+
+    def test_summary_counts_each_payment_once(self):
+        """Test totals are not inflated by the duplicates"""
+        from app.utils.transactions.summarize_transactions import summarize_transactions
+
+        rows = [
+            record("Kaufland", amount="-50", date="2024-03-01", id="t1", category="Groceries"),
+            record("Kaufland", amount="-50", date="2024-03-01", id="t1", category="Groceries"),
+            record("Kaufland", amount="-50", date="2024-03-01", pending=True, category="Groceries"),
+        ]
+        kept, _ = dedupe_transactions(rows)
+
+        assert summarize_transactions(kept)["summary"]["total_spent"] == 50.0
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+import app.nordingen.methods.fetch_transactions_with_deadline as deadline_module
+from app.nordingen.methods.fetch_transactions_with_deadline import fetch_transactions_with_deadline
+from app.nordingen.methods.transactions_cache import clear_transactions_cache, remember_transactions
+
+
+def fake_fetcher(delays, failures=()):
+    """Build a get_all_transactions stand-in with a per-requisition delay"""
+    async def fake_get_all_transactions(requisition_id, deadline=None, payloads=None):
+        await asyncio.sleep(delays[requisition_id])
+        if requisition_id in failures:
+            return None
+        return [{"transactionId": f"{requisition_id}-1"}]
+    return fake_get_all_transactions
+
+
+class TestFetchTransactionsWithDeadline:
+
+    def setup_method(self):
+        clear_transactions_cache()
+
+    @pytest.mark.asyncio
+    async def test_all_banks_complete(self, monkeypatch):
+        """Test every bank reports ok when all finish inside the budget"""
+        monkeypatch.setattr(deadline_module, "get_all_transactions", fake_fetcher({"a": 0, "b": 0}))
+
+        results = await fetch_transactions_with_deadline(["a", "b"], budget_seconds=1)
+
+        assert [r["status"] for r in results] == ["ok", "ok"]
+        assert results[0]["transactions"] == [{"transactionId": "a-1"}]
+
+    @pytest.mark.asyncio
+    async def test_slow_bank_does_not_stall_response(self, monkeypatch):
+        """Test a hung bank is cancelled once the budget runs out"""
+        monkeypatch.setattr(deadline_module, "get_all_transactions", fake_fetcher({"fast": 0, "hung": 60}))
+
+        start = asyncio.get_running_loop().time()
+        results = await fetch_transactions_with_deadline(["fast", "hung"], budget_seconds=0.2)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert elapsed < 1.0
+        assert results[0]["status"] == "ok"
+        assert results[1]["status"] == "timeout"
+        assert results[1]["transactions"] == []
+
+    @pytest.mark.asyncio
+    async def test_timed_out_bank_falls_back_to_cache(self, monkeypatch):
+        """Test a timed-out bank serves its last cached transactions"""
+        remember_transactions("hung", [{"transactionId": "old"}])
+        monkeypatch.setattr(deadline_module, "get_all_transactions", fake_fetcher({"hung": 60}))
+
+        results = await fetch_transactions_with_deadline(["hung"], budget_seconds=0.1)
+
+        assert results[0]["status"] == "cached"
+        assert results[0]["transactions"] == [{"transactionId": "old"}]
+
+    @pytest.mark.asyncio
+    async def test_failed_bank_reports_error(self, monkeypatch):
+        """Test a failed fetch is reported as error, not cached"""
+        monkeypatch.setattr(deadline_module, "get_all_transactions", fake_fetcher({"bad": 0}, failures={"bad"}))
+
+        results = await fetch_transactions_with_deadline(["bad"], budget_seconds=1)
+
+        assert results[0]["status"] == "error"
@@ -0,0 +1,48 @@
+import pytest
+from app.utils.transactions.fuzzy_merchant_index import FuzzyMerchantIndex, ngrams, similarity
+from app.utils.transactions.merchants_romania import ROMANIAN_MERCHANT_CATEGORIES
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FuzzyMerchantIndex(ROMANIAN_MERCHANT_CATEGORIES, threshold=0.7)
+
+
+class TestFuzzyMerchantIndex:
+
+    def test_similarity(self):
+        """Test identical n-gram sets score 1 and disjoint ones 0"""
+        assert similarity(ngrams("kaufland"), ngrams("kaufland")) == 1.0
+        assert similarity(ngrams("kaufland"), ngrams("xyz")) == 0.0
+        assert similarity(set(), ngrams("xyz")) == 0.0
+
+    def test_misspelled_merchants(self, index):
+        """Test a dropped or doubled letter still finds the merchant"""
+        assert index.match("CARREFUR EXPRES 123") == "Groceries"
+        assert index.match("ROMPETROLL STATIA 12") == "Fuel"
+        assert index.match("plata pos sensiblue") == "Pharmacy"
+
+    def test_split_and_merged_words(self, index):
+        """Test word breaks do not matter"""
+        assert index.best_match("MEGAIMAGE 0456")[:2] == ("mega image", "Groceries")
+        assert index.best_match("STAR BUCKS")[:2] == ("starbucks", "Coffee")
+
+    def test_short_keywords_are_not_fuzzy(self, index):
+        """Test keywords under five letters need an exact match"""
+        assert index.match("paulina") is None
+        assert index.match("omvv") is None
+
+    def test_one_shared_word_is_not_enough(self, index):
+        """Test a multi-word keyword is not matched by one of its words alone"""
+        assert index.match("shopping online") is None
+
+    def test_unrelated_text(self, index):
+        """Test ordinary bank wording stays unmatched"""
+        assert index.match("transfer ionescu maria") is None
+        assert index.match("retragere numerar atm") is None
+        assert index.match("") is None
+
+    def test_inflected_words_are_not_merchants(self, index):
+        """Test a keyword with another ending ("alimentare" for "alimentara") is not a near match"""
+        assert index.match("Alimentare cont economii") is None
+        assert index.match("alimentare revolut") is None
@@ -0,0 +1,115 @@
+from app.utils.transactions.categorizer import Categorizer
+from app.utils.transactions.category_cache import cache_key
+from app.utils.transactions.merchant_aliases import MerchantAliasTable, alias_key, alias_subject
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+def record(company="", description="", amount="-50", currency="RON"):
+    return TransactionRecord("", parse_minor_units(amount, currency), currency, "", company, description, None)
+
+
+def key_for(company, description=""):
+    return alias_key(alias_subject(cache_key(company, description)))
+
+
+class TestMerchantAliasTable:
+
+    def test_key_ignores_store_numbers_and_case(self):
+        """Test counterparties that normalize the same share one alias key"""
+        assert key_for("KAUFLAND 1234 BUCURESTI") == key_for("Kaufland 5678 Bucuresti")
+        assert key_for("Kaufland") == key_for("", "Kaufland")
+
+    def test_key_ignores_description_next_to_a_company(self):
+        """Test one alias covers a merchant's payments whatever their description says"""
+        table = MerchantAliasTable()
+        table.set(key_for("Glovo"), "Glovo", "Eating Out")
+
+        assert key_for("Glovo", "Order 1234 Pizza") == key_for("Glovo", "Order 99 Sushi")
+        assert table.get("GLOVO", "Comanda 5521") == ("Glovo", "Eating Out")
+
+    def test_automatic_aliases_are_bounded(self):
+        """Test the oldest automatic aliases are dropped past the limit while admin ones are all kept"""
+        table = MerchantAliasTable(max_size=2)
+        table.set(key_for("Admin Shop"), "Admin Shop", "Groceries")
+        for name in ("One", "Two", "Three"):
+            table.set(key_for(name), name, "Shopping", "v1")
+
+        assert len(table) == 3
+        assert table.get("One", "", "v1") is None
+        assert table.get("Three", "", "v1") == ("Three", "Shopping")
+        assert table.get("Admin Shop", "", "v1") == ("Admin Shop", "Groceries")
+
+        table.replace({key_for(name): (name, "Shopping", "v1") for name in ("One", "Two", "Three")})
+        assert table.get("One", "", "v1") is None
+        assert len(table) == 2
+
+    def test_admin_aliases_always_apply(self):
+        """Test an alias without a dictionary version applies to every dictionary"""
+        table = MerchantAliasTable()
+        table.set(key_for("Shop 24"), "Shop 24", "Groceries")
+
+        assert table.get("SHOP 24", "", version="abc") == ("Shop 24", "Groceries")
+
+    def test_auto_aliases_follow_dictionary_version(self):
+        """Test an automatic alias is ignored once the dictionary it came from changes"""
+        table = MerchantAliasTable()
+        table.set(key_for("Kaufland"), "kaufland", "Groceries", "v1")
+
+        assert table.get("Kaufland", "", "v1") == ("kaufland", "Groceries")
+        assert table.get("Kaufland", "", "v2") is None
+
+
+class TestCategorizerAliases:
+
+    def test_alias_overrides_dictionary(self):
+        """Test an alias wins over the merchant dictionary and the amount fallback"""
+        table = MerchantAliasTable()
+        custom = Categorizer(merchants={"acme": "Tools"}, aliases=table)
+        table.set(key_for("ACME 0042"), "Acme", "Hardware")
+        table.set(key_for("Unknown Shop"), "Corner Shop", "Groceries")
+
+        assert custom.categorize("ACME 0042", "", "-10") == "Hardware"
+        assert custom.categorize("ACME 7", "", "-10") == "Tools"
+        assert custom.categorize("Unknown Shop", "", "-10") == "Groceries"
+
+    def test_new_aliases_only_for_matched_merchants(self):
+        """Test only counterparties that named a merchant are proposed, once each"""
+        table = MerchantAliasTable()
+        custom = Categorizer(merchants={"acme": "Tools", "carrefour": "Groceries"}, aliases=table)
+        records = [record("ACME 0042"), record("Acme 0043"), record("Xyz"), record("CARREFOUR EXPRES")]
+        custom.categorize_batch(records)
+
+        found = custom.new_aliases(records)
+
+        assert sorted(found.values()) == [
+            ("acme", "acme", "Tools"), ("carrefour expres", "carrefour", "Groceries")
+        ]
+        assert set(found) == {key_for("ACME 0042"), key_for("CARREFOUR EXPRES")}
+
+    def test_no_aliases_from_fuzzy_matches(self):
+        """Test a misspelled counterparty is categorized by fuzzy matching but never saved as an alias"""
+        custom = Categorizer(merchants={"carrefour": "Groceries"}, aliases=MerchantAliasTable(), fuzzy_threshold=0.7)
+        records = [record("CARREFUR EXPRES")]
+
+        assert custom.categorize_batch(records) == ["Groceries"]
+        assert custom.new_aliases(records) == {}
+
+    def test_no_aliases_from_descriptions(self):
+        """Test a payment with only a description naming a merchant proposes no alias"""
+        custom = Categorizer(merchants={"acme": "Tools"}, aliases=MerchantAliasTable())
+        records = [record("", "Plata ACME 0042")]
+
+        assert custom.categorize_batch(records) == ["Tools"]
+        assert custom.new_aliases(records) == {}
+
+    def test_new_aliases_skip_current_and_refresh_stale(self):
+        """Test counterparties with a current alias are skipped and stale automatic ones proposed again"""
+        table = MerchantAliasTable()
+        custom = Categorizer(merchants={"acme": "Tools"}, aliases=table)
+        table.set(key_for("Acme"), "acme", "Tools", custom.version)
+        table.set(key_for("Acme Store"), "acme", "Tools", "old-version")
+
+        found = custom.new_aliases([record("Acme"), record("Acme Store")])
+
+        assert list(found) == [key_for("Acme Store")]
@@ -0,0 +1,59 @@
+import pytest
+from app.utils.transactions.merchant_matcher import MerchantMatcher
+from app.utils.transactions.merchants_romania import ROMANIAN_MERCHANT_CATEGORIES
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return MerchantMatcher(ROMANIAN_MERCHANT_CATEGORIES)
+
+
+class TestMerchantMatcher:
+
+    def test_compiles_every_keyword(self, matcher):
+        """Test every dictionary keyword ends up in the automaton"""
+        assert len(matcher) == len(ROMANIAN_MERCHANT_CATEGORIES)
+
+    def test_every_keyword_matches_itself(self, matcher):
+        """Test each keyword is found when it is the whole text"""
+        for keyword in ROMANIAN_MERCHANT_CATEGORIES:
+            found = matcher.best_match(keyword)
+            assert found is not None, keyword
+            assert found[0] == keyword
+
+    def test_longest_match_wins(self, matcher):
+        """Test a more specific keyword beats a shorter one it contains"""
+        assert matcher.match("orange tv abonament") == "Streaming"
+        assert matcher.match("bolt food order") == "Food Delivery"
+        assert matcher.match("digi online") == "Streaming"
+
+    def test_ties_follow_dictionary_order(self):
+        """Test equally long keywords resolve to the first dictionary entry"""
+        tie_matcher = MerchantMatcher({"abcde": "First", "fghij": "Second"})
+        assert tie_matcher.match("fghij abcde") == "First"
+
+    def test_short_keywords_need_whole_words(self, matcher):
+        """Test short keywords do not match inside other words"""
+        assert matcher.match("shopping mall") is None
+        assert matcher.match("salariu octombrie") is None
+        assert matcher.match("ing bank") == "Banking"
+
+    def test_long_keywords_match_word_prefixes(self, matcher):
+        """Test long keywords still match with suffixes and glued store ids"""
+        assert matcher.match("mcdonalds 123") == "Restaurants"
+        assert matcher.match("kaufland1234 bucuresti") == "Groceries"
+        assert matcher.match("bolt.eu/o/2301") == "Transport"
+
+    def test_no_match_inside_word(self, matcher):
+        """Test keywords do not match in the middle of a word"""
+        assert matcher.match("supercoraplex") is None
+
+    def test_find_all_positions(self):
+        """Test find_all reports every hit with its offsets"""
+        small = MerchantMatcher({"he": "A", "she": "B", "hers": "C"})
+        hits = small.find_all("she he hers")
+        assert sorted(hits) == [(0, 3, "she", "B"), (4, 6, "he", "A"), (7, 11, "hers", "C")]
+
+    def test_empty_text(self, matcher):
+        """Test empty input has no match"""
+        assert matcher.match("") is None
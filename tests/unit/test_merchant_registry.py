@@ -0,0 +1,68 @@
+from app.utils.transactions.categorizer import categorizer
+from app.utils.transactions.merchant_matcher import MerchantMatcher, load_or_compile_matcher
+from app.utils.transactions.merchant_registry import (
+    CategorizerRegistry, categorizer_registry, country_from_institution_id
+)
+
+TEST_DICTIONARIES = {
+    "RO": "app.utils.transactions.merchants_romania:ROMANIAN_MERCHANT_CATEGORIES",
+    "XX": "tests.unit.test_merchant_registry:TEST_MERCHANTS",
+}
+TEST_MERCHANTS = {"acme": "Tools"}
+
+
+class TestCountryFromInstitution:
+
+    def test_reads_bic_country(self):
+        """Test the country comes from the BIC at the end of the institution id"""
+        assert country_from_institution_id("BCR_RNCBROBU") == "RO"
+        assert country_from_institution_id("REVOLUT_REVOLT21XXX") == "LT"
+
+    def test_sandbox_and_missing(self):
+        """Test ids without a usable BIC have no country"""
+        assert country_from_institution_id("SANDBOXFINANCE_SFIN0000") is None
+        assert country_from_institution_id(None) is None
+
+
+class TestCategorizerRegistry:
+
+    def test_default_registry_shares_romanian_categorizer(self):
+        """Test Romania reuses the app-wide categorizer"""
+        assert categorizer_registry.get("RO") is categorizer
+        assert categorizer_registry.get(None) is categorizer
+
+    def test_lazy_loading(self):
+        """Test a country's dictionary is only loaded on first use and then reused"""
+        registry = CategorizerRegistry(dictionaries=TEST_DICTIONARIES, default_country="RO")
+        assert "XX" not in registry.loaded_countries()
+
+        first = registry.get("xx")
+        assert first.categorize("ACME Ltd", "", "-10") == "Tools"
+        assert registry.get("XX") is first
+        assert registry.loaded_countries() == ["XX"]
+
+    def test_unknown_country_uses_default(self):
+        """Test countries without a dictionary fall back to the default country"""
+        registry = CategorizerRegistry(dictionaries=TEST_DICTIONARIES, default_country="XX")
+        assert registry.resolve("DE") == "XX"
+        assert registry.get("DE") is registry.get("XX")
+
+
+class TestCompiledMatcherCache:
+
+    def test_reuses_pickled_matcher(self, tmp_path):
+        """Test a compiled matcher is written once and loaded from disk afterwards"""
+        merchants = {"kaufland": "Groceries", "bolt": "Transport"}
+        compiled = load_or_compile_matcher(merchants, str(tmp_path))
+        assert len(list(tmp_path.iterdir())) == 1
+
+        loaded = load_or_compile_matcher(merchants, str(tmp_path))
+        assert isinstance(loaded, MerchantMatcher)
+        assert loaded is not compiled
+        assert loaded.match("kaufland bucuresti") == "Groceries"
+
+    def test_changed_dictionary_gets_new_index(self, tmp_path):
+        """Test each dictionary version has its own index file"""
+        load_or_compile_matcher({"a b c d e": "X"}, str(tmp_path))
+        load_or_compile_matcher({"a b c d e": "Y"}, str(tmp_path))
+        assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,45 @@
+import pytest
+from app.utils.transactions.money import (
+    currency_exponent, format_amount, parse_minor_units, to_major_units
+)
+
+
+class TestMoney:
+
+    @pytest.mark.parametrize("amount, currency, expected", [
+        ("12.34", "RON", 1234),
+        ("-12.3", "EUR", -1230),
+        ("+7", "RON", 700),
+        (".5", "RON", 50),
+        ("1000", "JPY", 1000),
+        ("1.005", "KWD", 1005),
+        ("0.005", "RON", 0),
+        ("0.015", "RON", 2),
+        ("1e2", "RON", 10000),
+        ("", "RON", 0),
+        (None, "RON", 0),
+        (15, "RON", 1500),
+    ])
+    def test_parse_minor_units(self, amount, currency, expected):
+        """Test decimal strings are parsed exactly into minor units"""
+        assert parse_minor_units(amount, currency) == expected
+
+    @pytest.mark.parametrize("amount", ["abc", "-", "1.2.3", "NaN", "Infinity", {"amount": "1"}, 1.5, "²", "1.²", "-³"])
+    def test_unparseable_amounts(self, amount):
+        """Test garbage and floats are rejected instead of guessed"""
+        assert parse_minor_units(amount, "RON") is None
+
+    def test_exponents(self):
+        """Test ISO minor-unit exponents, defaulting to 2"""
+        assert currency_exponent("RON") == 2
+        assert currency_exponent("jpy") == 0
+        assert currency_exponent("BHD") == 3
+        assert currency_exponent(None) == 2
+
+    def test_formatting(self):
+        """Test minor units are only turned into numbers/strings at the boundary"""
+        assert to_major_units(1234, "RON") == 12.34
+        assert format_amount(-1230, "EUR") == "-12.30"
+        assert format_amount(5, "RON") == "0.05"
+        assert format_amount(1000, "JPY") == "1000"
+        assert format_amount(1005, "KWD") == "1.005"
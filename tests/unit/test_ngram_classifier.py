@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from app.utils.transactions.categorizer import Categorizer
+from app.utils.transactions.merchant_aliases import MerchantAliasTable
+from app.utils.transactions.ngram_classifier import NgramClassifier, hashed_ngrams
+
+TEXTS = [
+    "pizzeria napoli", "pizzeria roma", "pizza express", "trattoria pizza",
+    "benzinaria nord", "benzina statie", "statie peco", "benzinaria sud",
+    "farmacia verde", "farmacie centrala", "farma plus", "farmacia tei",
+]
+LABELS = ["Restaurants"] * 4 + ["Fuel"] * 4 + ["Pharmacy"] * 4
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return NgramClassifier(buckets=2 ** 12).fit(TEXTS, LABELS)
+
+
+class TestHashedNgrams:
+
+    def test_stable_and_within_buckets(self):
+        """Test hashing is deterministic and every bucket is in range"""
+        rows, columns = hashed_ngrams(["kaufland", "glovo"], buckets=2 ** 10)
+        again = hashed_ngrams(["kaufland", "glovo"], buckets=2 ** 10)
+
+        assert np.array_equal(columns, again[1])
+        assert columns.min() >= 0 and columns.max() < 2 ** 10
+
+    def test_ngrams_never_span_texts(self):
+        """Test each text gets exactly its own padded 3- and 4-grams"""
+        rows, _ = hashed_ngrams(["ab", "", "kaufland"], sizes=(3, 4))
+
+        # " ab " → 2 trigrams + 1 four-gram, "  " → none, " kaufland " → 8 + 7
+        assert np.bincount(rows, minlength=3).tolist() == [3, 0, 15]
+
+    def test_bucket_count_must_be_power_of_two(self):
+        """Test a bucket count that is not a power of two is rejected"""
+        with pytest.raises(ValueError):
+            NgramClassifier(buckets=1000)
+
+
+class TestNgramClassifier:
+
+    def test_predicts_unseen_names(self, classifier):
+        """Test names never seen in training are classified by shared n-grams"""
+        assert classifier.predict(["pizzeria mario", "benzinaria vest", "farmacia noua"]) == [
+            "Restaurants", "Fuel", "Pharmacy"
+        ]
+
+    def test_low_confidence_is_unlabelled(self, classifier):
+        """Test a text with nothing in common with training data stays unlabelled"""
+        assert classifier.predict(["xyz qwk"], min_confidence=0.9) == [None]
+
+    def test_partial_fit_matches_fit(self):
+        """Test training in batches gives the same model as one fit"""
+        whole = NgramClassifier(buckets=2 ** 12).fit(TEXTS, LABELS)
+        batched = NgramClassifier(buckets=2 ** 12)
+        batched.partial_fit(TEXTS[:5], LABELS[:5]).partial_fit(TEXTS[5:], LABELS[5:]).finalize()
+
+        assert np.allclose(whole.predict_proba(TEXTS), batched.predict_proba(TEXTS))
+
+    def test_save_and_load(self, classifier, tmp_path):
+        """Test a saved model loads back with the same predictions"""
+        path = str(tmp_path / "classifier.npz")
+        classifier.save(path)
+        loaded = NgramClassifier.load(path)
+
+        assert loaded.categories == classifier.categories
+        assert loaded.predict(TEXTS) == classifier.predict(TEXTS)
+        assert np.allclose(loaded.predict_proba(TEXTS), classifier.predict_proba(TEXTS), atol=1e-2)
+
+
+class TestCategorizerClassifier:
+
+    def test_classifier_fills_in_before_amount_bands(self, classifier):
+        """Test the classifier is used only when no merchant matches, and amount bands when it is unsure"""
+        custom = Categorizer(merchants={"acme": "Tools"}, aliases=MerchantAliasTable(),
+                             classifier=classifier, classifier_min_confidence=0.9)
+
+        assert custom.categorize("ACME", "", "-15") == "Tools"
+        assert custom.categorize("Pizzeria Mario", "", "-15") == "Restaurants"
+        assert custom.categorize("Xyz Qwk", "", "-15") == "Small Purchase"
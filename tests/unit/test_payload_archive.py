@@ -0,0 +1,70 @@
+import json
+from datetime import date
+import pytest
+from app.utils.transactions import payload_archive
+from app.utils.transactions.payload_archive import (
+    compress_payload, decompress_payload, payload_since, payload_window, resolve_codec
+)
+
+
+def raw_payload(count=200):
+    booked = [{
+        "transactionId": f"tx-{i}",
+        "bookingDate": f"2024-05-{i % 28 + 1:02d}",
+        "transactionAmount": {"amount": f"-{i % 90 + 1}.50", "currency": "RON"},
+        "creditorName": ("Kaufland", "Glovo", "Mega Image")[i % 3]
+    } for i in range(count)]
+    return json.dumps({"transactions": {"booked": booked, "pending": []}}).encode()
+
+
+class TestPayloadArchive:
+
+    def test_gzip_round_trip(self):
+        """Test a payload comes back byte for byte and much smaller while archived"""
+        raw = raw_payload()
+        blob = compress_payload(raw, "gzip")
+
+        assert decompress_payload(blob, "gzip") == raw
+        assert len(blob) < len(raw) / 3
+
+    def test_same_payload_same_bytes(self):
+        """Test compression is deterministic, so identical payloads archive identically"""
+        assert compress_payload(raw_payload(), "gzip") == compress_payload(raw_payload(), "gzip")
+
+    def test_unknown_codec(self):
+        """Test an unknown codec is an error rather than silently stored raw"""
+        with pytest.raises(ValueError):
+            compress_payload(b"{}", "lz4")
+        with pytest.raises(ValueError):
+            decompress_payload(b"{}", "lz4")
+
+    def test_missing_zstd_falls_back_to_gzip(self, monkeypatch):
+        """Test zstd is only used when the zstandard package is installed"""
+        monkeypatch.setattr(payload_archive, "zstandard", None)
+
+        assert resolve_codec("zstd") == "gzip"
+        assert resolve_codec(None) == "gzip"
+        with pytest.raises(ValueError):
+            decompress_payload(b"", "zstd")
+
+    def test_window(self):
+        """Test the window spans the first and last booking date, ignoring unparseable ones"""
+        transactions = [{"bookingDate": "2024-03-05"}, {"valueDate": "2024-01-31T10:00:00"}, {"bookingDate": "soon"}]
+
+        assert payload_window(transactions) == (date(2024, 1, 31), date(2024, 3, 5))
+        assert payload_window([]) == (None, None)
+
+    def test_since_keeps_only_the_new_window(self):
+        """Test only rows from the last archived day on (and undated pending ones) are kept, when any are newer"""
+        raw = json.dumps({"transactions": {
+            "booked": [{"bookingDate": "2024-05-01"}, {"bookingDate": "2024-05-03"}, {"bookingDate": "2024-05-04"}],
+            "pending": [{"transactionAmount": {"amount": "-5"}}]
+        }}).encode()
+
+        window = json.loads(payload_since(raw, date(2024, 5, 3)))
+
+        assert window["transactions"]["booked"] == [{"bookingDate": "2024-05-03"}, {"bookingDate": "2024-05-04"}]
+        assert len(window["transactions"]["pending"]) == 1
+        assert payload_since(raw, None) == raw
+        assert payload_since(raw, date(2024, 5, 4)) is None
+        assert payload_since(raw_payload(10), date(2024, 6, 1)) is None
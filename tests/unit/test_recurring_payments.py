@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+from app.utils.transactions.recurring_payments import detect_recurring_payments
+
+
+def payments(key, start, every, amounts, category="Shopping", currency="RON"):
+    """Rows for one merchant paid every `every` days starting at `start`"""
+    return [(key, start + timedelta(days=every * i), -amount, currency, category) for i, amount in enumerate(amounts)]
+
+
+def detect(rows):
+    columns = [list(column) for column in zip(*rows)] or [[], [], [], [], []]
+    return detect_recurring_payments(*columns)
+
+
+class TestDetectRecurringPayments:
+
+    def test_monthly_subscription(self):
+        """Test a fixed monthly amount is detected with its next expected date"""
+        found = detect(payments("netflix", date(2024, 1, 5), 30, [4599] * 4, category="Streaming"))
+
+        assert len(found) == 1
+        assert found[0]["period"] == "monthly"
+        assert found[0]["amount_minor"] == 4599
+        assert found[0]["occurrences"] == 4
+        assert found[0]["next_date"] == date(2024, 5, 4)
+        assert found[0]["confidence"] == 1.0
+
+    def test_irregular_merchant_is_ignored(self):
+        """Test purchases at random intervals are not reported"""
+        rows = [("kaufland", date(2024, 1, 1) + timedelta(days=d), -5000, "RON", "Groceries") for d in (0, 3, 11, 40, 41)]
+        assert detect(rows) == []
+
+    def test_varying_bill_lowers_confidence(self):
+        """Test a regular bill with changing amounts is found with lower confidence"""
+        found = detect(payments("enel", date(2024, 1, 10), 31, [21000, 18000, 25000, 19500], category="Shopping"))
+
+        assert found[0]["period"] == "monthly"
+        assert found[0]["confidence"] < 1.0
+
+    def test_known_subscriptions_need_fewer_payments(self):
+        """Test two payments suffice for dictionary subscription categories"""
+        assert detect(payments("world class", date(2024, 1, 1), 30, [25000, 25000], category="Gym"))
+        assert not detect(payments("some shop", date(2024, 1, 1), 30, [25000, 25000]))
+
+    def test_merchants_and_currencies_are_separate(self):
+        """Test each merchant/currency pair is analysed on its own, whatever the input order"""
+        rows = payments("spotify", date(2024, 1, 1), 30, [2399] * 3) + \
+            payments("gym", date(2024, 1, 2), 7, [5000] * 5) + \
+            payments("spotify", date(2024, 1, 15), 30, [999] * 3, currency="EUR")
+        rows.reverse()
+
+        found = {(p["merchant_key"], p["currency"]): p["period"] for p in detect(rows)}
+        assert found == {("spotify", "RON"): "monthly", ("gym", "RON"): "weekly", ("spotify", "EUR"): "monthly"}
+
+    def test_unstable_amounts_are_ignored(self):
+        """Test regular payments whose amounts mostly differ from the typical one are not reported"""
+        assert not detect(payments("bar", date(2024, 1, 5), 7, [1000, 1910, 1240, 2370, 1540]))
+
+    def test_plans_at_one_merchant_are_separate(self):
+        """Test two subscriptions with different amounts at the same merchant are found on their own"""
+        rows = payments("apple", date(2024, 1, 3), 30, [499] * 4, category="Streaming") + \
+            payments("apple", date(2024, 1, 20), 30, [4999] * 4, category="Streaming")
+
+        found = sorted((p["amount_minor"], p["period"], p["occurrences"]) for p in detect(rows))
+        assert found == [(499, "monthly", 4), (4999, "monthly", 4)]
+
+    def test_rows_without_merchant_or_date_are_skipped(self):
+        """Test nameless and undated payments are not grouped into a subscription"""
+        rows = payments("", date(2024, 1, 1), 30, [5000] * 4) + payments(None, date(2024, 1, 1), 30, [5000] * 4)
+        rows += [("gym", None, -5000, "RON", "Gym")] * 3 + payments("gym", date(2024, 1, 2), 30, [5000] * 2, "Gym")
+
+        found = detect(rows)
+        assert [(p["merchant_key"], p["occurrences"]) for p in found] == [("gym", 2)]
+
+    def test_empty(self):
+        """Test no rows gives no results"""
+        assert detect([]) == []
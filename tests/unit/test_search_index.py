@@ -0,0 +1,104 @@
+import uuid
+from app.database.models.bank_transaction_model import BankTransaction
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.search_index import SearchIndexCache, TransactionSearchIndex, tokenize
+from app.utils.transactions.transaction_record import TransactionRecord
+
+USER_ID = uuid.uuid4()
+
+
+def row(company="", description="", date="2024-05-01", id=""):
+    record = TransactionRecord(id, parse_minor_units("-10"), "RON", date, company, description, None)
+    return BankTransaction.from_record(USER_ID, record)
+
+
+def search(index, query, limit=None):
+    total, documents = index.search(query, limit)
+    return total, [index.transaction_ids[document] for document in documents]
+
+
+class TestTransactionSearchIndex:
+
+    def test_tokenize_folds_case_and_diacritics(self):
+        """Test tokens are lowercased, split on punctuation and stripped of diacritics"""
+        assert tokenize("Plată POS: KAUFLAND_București") == ["plata", "pos", "kaufland", "bucuresti"]
+
+    def test_words_are_anded_and_newest_first(self):
+        """Test every query word must match and results come back by date, newest first"""
+        index = TransactionSearchIndex()
+        index.add([
+            row("Kaufland", "Plata card Bucuresti", "2024-01-10", "a"),
+            row("Kaufland", "Plata card Cluj", "2024-03-10", "b"),
+            row("Lidl", "Plata card Bucuresti", "2024-02-10", "c"),
+        ])
+
+        assert search(index, "kaufland") == (2, ["b", "a"])
+        assert search(index, "plata bucuresti") == (2, ["c", "a"])
+        assert search(index, "kaufland cluj") == (1, ["b"])
+        assert search(index, "netflix") == (0, [])
+
+    def test_substring_and_prefix_terms(self):
+        """Test terms match inside tokens through trigrams, and short terms match prefixes"""
+        index = TransactionSearchIndex()
+        index.add([row("Netflix.com", id="a"), row("MEGA IMAGE 0456", id="b"), row("Mega Mall", id="c")])
+
+        assert search(index, "flix")[1] == ["a"]
+        assert search(index, "me")[0] == 2
+        assert search(index, "mag")[1] == ["b"]
+
+    def test_limit_keeps_total(self):
+        """Test a limit trims the results but still reports every match"""
+        index = TransactionSearchIndex()
+        index.add([row("Glovo", date=f"2024-01-{day:02d}", id=str(day)) for day in range(1, 21)])
+
+        total, ids = search(index, "glovo", limit=3)
+
+        assert total == 20
+        assert ids == ["20", "19", "18"]
+
+    def test_add_skips_indexed_rows(self):
+        """Test re-adding a stored row does not duplicate it"""
+        index = TransactionSearchIndex()
+        stored = [row("Glovo", id="a")]
+        index.add(stored)
+
+        assert index.add(stored) == 0
+        assert search(index, "glovo") == (1, ["a"])
+
+
+class TestSearchIndexCache:
+
+    def test_least_recently_used_evicted_over_budget(self):
+        """Test the budget evicts the least recently searched user's index"""
+        first, second, third = (TransactionSearchIndex() for _ in range(3))
+        for index in (first, second, third):
+            index.add([row("Kaufland", "Plata card", id=str(i)) for i in range(10)])
+        cache = SearchIndexCache(memory_budget=first.size_bytes * 2)
+
+        cache.put("first", first)
+        cache.put("second", second)
+        cache.get("first")
+        cache.put("third", third)
+
+        assert cache.get("second") is None
+        assert cache.get("first") is first
+        assert cache.stats()["evictions"] == 1
+
+    def test_extend_updates_loaded_index_only(self):
+        """Test new rows reach a loaded index and are ignored for users without one"""
+        cache = SearchIndexCache(memory_budget=10 ** 9)
+        cache.put("loaded", TransactionSearchIndex())
+
+        assert cache.extend("loaded", [row("Glovo", id="a")]) == 1
+        assert cache.extend("cold", [row("Glovo", id="b")]) == 0
+        assert len(cache) == 1
+
+    def test_rows_synced_during_build_are_kept(self):
+        """Test rows stored while an index is being built are added once it is stored"""
+        cache = SearchIndexCache(memory_budget=10 ** 9)
+        cache.begin_build("user")
+        cache.extend("user", [row("Glovo", id="late")])
+
+        index = cache.put("user", TransactionSearchIndex())
+
+        assert search(index, "glovo") == (1, ["late"])
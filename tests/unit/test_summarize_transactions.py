@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+from app.utils.transactions.summarize_transactions import (
+    TransactionColumns, sort_by_absolute_amount, summarize_totals, summarize_transactions
+)
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+def group_totals(essentials):
+    """(category, currency, income_minor, spent_minor, count) rows, as the SQL GROUP BY returns them"""
+    groups = {}
+    for t in essentials:
+        amount = t.amount_minor or 0
+        group = groups.setdefault((t.category, t.currency), [0, 0, 0])
+        group[0] += max(amount, 0)
+        group[1] += max(-amount, 0)
+        group[2] += 1
+    return [(category, currency, *sums) for (category, currency), sums in groups.items()]
+
+
+def legacy_summary(essentials):
+    """The per-row loop the endpoint used before the vectorized summary"""
+    essentials = [dict(r.to_dict(), amount=r.amount) for r in essentials]
+    essentials = sorted(essentials, key=lambda x: abs(float(x.get('amount', 0)) if x.get('amount') else 0), reverse=True)
+    category_summary = {}
+    total_spent = 0
+    total_income = 0
+    for transaction in essentials:
+        category = transaction.get('category', 'Unknown')
+        amount = float(transaction.get('amount', 0)) if transaction.get('amount') else 0
+        if category not in category_summary:
+            category_summary[category] = {"count": 0, "total_amount": 0, "transactions": []}
+        category_summary[category]["count"] += 1
+        category_summary[category]["total_amount"] += abs(amount)
+        category_summary[category]["transactions"].append({
+            "company": transaction.get("company"),
+            "amount": transaction.get("amount")
+        })
+        if amount > 0:
+            total_income += amount
+        else:
+            total_spent += abs(amount)
+    return essentials, total_income, total_spent, category_summary
+
+
+SAMPLE = [
+    record("Lidl", amount="-20.50", category="Groceries", date="2024-01-03"),
+    record("Employer", amount="6000.00", category="Salary", date="2024-01-01"),
+    record("Glovo", amount="-45.10", category="Food Delivery", date="2024-01-05"),
+    record("Kaufland", amount="-20.50", category="Groceries", date="2024-01-07"),
+    record("Refund", amount="", category="Unknown", date=""),
+]
+
+
+class TestSummarizeTransactions:
+
+    def test_matches_legacy_loop(self):
+        """Test the NumPy summary gives the same numbers and order as the old loop"""
+        expected_sorted, income, spent, categories = legacy_summary(SAMPLE)
+
+        sorted_essentials, columns = sort_by_absolute_amount(SAMPLE)
+        result = summarize_transactions(sorted_essentials, columns)
+
+        assert [r.to_dict() for r in sorted_essentials] == expected_sorted
+        assert result["summary"]["total_income"] == round(income, 2)
+        assert result["summary"]["total_spent"] == round(spent, 2)
+        assert list(result["categories"]) == list(categories)
+        for name, data in categories.items():
+            assert result["categories"][name]["count"] == data["count"]
+            assert result["categories"][name]["total_amount"] == pytest.approx(data["total_amount"])
+            assert result["categories"][name]["transactions"] == data["transactions"]
+
+    def test_top_categories(self):
+        """Test top categories are ordered by total amount"""
+        result = summarize_transactions(SAMPLE)
+        assert [c["category"] for c in result["top_categories"]][:2] == ["Salary", "Food Delivery"]
+        assert result["top_categories"][2] == {"category": "Groceries", "amount": 41.0, "count": 2}
+
+    def test_columns(self):
+        """Test the columnar view parses amounts, signs and dates once"""
+        columns = TransactionColumns(SAMPLE)
+        assert columns.amount_minor.tolist() == [-2050, 600000, -4510, -2050, 0]
+        assert columns.sign.tolist() == [-1, 1, -1, -1, 0]
+        assert columns.date[0] == np.datetime64("2024-01-03")
+        assert np.isnat(columns.date[4])
+        assert columns.category_names == ["Groceries", "Salary", "Food Delivery", "Unknown"]
+
+    def test_invalid_amount_counts_as_zero(self):
+        """Test a malformed amount does not break the summary"""
+        result = summarize_transactions([record("X", amount="abc", category="Unknown")])
+        assert result["summary"]["total_spent"] == 0
+
+    def test_empty(self):
+        """Test an empty list summarizes to zeros"""
+        result = summarize_transactions([])
+        assert result["summary"]["categories_found"] == 0
+        assert result["categories"] == {}
+        assert result["top_categories"] == []
+
+    def test_sums_are_exact(self):
+        """Test many cent amounts add up without float drift"""
+        essentials = [record("X", amount="0.10", category="Food")] * 10_000
+        result = summarize_transactions(essentials)
+        assert result["summary"]["total_income"] == 1000.0
+        assert result["categories"]["Food"]["total_amount"] == 1000.0
+        assert result["summary"]["currency"] == "RON"
+
+    def test_mixed_currencies(self):
+        """Test mixed exponents are scaled to a common one and broken down per currency"""
+        essentials = [
+            record(amount="-1000", currency="JPY", category="Travel"),
+            record(amount="-12.50", currency="EUR", category="Travel"),
+            record(amount="1.005", currency="KWD", category="Income"),
+        ]
+        result = summarize_transactions(essentials)
+
+        assert result["summary"]["currency"] is None
+        assert result["summary"]["by_currency"]["JPY"]["total_spent"] == 1000.0
+        assert result["summary"]["by_currency"]["EUR"]["total_spent"] == 12.5
+        assert result["summary"]["by_currency"]["KWD"]["total_income"] == 1.005
+
+    @pytest.mark.parametrize("essentials", [
+        [],
+        SAMPLE,
+        [
+            record(amount="-1000", currency="JPY", category="Travel"),
+            record(amount="-12.50", currency="EUR", category="Travel"),
+            record(amount="1.005", currency="KWD", category="Income"),
+        ],
+    ])
+    def test_totals_match_rows(self, essentials):
+        """Test summarizing per-category sums gives the same response as summarizing the rows"""
+        expected = summarize_transactions(essentials, include_transactions=False)
+
+        assert summarize_totals(group_totals(essentials)) == expected
@@ -0,0 +1,75 @@
+import numpy as np
+from datetime import date
+from types import SimpleNamespace
+from app.utils.transactions.timeseries import bucket_starts, build_timeseries, period_count, timeseries_from_rollups
+
+
+def dates(*values):
+    return np.array(values, dtype="datetime64[D]")
+
+
+class TestBucketStarts:
+
+    def test_iso_weeks_start_on_monday(self):
+        """Test week buckets start on the Monday of the ISO week"""
+        starts = bucket_starts(dates("2024-03-03", "2024-03-04", "2024-03-10", "1970-01-01"), "week")
+        assert [str(d) for d in starts] == ["2024-02-26", "2024-03-04", "2024-03-04", "1969-12-29"]
+
+    def test_months(self):
+        """Test month buckets start on the first of the month"""
+        starts = bucket_starts(dates("2024-02-29", "2024-03-01"), "month")
+        assert [str(d) for d in starts] == ["2024-02-01", "2024-03-01"]
+
+    def test_period_count(self):
+        """Test bucket counts match the buckets a range would be filled with, up to the last representable date"""
+        assert period_count(date(2024, 3, 3), date(2024, 3, 4), "week") == 2
+        assert period_count(date(2024, 1, 31), date(2024, 3, 1), "month") == 3
+        assert period_count(date(2024, 1, 1), date(9999, 12, 31), "day") > 2_900_000
+
+
+class TestBuildTimeseries:
+
+    def test_daily_series_fills_gaps(self):
+        """Test empty days between transactions appear as zero points"""
+        series = build_timeseries(
+            dates("2024-03-01", "2024-03-03", "2024-03-01"),
+            np.array([-1050, 20000, -450], dtype=np.int64),
+            ["RON", "RON", "RON"],
+            "day"
+        )
+        assert series["RON"] == [
+            {"period": "2024-03-01", "income": 0.0, "spent": 15.0, "net": -15.0, "count": 2},
+            {"period": "2024-03-02", "income": 0.0, "spent": 0.0, "net": 0.0, "count": 0},
+            {"period": "2024-03-03", "income": 200.0, "spent": 0.0, "net": 200.0, "count": 1},
+        ]
+
+    def test_currencies_and_missing_dates(self):
+        """Test each currency gets its own series and undated rows are skipped"""
+        series = build_timeseries(
+            dates("2024-03-01", "NaT", "2024-03-20"),
+            np.array([-500, -700, -1000], dtype=np.int64),
+            ["RON", "RON", "JPY"],
+            "month"
+        )
+        assert series["RON"] == [{"period": "2024-03-01", "income": 0.0, "spent": 5.0, "net": -5.0, "count": 1}]
+        assert series["JPY"][0]["spent"] == 1000.0
+
+    def test_empty(self):
+        """Test no rows gives no series"""
+        assert build_timeseries(dates(), np.array([], dtype=np.int64), [], "week") == {}
+
+
+class TestTimeseriesFromRollups:
+
+    def test_sums_categories_per_month(self):
+        """Test rollup rows of one month are summed and missing months filled"""
+        rollups = [
+            SimpleNamespace(month=date(2024, 1, 1), currency="RON", income_minor=0, spent_minor=1000, count=2),
+            SimpleNamespace(month=date(2024, 1, 1), currency="RON", income_minor=500000, spent_minor=0, count=1),
+            SimpleNamespace(month=date(2024, 3, 1), currency="RON", income_minor=0, spent_minor=250, count=1),
+        ]
+        series = timeseries_from_rollups(rollups)["RON"]
+
+        assert [point["period"] for point in series] == ["2024-01-01", "2024-02-01", "2024-03-01"]
+        assert series[0] == {"period": "2024-01-01", "income": 5000.0, "spent": 10.0, "net": 4990.0, "count": 3}
+        assert series[1]["count"] == 0
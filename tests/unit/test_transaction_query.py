@@ -0,0 +1,188 @@
+import pytest
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.summarize_transactions import TransactionColumns
+from app.utils.transactions.transaction_query import (
+    ResponseView, TransactionQuery, TransactionQueryError, decode_cursor, encode_cursor
+)
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+def sample_records():
+    return [
+        record("Kaufland", amount="-120.50", category="Groceries", date="2024-03-01", id="t1"),
+        record("Employer SRL", amount="6500.00", category="Salary", date="2024-03-05", id="t2"),
+        record("Glovo", amount="-45.00", category="Restaurants", date="2024-03-07", id="t3"),
+        record("Lidl", amount="-45.00", category="Groceries", date="2024-02-20", id="t4"),
+        record("Bolt", amount="-18.20", category="Transport", date="2024-03-10", id="t5"),
+        record("Kaufland", amount="-60.00", category="Groceries", date="", id="t6"),
+    ]
+
+
+def run(args, records=None):
+    records = records or sample_records()
+    query = TransactionQuery.from_args(args)
+    columns = TransactionColumns(records)
+    rows = query.matching_rows(records, columns)
+    page_rows, next_cursor = query.page(records, columns, rows)
+    return [records[row].id for row in page_rows.tolist()], next_cursor, len(rows)
+
+
+class TestTransactionQueryParsing:
+
+    def test_defaults(self):
+        """Test an empty query sorts by absolute amount, largest first"""
+        query = TransactionQuery.from_args({})
+        assert query.sort == "-abs_amount"
+        assert query.limit == 50
+
+    @pytest.mark.parametrize("args", [
+        {"sort": "merchant"},
+        {"limit": "0"},
+        {"limit": "abc"},
+        {"date_from": "03/01/2024"},
+        {"min_amount": "lots"},
+        {"min_amount": "²"},
+        {"cursor": "not-a-cursor"},
+    ])
+    def test_invalid_values(self, args):
+        """Test unusable parameters are rejected"""
+        with pytest.raises(TransactionQueryError):
+            TransactionQuery.from_args(args)
+
+    def test_cursor_bound_to_sort(self):
+        """Test a cursor from one sort order cannot be replayed on another"""
+        cursor = encode_cursor("date", 19800, "t1")
+        assert decode_cursor(cursor, "date") == (19800, "t1")
+        with pytest.raises(TransactionQueryError):
+            decode_cursor(cursor, "-amount")
+
+    def test_requested(self):
+        """Test only known parameters switch the endpoint to paged mode"""
+        assert TransactionQuery.requested({"limit": "10"})
+        assert not TransactionQuery.requested({"email": "a@b.c"})
+
+
+class TestTransactionQueryFilters:
+
+    def test_date_range(self):
+        """Test date bounds are inclusive and undated rows are excluded"""
+        ids, _, total = run({"date_from": "2024-03-01", "date_to": "2024-03-07", "sort": "date"})
+        assert ids == ["t1", "t2", "t3"]
+        assert total == 3
+
+    def test_category_list(self):
+        """Test several categories can be requested at once"""
+        ids, _, _ = run({"category": "Transport,Restaurants", "sort": "date"})
+        assert ids == ["t3", "t5"]
+
+    def test_amount_bounds_use_magnitude(self):
+        """Test min/max amount compare absolute amounts"""
+        ids, _, _ = run({"min_amount": "45", "max_amount": "200", "sort": "abs_amount"})
+        assert ids == ["t3", "t4", "t6", "t1"]
+
+    def test_merchant_substring(self):
+        """Test the merchant filter is a case-insensitive company match"""
+        ids, _, _ = run({"merchant": "KAUF", "sort": "amount"})
+        assert ids == ["t1", "t6"]
+
+    def test_no_matches(self):
+        """Test filters that match nothing return an empty page"""
+        assert run({"category": "Travel"}) == ([], None, 0)
+
+
+class TestKeysetPagination:
+
+    def test_default_order_matches_full_sort(self):
+        """Test the first page matches sorting everything by absolute amount"""
+        ids, _, _ = run({})
+        assert ids == ["t2", "t1", "t6", "t3", "t4", "t5"]
+
+    @pytest.mark.parametrize("sort", ["date", "-date", "amount", "-amount", "abs_amount", "-abs_amount"])
+    def test_pages_cover_every_row_once(self, sort):
+        """Test walking the cursor visits each row exactly once in order, ties included"""
+        full, cursor, _ = run({"sort": sort, "limit": "500"})
+        assert cursor is None
+
+        walked = []
+        cursor = None
+        while True:
+            args = {"sort": sort, "limit": "2"}
+            if cursor:
+                args["cursor"] = cursor
+            ids, cursor, _ = run(args)
+            walked.extend(ids)
+            if not cursor:
+                break
+
+        assert walked == full
+        assert sorted(walked) == sorted(r.id for r in sample_records())
+
+    @pytest.mark.parametrize("sort", ["date", "-date", "amount", "-abs_amount"])
+    def test_record_pages_match_column_pages(self, sort):
+        """Test paging stored records continues a column-view cursor in the same order"""
+        records = sample_records()[:5]
+        full, _, _ = run({"sort": sort, "limit": "500"}, records)
+        first, cursor, _ = run({"sort": sort, "limit": "2"}, records)
+
+        walked = list(first)
+        while cursor:
+            query = TransactionQuery.from_args({"sort": sort, "limit": "2", "cursor": cursor})
+            page, cursor = query.page_records(records)
+            walked.extend(r.id for r in page)
+
+        assert walked == full
+
+    def test_cursor_survives_new_rows(self):
+        """Test a cursor keeps its place when a new transaction arrives between pages"""
+        records = sample_records()
+        first, cursor, _ = run({"sort": "-date", "limit": "2"}, records)
+        records.append(record("Netflix", amount="-45.99", category="Streaming", date="2024-03-20", id="t7"))
+
+        second, _, _ = run({"sort": "-date", "limit": "2", "cursor": cursor}, records)
+
+        assert first == ["t5", "t3"]
+        assert second == ["t2", "t1"]
+
+
+class TestResponseView:
+
+    def test_default_keeps_legacy_response(self):
+        """Test no view or fields returns everything, with category transactions unless paging"""
+        view = ResponseView.from_args({})
+        assert view.wants("categories") and view.wants("banks")
+        assert view.category_transactions(paged=False)
+        assert not view.category_transactions(paged=True)
+
+    def test_summary_view(self):
+        """Test the summary view skips categories and transactions but keeps metadata"""
+        view = ResponseView.from_args({"view": "summary"})
+        response = view.apply({
+            "summary": {}, "top_categories": [], "categories": {}, "transactions": [], "total_count": 3
+        })
+        assert response == {"summary": {}, "top_categories": [], "total_count": 3}
+        assert not view.category_transactions(paged=False)
+
+    def test_categories_view(self):
+        """Test the categories view returns totals without embedded transactions"""
+        view = ResponseView.from_args({"view": "categories"})
+        assert view.wants("categories")
+        assert not view.category_transactions(paged=False)
+
+    def test_fields_selector(self):
+        """Test fields= limits top-level keys and transaction attributes"""
+        view = ResponseView.from_args({"fields": "summary, transactions.id,transactions.amount"})
+        assert view.fields == ["summary", "transactions"]
+        assert view.transaction_fields == ["id", "amount"]
+        assert view.apply({"summary": {}, "banks": [], "warning": "x"}) == {"summary": {}, "warning": "x"}
+
+        assert record(amount="-1.5", id="t1").to_dict(view.transaction_fields) == {"id": "t1", "amount": "-1.50"}
+
+    @pytest.mark.parametrize("args", [{"view": "compact"}, {"fields": "secrets"}, {"fields": "transactions.iban"}])
+    def test_invalid_view_or_fields(self, args):
+        """Test unknown views and fields are rejected"""
+        with pytest.raises(TransactionQueryError):
+            ResponseView.from_args(args)
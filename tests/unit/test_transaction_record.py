@@ -0,0 +1,67 @@
+from app.utils.transactions.transaction_record import TransactionRecord
+
+
+class TestTransactionRecord:
+
+    def test_from_nordigen(self):
+        """Test a raw Nordigen transaction is parsed into a compact record"""
+        record = TransactionRecord.from_nordigen({
+            "transactionId": "tx-1",
+            "bookingDate": "2024-03-01",
+            "transactionAmount": {"amount": "-12.5", "currency": "EUR"},
+            "creditorName": "Lidl",
+            "remittanceInformationUnstructured": "Card payment",
+        })
+
+        assert record.id == "tx-1"
+        assert record.amount_minor == -1250
+        assert record.currency == "EUR"
+        assert record.booking_date == "2024-03-01"
+        assert record.company == "Lidl"
+        assert record.description == "Card payment"
+        assert record.category is None
+
+    def test_fallback_fields(self):
+        """Test debtor name, structured remittance and value date are used when needed"""
+        record = TransactionRecord.from_nordigen({
+            "valueDate": "2024-03-02",
+            "transactionAmount": {"amount": "100"},
+            "debtorName": "Employer",
+            "remittanceInformationStructured": "REF 1",
+        })
+
+        assert record.company == "Employer"
+        assert record.description == "REF 1"
+        assert record.booking_date == "2024-03-02"
+        assert record.currency == "RON"
+
+    def test_slots(self):
+        """Test records have no per-instance __dict__"""
+        record = TransactionRecord("1", 100, "RON", "2024-01-01", "A", "B")
+        assert not hasattr(record, "__dict__")
+
+    def test_to_dict_formats_amount_at_boundary(self):
+        """Test the response dict carries a fixed-point amount string"""
+        record = TransactionRecord("1", -1230, "RON", "2024-01-01", "A", "B", "Food")
+        assert record.to_dict() == {
+            "id": "1", "amount": "-12.30", "currency": "RON", "date": "2024-01-01",
+            "description": "B", "company": "A", "category": "Food"
+        }
+
+    def test_unparseable_amount(self):
+        """Test a malformed amount keeps amount_minor None and an empty amount string"""
+        record = TransactionRecord.from_nordigen({"transactionAmount": {"amount": "abc"}})
+        assert record.amount_minor is None
+        assert record.amount == ''
+
+    def test_pending_status_and_internal_id(self):
+        """Test pending rows are flagged and internalTransactionId backs a missing transactionId"""
+        record = TransactionRecord.from_nordigen({
+            "internalTransactionId": "int-7",
+            "bookingStatus": "pending",
+            "transactionAmount": {"amount": "-3"},
+        })
+
+        assert record.id == "int-7"
+        assert record.pending
+        assert not TransactionRecord.from_nordigen({"bookingStatus": "booked"}).pending
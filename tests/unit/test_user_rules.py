@@ -0,0 +1,80 @@
+import pytest
+from app.utils.transactions.money import parse_minor_units
+from app.utils.transactions.transaction_record import TransactionRecord
+from app.utils.transactions.user_rules import (
+    UserRuleMatcher, apply_user_rules, compile_user_rules, rules_version
+)
+
+
+def record(company="", description="", amount="", currency="RON", category=None, date="", id=""):
+    return TransactionRecord(id, parse_minor_units(amount, currency), currency, date, company, description, category)
+
+
+class TestUserRuleMatcher:
+
+    def test_keyword_rule(self):
+        """Test keyword rules match inside the company or description"""
+        matcher = UserRuleMatcher([("gym 7", "keyword", "Sport", 0)])
+        assert matcher.match("World Class", "Abonament gym 7 card") == "Sport"
+        assert matcher.match("World Class", "Abonament") is None
+
+    def test_exact_rule_ignores_store_ids(self):
+        """Test exact rules compare the normalized counterparty"""
+        matcher = UserRuleMatcher([("Ion Popescu", "exact", "Rent", 0)])
+        assert matcher.match("ION POPESCU 12345", "") == "Rent"
+        assert matcher.match("Ion Popescu SRL", "") is None
+
+    def test_priority_wins_over_length(self):
+        """Test the highest-priority rule wins even when a longer keyword matches"""
+        matcher = UserRuleMatcher([
+            ("lidl", "keyword", "Household", 10),
+            ("lidl romania", "keyword", "Groceries", 0),
+        ])
+        assert matcher.match("Lidl Romania", "") == "Household"
+
+    def test_apply_keeps_unmatched_categories(self):
+        """Test only matching records are overridden"""
+        matcher = UserRuleMatcher([("glovo", "keyword", "Eating Out", 0)])
+        records = [record("Glovo"), record("Kaufland")]
+        assert matcher.apply(records, ["Restaurants", "Groceries"]) == ["Eating Out", "Groceries"]
+
+
+class TestCompiledRuleCache:
+
+    def test_compiles_once_per_version(self):
+        """Test the same rules reuse one compiled matcher and edits recompile"""
+        rules = [("netflix", "keyword", "Fun", 0)]
+        first = compile_user_rules("user-a", rules)
+        assert compile_user_rules("user-a", list(rules)) is first
+
+        edited = [("netflix", "keyword", "Entertainment", 0)]
+        assert rules_version(edited) != rules_version(rules)
+        assert compile_user_rules("user-a", edited) is not first
+
+    def test_no_rules(self):
+        """Test users without rules get no matcher"""
+        assert compile_user_rules("user-b", []) is None
+
+    @pytest.mark.asyncio
+    async def test_apply_without_matcher(self):
+        """Test categories pass through unchanged when the user has no rules"""
+        assert await apply_user_rules(None, [record("Glovo")], ["Restaurants"]) == ["Restaurants"]
+
+    @pytest.mark.asyncio
+    async def test_extract_applies_user_rules(self, monkeypatch):
+        """Test extraction layers the user's rules over the global categories"""
+        from app.utils.transactions import extract_essentials_transactions as extract_module
+
+        async def fake_rules(user_id):
+            return compile_user_rules(user_id, [("kaufland", "keyword", "Household", 0)])
+
+        monkeypatch.setattr(extract_module, "get_user_rule_matcher", fake_rules)
+        raw = [
+            {"creditorName": "Kaufland", "transactionAmount": {"amount": "-50.00", "currency": "RON"}},
+            {"creditorName": "Glovo", "transactionAmount": {"amount": "-30.00", "currency": "RON"}},
+        ]
+
+        records = await extract_module.extract_essentials_transactions(raw, user_id="user-c")
+
+        assert records[0].category == "Household"
+        assert records[1].category != "Household"